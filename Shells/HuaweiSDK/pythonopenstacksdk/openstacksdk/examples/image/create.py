@@ -35,3 +35,19 @@ def upload_image(conn):
         'visibility': 'public',
     }
     conn.image.upload_image(**image_attrs)
+
+
+def upload_image_from_file(conn):
+    print("Upload Image from a file:")
+
+    def progress(upload):
+        print("%d of %d bytes sent, %.0f bytes/s" %
+              (upload.sent, upload.total, upload.rate))
+
+    # The file is read and sent one chunk at a time.
+    conn.image.upload_image(name=EXAMPLE_IMAGE_NAME,
+                            filename="myimage.qcow2",
+                            disk_format='qcow2',
+                            container_format='bare',
+                            chunk_size=1024 * 1024,
+                            progress=progress)
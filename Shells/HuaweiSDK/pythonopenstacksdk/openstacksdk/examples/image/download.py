@@ -20,6 +20,19 @@ http://developer.openstack.org/sdks/python/openstacksdk/users/guides/image.html
 """
 
 
+def download_image_to_file(conn):
+    print("Download Image to a file:")
+
+    # Find the image you would like to download.
+    image = conn.image.find_image("myimage")
+
+    # The data is written to the file as it is received, and its checksum
+    # is verified once it is complete. Should the download be interrupted,
+    # running it again continues from the end of the file.
+    conn.image.download_image(image, output="myimage.qcow2",
+                              chunk_size=1024 * 1024, resume=True)
+
+
 def download_image_stream(conn):
     print("Download Image via streaming:")
 
@@ -0,0 +1,211 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+The :class:`~openstack.async_connection.AsyncConnection` class gives
+:mod:`asyncio` applications access to the services of a
+:class:`~openstack.connection.Connection`. It requires Python 3.5 or later.
+
+Proxy methods are the same as those of a
+:class:`~openstack.connection.Connection`, and use the same resources, but
+are run on a pool of threads. Their result is awaited, or iterated with
+``async for`` for the methods returning a generator, so that many requests
+can be in flight at once.
+
+Examples
+--------
+
+Create servers concurrently and list them::
+
+    import asyncio
+
+    from openstack import async_connection
+
+    async def main():
+        async with async_connection.AsyncConnection(**auth_args) as conn:
+            servers = await asyncio.gather(*[
+                conn.compute.create_server(name="server-%d" % i, **attrs)
+                for i in range(40)])
+            async for server in conn.compute.servers():
+                print(server.name)
+
+    asyncio.get_event_loop().run_until_complete(main())
+
+The number of requests in flight is bounded by ``max_workers``. Set the
+``pool_maxsize`` of the connection to the same value so that each thread
+keeps its HTTP connection open.
+"""
+import asyncio
+import concurrent.futures
+import functools
+
+from openstack import connection as _connection
+from openstack import proxy
+from openstack import proxy2
+
+#: The default number of threads requests are made on.
+DEFAULT_MAX_WORKERS = 10
+
+
+class AsyncConnection(object):
+
+    def __init__(self, connection=None, executor=None,
+                 max_workers=DEFAULT_MAX_WORKERS, **connection_args):
+        """Create an asyncio context for a connection to a cloud provider.
+
+        :param connection: The connection to make requests with. When not
+            given, one is created from ``connection_args``.
+        :type connection: :class:`~openstack.connection.Connection`
+        :param executor: The executor requests are run on. When not given,
+            a thread pool of ``max_workers`` threads is created, and shut
+            down by :meth:`close`.
+        :type executor: :class:`concurrent.futures.Executor`
+        :param int max_workers: The number of threads of the created
+            executor, which is the number of requests in flight at once.
+        :param connection_args: The parameters of
+            :class:`~openstack.connection.Connection`, used when no
+            ``connection`` is given. ``pool_maxsize`` defaults to
+            ``max_workers``.
+        """
+        if connection is None:
+            connection_args.setdefault("pool_maxsize", max_workers)
+            connection = _connection.Connection(**connection_args)
+        self.connection = connection
+        self._owns_executor = executor is None
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+        self.executor = executor
+
+    @property
+    def session(self):
+        return self.connection.session
+
+    def __getattr__(self, name):
+        # Only called for the services, which are wrapped on first access.
+        if "connection" not in self.__dict__:
+            raise AttributeError(name)
+        value = getattr(self.connection, name)
+        if not isinstance(value, (proxy.BaseProxy, proxy2.BaseProxy)):
+            raise AttributeError("%r object has no attribute %r" %
+                                 (self.__class__.__name__, name))
+        wrapped = AsyncProxy(value, self)
+        setattr(self, name, wrapped)
+        return wrapped
+
+    def run(self, func, *args, **kwargs):
+        """Call func on the executor
+
+        :returns: An :class:`asyncio.Future` of the result of func.
+        """
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs))
+
+    def authorize(self):
+        """Authorize this connection
+
+        :returns: An :class:`asyncio.Future` of the token.
+        """
+        return self.run(self.connection.authorize)
+
+    def close(self):
+        """Shut down the executor if it was created by this connection"""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+
+    def __aenter__(self):
+        return _done(self)
+
+    def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return _done(None)
+
+
+class AsyncProxy(object):
+
+    def __init__(self, proxy, connection):
+        """Run the methods of a proxy on the executor of a connection
+
+        Every method call returns an :class:`AsyncCall`.
+
+        :param proxy: The proxy of a service.
+        :param connection: The connection running the calls.
+        :type connection: :class:`AsyncConnection`
+        """
+        self.proxy = proxy
+        self.connection = connection
+
+    def __getattr__(self, name):
+        if "proxy" not in self.__dict__:
+            raise AttributeError(name)
+        attr = getattr(self.proxy, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            return AsyncCall(self.connection, attr, args, kwargs)
+
+        return call
+
+
+class AsyncCall(object):
+
+    def __init__(self, connection, func, args, kwargs):
+        """A call of a proxy method, which is run once awaited or iterated
+
+        ``await`` runs the call and returns its result. ``async for``
+        runs it and iterates the generator it returns, each step of which
+        is also run on the executor, as it may request the next page.
+        """
+        self.connection = connection
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __await__(self):
+        future = self.connection.run(self.func, *self.args, **self.kwargs)
+        return future.__await__()
+
+    def __aiter__(self):
+        return AsyncIterator(
+            self.connection,
+            functools.partial(self.func, *self.args, **self.kwargs))
+
+
+class AsyncIterator(object):
+
+    def __init__(self, connection, start):
+        self.connection = connection
+        self.start = start
+        self.iterator = None
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        return self.connection.run(self._next)
+
+    def _next(self):
+        if self.iterator is None:
+            self.iterator = iter(self.start())
+        try:
+            return next(self.iterator)
+        except StopIteration:
+            # StopIteration cannot be set on a future.
+            raise StopAsyncIteration
+
+
+def _done(result):
+    future = asyncio.get_event_loop().create_future()
+    future.set_result(result)
+    return future
@@ -0,0 +1,206 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Caches for the tokens used by :class:`~openstack.session.Session`.
+
+Every new :class:`~openstack.connection.Connection` authenticates from
+scratch, requesting a token and service catalog from the identity service.
+An auth cache keeps the authentication state of the keystoneauth plugins,
+keyed by their auth parameters, so that connections created with the same
+credentials reuse a token until shortly before it expires.
+
+Examples
+--------
+
+Share tokens between the connections of a process::
+
+    from openstack import auth_cache
+    from openstack import connection
+
+    cache = auth_cache.AuthCache()
+    conn = connection.Connection(auth_cache=cache, **auth_args)
+
+Share tokens between the processes of a user on a host::
+
+    cache = auth_cache.FileAuthCache()
+    conn = connection.Connection(auth_cache=cache, **auth_args)
+"""
+import calendar
+import contextlib
+import logging
+import os
+import threading
+import time
+
+from openstack import utils
+
+_logger = logging.getLogger(__name__)
+
+#: The default number of seconds before its expiry a token stops being used.
+DEFAULT_EXPIRY_MARGIN = 5 * 60
+
+
+class AuthCache(object):
+
+    def __init__(self, expiry_margin=DEFAULT_EXPIRY_MARGIN):
+        """Keep authentication state in memory
+
+        :param int expiry_margin: The number of seconds before expiry after
+                                  which a token is no longer handed out.
+
+        The number of lookups answered from the cache and the number of
+        authentications it had to let through are counted in
+        :attr:`hits` and :attr:`misses`.
+        """
+        self.expiry_margin = expiry_margin
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.RLock()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock:
+            yield
+
+    def _read(self):
+        return self._entries
+
+    def _write(self, entries):
+        self._entries = entries
+
+    def get(self, key):
+        """Return the auth state stored for key, or ``None``"""
+        entry = self._read().get(key)
+        if entry is None:
+            return None
+        if entry["expires"] - self.expiry_margin <= time.time():
+            return None
+        return entry["state"]
+
+    def set(self, key, state, expires):
+        """Store the auth state for key
+
+        :param str key: The cache id of the auth plugin.
+        :param str state: The auth state of the plugin.
+        :param float expires: The time the token expires at, in seconds
+                              since the epoch.
+        """
+        with self._locked():
+            self._store(key, state, expires)
+
+    def _store(self, key, state, expires):
+        now = time.time()
+        entries = dict((k, entry) for k, entry in self._read().items()
+                       if entry["expires"] > now)
+        entries[key] = {"state": state, "expires": expires}
+        self._write(entries)
+
+    def invalidate(self, key):
+        """Forget the auth state stored for key"""
+        with self._locked():
+            entries = dict(self._read())
+            if entries.pop(key, None) is not None:
+                self._write(entries)
+
+    def authenticate(self, plugin, session):
+        """Make sure an auth plugin holds a token
+
+        A plugin without a token, or with one about to expire, is given the
+        cached one for its auth parameters. When there is none, the plugin
+        authenticates and its new token is stored.
+
+        :param plugin: A keystoneauth identity plugin. Plugins which cannot
+                       tell a cache id for their parameters are left alone.
+        :param session: The session the plugin authenticates with.
+        """
+        key = self._get_key(plugin)
+        if key is None or self._is_valid(plugin.auth_ref):
+            return
+
+        with self._locked():
+            state = self.get(key)
+            if state is not None:
+                plugin.set_auth_state(state)
+                self.hits += 1
+                return
+
+            self.misses += 1
+            # Drop a token about to expire, which the plugin itself may
+            # still consider valid.
+            plugin.invalidate()
+            access = plugin.get_access(session)
+            if access.expires is not None:
+                expires = calendar.timegm(access.expires.utctimetuple())
+                self._store(key, plugin.get_auth_state(), expires)
+
+    def invalidate_plugin(self, plugin):
+        """Forget the auth state stored for the parameters of a plugin"""
+        key = self._get_key(plugin)
+        if key is not None:
+            self.invalidate(key)
+
+    @staticmethod
+    def _get_key(plugin):
+        get_cache_id = getattr(plugin, "get_cache_id", None)
+        return get_cache_id() if get_cache_id is not None else None
+
+    def _is_valid(self, auth_ref):
+        return (auth_ref is not None and
+                not auth_ref.will_expire_soon(self.expiry_margin))
+
+
+class FileAuthCache(AuthCache):
+
+    def __init__(self, path=None, expiry_margin=DEFAULT_EXPIRY_MARGIN,
+                 lock=True):
+        """Keep authentication state in a JSON file
+
+        The file is only readable by its owner, but holds tokens in clear,
+        so it should not be shared beyond the processes of one user.
+
+        :param str path: The file to use. Defaults to ``tokens.json`` in the
+                         directory returned by
+                         :func:`~openstack.utils.get_cache_dir`.
+        :param int expiry_margin: The number of seconds before expiry after
+                                  which a token is no longer handed out.
+        :param bool lock: Whether to lock the file while authenticating, so
+                          that processes starting at the same time wait for
+                          the first one's token instead of all requesting
+                          their own.
+        """
+        super(FileAuthCache, self).__init__(expiry_margin=expiry_margin)
+        self.path = path or os.path.join(utils.get_cache_dir(),
+                                         "tokens.json")
+        self.lock = lock
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock:
+            if not self.lock:
+                yield
+                return
+            with utils.lock_file(self.path + ".lock"):
+                yield
+
+    def _read(self):
+        entries = utils.read_json_file(self.path)
+        if not isinstance(entries, dict):
+            return {}
+        return entries
+
+    def _write(self, entries):
+        try:
+            utils.write_json_file(self.path, entries)
+        except (IOError, OSError) as e:
+            _logger.debug("Unable to write auth cache %s: %s", self.path, e)
@@ -16,3 +16,13 @@ def get_next_marker(response_json, yielded):
     if yielded < limit:
         return -1
     return response_json["start_number"] + yielded
+
+
+def get_remaining_pages(response_json, yielded, query_params):
+    total = response_json.get("total_number")
+    limit = response_json["limit"]
+    if total is None or yielded < limit:
+        return []
+    start = response_json["start_number"] + limit
+    return [dict(query_params, start_number=start_number, limit=limit)
+            for start_number in range(start, total, limit)]
@@ -89,6 +89,22 @@ class Proxy(proxy2.BaseProxy):
         config = _config.Config()
         return config.batch_delete(self._session, configs)
 
+    def delete_configs(self, configs,
+                       max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Delete many configs
+
+        Configs are deleted with batch delete requests of up to 50 configs.
+
+        :param list configs: The list item value can be the ID of a config
+             or a :class:`~openstack.auto_scaling.v2.config.Config` instance.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  config and in the same order.
+        """
+        return self._bulk_delete(_config.Config, configs,
+                                 max_workers=max_workers)
+
     def find_config(self, name_or_id, ignore_missing=True):
         """Find a single config
 
@@ -57,3 +57,8 @@ class Activity(resource.Resource):
     def get_next_marker(cls, response_json, yielded, query_params):
         from openstack.auto_scaling.v1 import get_next_marker
         return get_next_marker(response_json, yielded)
+
+    @classmethod
+    def get_remaining_pages(cls, response_json, yielded, query_params):
+        from openstack.auto_scaling.v1 import get_remaining_pages
+        return get_remaining_pages(response_json, yielded, query_params)
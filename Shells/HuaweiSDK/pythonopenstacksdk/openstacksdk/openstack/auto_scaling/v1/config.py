@@ -11,6 +11,7 @@
 # under the License.
 from openstack.auto_scaling import auto_scaling_service
 from openstack.auto_scaling.v1 import get_next_marker
+from openstack.auto_scaling.v1 import get_remaining_pages
 from openstack import resource2 as resource
 
 
@@ -57,6 +58,9 @@ class Config(resource.Resource):
     allow_list = True
     allow_get = True
     allow_delete = True
+    allow_bulk_delete = True
+    # The batch delete API accepts up to 50 configs per request
+    bulk_size = 50
 
     _query_mapping = resource.QueryParameters(
         'image_id', 'limit',
@@ -81,6 +85,15 @@ class Config(resource.Resource):
     def get_next_marker(cls, response_json, yielded, query_params):
         return get_next_marker(response_json, yielded)
 
+    @classmethod
+    def get_remaining_pages(cls, response_json, yielded, query_params):
+        return get_remaining_pages(response_json, yielded, query_params)
+
+    @classmethod
+    def bulk_delete(cls, session, resources):
+        cls().batch_delete(session, resources)
+        return resources
+
     def batch_delete(self, session, configs):
         """batch delete auto-scaling configs
 
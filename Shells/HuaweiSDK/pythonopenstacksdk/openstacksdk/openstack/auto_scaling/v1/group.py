@@ -27,6 +27,7 @@ class Group(resource.Resource):
     allow_get = True
     allow_delete = True
     allow_update = True
+    allow_status_list = True
 
     _query_mapping = resource.QueryParameters(
         "scaling_configuration_id", "limit",
@@ -95,6 +96,11 @@ class Group(resource.Resource):
         from openstack.auto_scaling.v1 import get_next_marker
         return get_next_marker(response_json, yielded)
 
+    @classmethod
+    def get_remaining_pages(cls, response_json, yielded, query_params):
+        from openstack.auto_scaling.v1 import get_remaining_pages
+        return get_remaining_pages(response_json, yielded, query_params)
+
     def _action(self, session, body):
         """Preform group actions given the message body."""
         url = utils.urljoin(self.base_path, self.id, "action")
@@ -93,6 +93,11 @@ class Policy(resource.Resource):
         from openstack.auto_scaling.v1 import get_next_marker
         return get_next_marker(response_json, yielded)
 
+    @classmethod
+    def get_remaining_pages(cls, response_json, yielded, query_params):
+        from openstack.auto_scaling.v1 import get_remaining_pages
+        return get_remaining_pages(response_json, yielded, query_params)
+
     @classmethod
     def get_list_uri(cls, params):
         return "/scaling_policy/%(scaling_group_id)s/list" % params
@@ -30,6 +30,7 @@ class Volume(resource2.Resource):
     allow_delete = True
     allow_update = True
     allow_list = True
+    allow_status_list = True
 
     # Properties
     #: A ID representing this volume.
@@ -74,6 +75,11 @@ class Volume(resource2.Resource):
     #: The timestamp of this volume creation.
     created_at = resource2.Body("created_at")
 
+    @classmethod
+    def list_statuses(cls, session, **params):
+        # Only the detailed listing reports the status of volumes.
+        return VolumeDetail.list(session, paginated=True, **params)
+
 
 class VolumeDetail(Volume):
 
@@ -76,37 +76,19 @@ class Resource(resource.Resource):
                                      page_number=query_page_number_key)
 
     @classmethod
-    def list(cls, session, paginated=False, **params):
-        """This method is a generator which yields resource objects.
-
-        This resource object list generator handles pagination and takes query
-        params for response filtering.
-
-        :param session: The session to use for making this request.
-        :type session: :class:`~openstack.session.Session`
-        :param bool paginated: ``True`` if a GET to this resource returns
-                               a paginated series of responses, or ``False``
-                               if a GET returns only one page of data.
-                               **When paginated is False only one
-                               page of data will be returned regardless
-                               of the API's support of pagination.**
-        :param dict params: These keyword arguments are passed through the
-            :meth:`~openstack.resource2.QueryParamter._transpose` method
-            to find if any of them match expected query parameters to be
-            sent in the *params* argument to
-            :meth:`~openstack.session.Session.get`. They are additionally
-            checked against the
-            :data:`~openstack.resource2.Resource.base_path` format string
-            to see if any path fragments need to be filled in by the contents
-            of this argument.
-
-        :return: A generator of :class:`Resource` objects.
-        :raises: :exc:`~openstack.exceptions.MethodNotSupported` if
-                 :data:`Resource.allow_list` is not set to ``True``.
+    def _list_pages(cls, session, paginated=False, compact=False, parallel=0,
+                    stream=False, **params):
+        """Override to page by page number
+
+        CDN service requires the page size and page number to be queried,
+        and returns the total number of resources instead of a marker.
+        Streaming is not supported, as the body of each response has to be
+        checked for an error first.
+        See :meth:`~openstack.resource2.Resource._list_pages`.
         """
-        if not cls.allow_list:
-            raise exceptions.MethodNotSupported(cls, "list")
-
+        if stream:
+            raise exceptions.InvalidRequest(
+                "Streaming is not supported when listing %s" % cls.__name__)
         more_data = True
         query_params = cls._query_mapping._transpose(params)
         if cls.query_page_size_key and \
@@ -120,34 +102,47 @@ class Resource(resource.Resource):
         uri = cls.get_list_uri(params)
 
         while more_data:
-            endpoint_override = cls.service.get_endpoint_override()
-            resp = session.get(uri, endpoint_filter=cls.service,
-                               endpoint_override=endpoint_override,
-                               headers={"Accept": "application/json"},
-                               params=query_params)
-            response_json = resp.json()
-            cls.check_error(response_json)
-            if cls.resources_key:
-                resources = cls.find_value_by_accessor(response_json,
-                                                       cls.resources_key)
-            else:
-                resources = response_json
-            if resources is None:
-                resources = []
-
-            if not resources:
+            response_json, page = cls._list_page(session, uri, query_params,
+                                                 compact=compact)
+            if not page:
                 return
 
-            for data in resources:
-                value = cls.existing(**data)
-                yield value
+            yield page
 
             if not paginated:
                 return
+            if parallel > 1:
+                remaining = cls._list_remaining_pages(
+                    session, uri, response_json, len(page), query_params,
+                    compact=compact, parallel=parallel)
+                if remaining is not None:
+                    for page in remaining:
+                        yield page
+                    return
             more_data, next_page_num = cls.get_next_pagination(response_json,
                                                                query_params)
             query_params[cls.query_page_number_key] = next_page_num
 
+    @classmethod
+    def _list_page(cls, session, uri, query_params, compact=False):
+        """Override to check if the response is an error"""
+        endpoint_override = cls.service.get_endpoint_override()
+        resp = session.get(uri, endpoint_filter=cls.service,
+                           endpoint_override=endpoint_override,
+                           headers={"Accept": "application/json"},
+                           params=query_params)
+        response_json = resp.json()
+        cls.check_error(response_json)
+        if cls.resources_key:
+            resources = cls.find_value_by_accessor(response_json,
+                                                   cls.resources_key)
+        else:
+            resources = response_json
+
+        page = [cls.existing(_compact=compact, **data)
+                for data in resources or []]
+        return response_json, page
+
     @classmethod
     def get_next_pagination(cls, response, query_params):
         total = cls.find_value_by_accessor(response, cls.total_path) or 0
@@ -157,6 +152,26 @@ class Resource(resource.Resource):
             return True, page_number + 1
         return False, page_number
 
+    @classmethod
+    def get_remaining_pages(cls, response_json, yielded, query_params):
+        """Get the query parameters of the pages following the first one
+
+        The pages are numbered from the total number of resources reported
+        in the first response.
+        """
+        if not (cls.query_page_size_key and cls.query_page_number_key):
+            return None
+        total = cls.find_value_by_accessor(response_json, cls.total_path) or 0
+        page_size = int(query_params.get(cls.query_page_size_key))
+        page_number = int(query_params.get(cls.query_page_number_key))
+        last_page = (total + page_size - 1) // page_size
+        remaining = []
+        for number in range(page_number + 1, last_page + 1):
+            params = dict(query_params)
+            params[cls.query_page_number_key] = number
+            remaining.append(params)
+        return remaining
+
     def _translate_response(self, response, has_body=True):
         """Override this method to check if the response is an error"""
         if has_body:
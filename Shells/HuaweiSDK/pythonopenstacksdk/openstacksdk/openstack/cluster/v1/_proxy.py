@@ -1044,7 +1044,7 @@ class Proxy(proxy2.BaseProxy):
         return self._list(_event.Event, paginated=True, **query)
 
     def wait_for_status(self, resource, status, failures=[], interval=2,
-                        wait=120):
+                        wait=120, policy=None):
         """Wait for a resource to be in a particular status.
 
         :param resource: The resource to wait on to reach the specified status.
@@ -1057,6 +1057,9 @@ class Proxy(proxy2.BaseProxy):
                          checks. Default to 2.
         :param wait: Maximum number of seconds to wait before the change.
                      Default to 120.
+        :param policy: The schedule of the checks. Defaults to a
+                       :class:`~openstack.resource2.PollingPolicy` starting
+                       at ``interval``.
         :returns: The resource is returned on success.
         :raises: :class:`~openstack.exceptions.ResourceTimeout` if transition
                  to the desired status failed to occur in specified seconds.
@@ -1066,9 +1069,10 @@ class Proxy(proxy2.BaseProxy):
                 ``status`` attribute.
         """
         return resource2.wait_for_status(self._session, resource, status,
-                                         failures, interval, wait)
+                                         failures, interval, wait,
+                                         policy=policy)
 
-    def wait_for_delete(self, resource, interval=2, wait=120):
+    def wait_for_delete(self, resource, interval=2, wait=120, policy=None):
         """Wait for a resource to be deleted.
 
         :param resource: The resource to wait on to be deleted.
@@ -1077,9 +1081,12 @@ class Proxy(proxy2.BaseProxy):
                          checks. Default to 2.
         :param wait: Maximum number of seconds to wait before the change.
                      Default to 120.
+        :param policy: The schedule of the checks. Defaults to a
+                       :class:`~openstack.resource2.PollingPolicy` starting
+                       at ``interval``.
         :returns: The resource is returned on success.
         :raises: :class:`~openstack.exceptions.ResourceTimeout` if transition
                  to delete failed to occur in the specified seconds.
         """
         return resource2.wait_for_delete(self._session, resource, interval,
-                                         wait)
+                                         wait, policy=policy)
@@ -0,0 +1,179 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Coalescing of identical concurrent requests.
+
+Threads provisioning servers in parallel often look up the same flavor,
+image or network at the same time, each with its own identical ``GET``. A
+:class:`RequestCoalescer` given to a session makes only the first of them,
+and hands its response, or its error, to the others which asked while it was
+in flight.
+
+Responses can also be shared for a short ``window`` after they are
+received, so that lookups following each other closely are answered
+without a request. Unlike :class:`~openstack.resource_cache.ResourceCache`,
+nothing is kept longer than that, and every resource type is coalesced.
+
+Requests are only coalesced when they are ``GET`` requests without a body,
+whose response is not streamed, and which have the same URL, endpoint
+filter, query parameters, headers and auth plugin.
+
+Examples
+--------
+
+Share responses for a second between the threads of a connection::
+
+    from openstack import coalesce
+    from openstack import connection
+
+    coalescer = coalesce.RequestCoalescer(window=1)
+    conn = connection.Connection(coalescer=coalescer, **auth_args)
+    ...
+    print(coalescer.coalesced)
+"""
+import sys
+import threading
+import time
+
+import six
+
+
+class _Call(object):
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+        # When the response stops being shared, once the call is done.
+        self.expires = None
+
+
+class RequestCoalescer(object):
+
+    def __init__(self, window=0):
+        """Make identical concurrent requests once
+
+        :param float window: The number of seconds a response is shared
+                             with identical requests made after it was
+                             received. By default it is only shared with
+                             the requests made while it was awaited.
+
+        The number of requests answered with the response of another is
+        counted in :attr:`coalesced`.
+        """
+        self.window = window
+        self.coalesced = 0
+        # Request keys mapped to the _Call in flight or shared for them.
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def run(self, key, func):
+        """Return the response of the call for key, making it if needed
+
+        :param key: A hashable identifier of the request.
+        :param func: A function making the request, which is called unless
+                     an identical request is in flight or was answered
+                     within the window.
+
+        :returns: The response of func, which is the same object for all
+                  the coalesced requests.
+        """
+        now = time.time()
+        with self._lock:
+            call = self._calls.get(key)
+            if (call is not None and call.expires is not None and
+                    call.expires <= now):
+                call = None
+            leader = call is None
+            if leader:
+                self._purge(now)
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                six.reraise(*call.error)
+            return call.response
+
+        try:
+            call.response = func()
+        except Exception:
+            call.error = sys.exc_info()
+            with self._lock:
+                self._forget(key, call)
+            call.done.set()
+            raise
+        with self._lock:
+            if self.window:
+                call.expires = time.time() + self.window
+            else:
+                self._forget(key, call)
+        call.done.set()
+        return call.response
+
+    def _forget(self, key, call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def _purge(self, now):
+        """Drop the responses whose window has passed"""
+        for key, call in list(self._calls.items()):
+            if call.expires is not None and call.expires <= now:
+                del self._calls[key]
+
+    def clear(self):
+        """Stop sharing the responses received"""
+        with self._lock:
+            for key, call in list(self._calls.items()):
+                if call.expires is not None:
+                    del self._calls[key]
+
+
+def get_key(method, url, kwargs, auth=None):
+    """Return the key requests are coalesced by, or ``None``
+
+    :param str method: The HTTP method of the request.
+    :param str url: The URL of the request.
+    :param dict kwargs: The other arguments of
+                        :meth:`~openstack.session.Session.request`.
+    :param auth: The auth plugin the request is made with, which scopes
+                 it to a project.
+    """
+    if (method or "").upper() != "GET" or kwargs.get("stream"):
+        return None
+    if kwargs.get("data") is not None or kwargs.get("json") is not None:
+        return None
+    try:
+        key = (url,
+               _freeze(kwargs.get("endpoint_filter")),
+               kwargs.get("endpoint_override"),
+               _freeze(kwargs.get("params")),
+               _freeze(kwargs.get("headers")),
+               auth,
+               kwargs.get("microversion"))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _freeze(value):
+    """Return a hashable equivalent of dicts and lists"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item))
+                            for key, item in six.iteritems(value)))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
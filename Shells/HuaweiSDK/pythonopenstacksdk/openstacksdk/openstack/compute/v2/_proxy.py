@@ -324,6 +324,19 @@ class Proxy(proxy2.BaseProxy):
         """
         return self._create(_server.Server, **attrs)
 
+    def create_servers(self, data, max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Create many servers
+
+        :param list data: The attributes of each server, as passed to
+                          :meth:`create_server`.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  item of data and in the same order.
+        """
+        return self._bulk_create(_server.Server, data,
+                                 max_workers=max_workers)
+
     def delete_server(self, server, ignore_missing=True, force=False):
         """Delete a server
 
@@ -345,6 +358,25 @@ class Proxy(proxy2.BaseProxy):
         else:
             self._delete(_server.Server, server, ignore_missing=ignore_missing)
 
+    def delete_servers(self, servers, ignore_missing=True,
+                       max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Delete many servers
+
+        :param list servers: The values can be either the ID of a server or
+                             a :class:`~openstack.compute.v2.server.Server`
+                             instance.
+        :param bool ignore_missing: When set to ``False``, the result of
+                    a server which does not exist holds a
+                    :class:`~openstack.exceptions.ResourceNotFound`.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  server and in the same order.
+        """
+        return self._bulk_delete(_server.Server, servers,
+                                 ignore_missing=ignore_missing,
+                                 max_workers=max_workers)
+
     def find_server(self, name_or_id, ignore_missing=True):
         """Find a single server
 
@@ -776,9 +808,10 @@ class Proxy(proxy2.BaseProxy):
         server.unshelve(self._session)
 
     def wait_for_server(self, server, status='ACTIVE', failures=['ERROR'],
-                        interval=2, wait=120):
+                        interval=2, wait=120, policy=None):
         return resource2.wait_for_status(self._session, server, status,
-                                         failures, interval, wait)
+                                         failures, interval, wait,
+                                         policy=policy)
 
     def create_server_interface(self, server, **attrs):
         """Create a new server interface from attributes
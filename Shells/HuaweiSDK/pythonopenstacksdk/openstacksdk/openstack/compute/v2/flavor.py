@@ -25,6 +25,7 @@ class Flavor(resource2.Resource):
     allow_get = True
     allow_delete = True
     allow_list = True
+    cache_ttl = 300
 
     _query_mapping = resource2.QueryParameters("sort_key", "sort_dir",
                                                min_disk="minDisk",
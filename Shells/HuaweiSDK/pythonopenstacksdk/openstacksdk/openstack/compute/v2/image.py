@@ -25,6 +25,7 @@ class Image(resource2.Resource, metadata.MetadataMixin):
     allow_get = True
     allow_delete = True
     allow_list = True
+    cache_ttl = 60
 
     _query_mapping = resource2.QueryParameters("server", "name",
                                                "status", "type",
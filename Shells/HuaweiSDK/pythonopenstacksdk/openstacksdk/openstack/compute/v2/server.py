@@ -28,6 +28,7 @@ class Server(resource2.Resource, metadata.MetadataMixin):
     allow_update = True
     allow_delete = True
     allow_list = True
+    allow_status_list = True
 
     _query_mapping = resource2.QueryParameters("image", "flavor", "name",
                                                "status", "host", "all_tenants",
@@ -173,6 +174,11 @@ class Server(resource2.Resource, metadata.MetadataMixin):
 
         return request
 
+    @classmethod
+    def list_statuses(cls, session, **params):
+        # Only the detailed listing reports the status of servers.
+        return ServerDetail.list(session, paginated=True, **params)
+
     def _action(self, session, body):
         """Preform server actions given the message body."""
         # NOTE: This is using Server.base_path instead of self.base_path
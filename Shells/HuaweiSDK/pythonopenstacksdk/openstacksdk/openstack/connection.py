@@ -59,6 +59,7 @@ try to find it and if that fails, you would create it::
 """
 import logging
 import sys
+import threading
 
 from keystoneauth1.loading import base as ksa_loader
 import os_client_config
@@ -93,6 +94,10 @@ def from_config(cloud_name=None, cloud_config=None, options=None):
                     the `os_client_config.config.OpenStackConfig.get_one_cloud`
                     argument to which it is passed.
 
+    The ``pool_connections``, ``pool_maxsize``, ``pool_block`` and
+    ``max_retries`` settings of the cloud configure the HTTP connection
+    pool of the session, see :class:`~openstack.session.Session`.
+
     :rtype: :class:`~openstack.connection.Connection`
     """
     # TODO(thowe): I proposed that service name defaults to None in OCC
@@ -152,6 +157,14 @@ def from_config(cloud_name=None, cloud_config=None, options=None):
         key = cloud_config.config.get('key')
         auth['cert'] = (cert, key) if key else cert
 
+    for option in ('pool_connections', 'pool_maxsize', 'max_retries'):
+        value = cloud_config.config.get(option)
+        if value is not None:
+            auth[option] = int(value)
+    pool_block = cloud_config.config.get('pool_block')
+    if pool_block is not None:
+        auth['pool_block'] = str(pool_block).lower() in ('true', 'yes', '1')
+
     return Connection(profile=prof, **auth)
 
 
@@ -159,7 +172,10 @@ class Connection(object):
 
     def __init__(self, session=None, authenticator=None, profile=None,
                  verify=True, cert=None, user_agent=None,
-                 auth_plugin="password",
+                 auth_plugin="password", discovery_cache=None,
+                 auth_cache=None, pool_connections=None, pool_maxsize=None,
+                 pool_block=None, max_retries=None, resource_cache=None,
+                 metrics=None, retry_policy=None, coalescer=None,
                  **auth_args):
         """Create a context for a connection to a cloud provider.
 
@@ -203,11 +219,49 @@ class Connection(object):
             HTTP header.
         :param str auth_plugin: The name of authentication plugin to use.
             The default value is ``password``.
+        :param discovery_cache: If a session is not provided to the
+            connection, this cache is used by the created session to share
+            discovered endpoints with other connections.
+        :type discovery_cache:
+            :class:`~openstack.discovery_cache.DiscoveryCache`
+        :param auth_cache: If a session is not provided to the connection,
+            this cache is used by the created session to reuse tokens
+            obtained by other connections with the same credentials.
+        :type auth_cache: :class:`~openstack.auth_cache.AuthCache`
+        :param int pool_connections: If a session is not provided to the
+            connection, the number of hosts the created session keeps pools
+            of connections for.
+        :param int pool_maxsize: If a session is not provided to the
+            connection, the number of connections the created session keeps
+            open per host. Set it to the number of threads making requests.
+        :param bool pool_block: If a session is not provided to the
+            connection, whether the created session waits for a free
+            connection when ``pool_maxsize`` are in use.
+        :param max_retries: If a session is not provided to the connection,
+            the number of times the created session retries a failed
+            connection, or a :class:`urllib3.util.retry.Retry`.
+        :param resource_cache: A cache the proxies of this connection read
+            slowly changing resources through, such as flavors and images.
+            By default every ``get_*`` and ``find_*`` call makes requests.
+        :type resource_cache: :class:`~openstack.resource_cache.ResourceCache`
+        :param metrics: If a session is not provided to the connection,
+            the created session records the duration, response size and
+            status of its requests there.
+        :type metrics: :class:`~openstack.metrics.RequestMetrics`
+        :param retry_policy: If a session is not provided to the
+            connection, the created session retries throttled and failed
+            requests as this policy tells.
+        :type retry_policy: :class:`~openstack.retry.RetryPolicy`
+        :param coalescer: If a session is not provided to the connection,
+            the created session makes identical concurrent ``GET``
+            requests once through it.
+        :type coalescer: :class:`~openstack.coalesce.RequestCoalescer`
         :param auth_args: The rest of the parameters provided are assumed to be
             authentication arguments that are used by the authentication
             plugin.
         """
         self.profile = profile if profile else _profile.Profile()
+        self.resource_cache = resource_cache
         if session:
             # Make sure it is the right kind of session. A keystoneauth1
             # session would work in some ways but show strange errors in
@@ -230,7 +284,12 @@ class Connection(object):
                                                             **auth_args)
             self.session = _session.Session(
                 self.profile, auth=self.authenticator, verify=verify,
-                cert=cert, user_agent=user_agent)
+                cert=cert, user_agent=user_agent,
+                discovery_cache=discovery_cache, auth_cache=auth_cache,
+                pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                pool_block=pool_block, max_retries=max_retries,
+                metrics=metrics, retry_policy=retry_policy,
+                coalescer=coalescer)
 
         self._open()
 
@@ -249,10 +308,40 @@ class Connection(object):
     def _open(self):
         """Open the connection.
 
-        NOTE(thowe): Have this set up some lazy loader instead.
+        Each service of the profile is exposed as an attribute, but its
+        proxy module is only imported and the proxy created on first
+        access. See :meth:`__getattr__`.
         """
-        for service in self.profile.get_services():
-            self._load(service)
+        self._services = dict((service.get_service_module(), service)
+                              for service in self.profile.get_services())
+        self._load_lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Only called when normal lookup fails, which is the case for
+        # services whose proxy has not been loaded yet.
+        # Services are only tried once, as a failure to load is logged.
+        # Threads sharing the connection wait for the one loading the
+        # proxy, and the service is only forgotten once it was loaded, so
+        # a service missing from _services has had its proxy set already.
+        services = self.__dict__.get("_services", {})
+        if name not in services:
+            if name in self.__dict__:
+                return self.__dict__[name]
+            raise AttributeError("%r object has no attribute %r" %
+                                 (self.__class__.__name__, name))
+        with self._load_lock:
+            service = services.get(name)
+            if service is not None and name not in self.__dict__:
+                self._load(service)
+            services.pop(name, None)
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            raise AttributeError("Unable to load the %s service" % name)
+
+    def __dir__(self):
+        return sorted(set(dir(self.__class__)) | set(self.__dict__) |
+                      set(self.__dict__.get("_services", {})))
 
     def _load(self, service):
         attr_name = service.get_service_module()
@@ -264,7 +353,12 @@ class Connection(object):
                     issubclass(proxy_class, proxy2.BaseProxy)):
                 raise TypeError("%s.Proxy must inherit from BaseProxy" %
                                 proxy_class.__module__)
-            setattr(self, attr_name, proxy_class(self.session))
+            if issubclass(proxy_class, proxy2.BaseProxy):
+                service_proxy = proxy_class(
+                    self.session, resource_cache=self.resource_cache)
+            else:
+                service_proxy = proxy_class(self.session)
+            setattr(self, attr_name, service_proxy)
         except Exception as e:
             _logger.warn("Unable to load %s: %s" % (module, e))
 
@@ -0,0 +1,147 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Caches for the endpoints found by :class:`~openstack.session.Session`.
+
+Finding the versioned endpoint of a service takes one or more requests
+for a versions document. A :class:`~openstack.session.Session` only
+remembers the result for its own lifetime, so a short-lived process pays
+for those requests every time it creates a new
+:class:`~openstack.connection.Connection`. Passing a discovery cache lets
+the results be reused across sessions and processes.
+
+Examples
+--------
+
+Share discovered endpoints through a file in the user's cache directory::
+
+    from openstack import connection
+    from openstack import discovery_cache
+
+    conn = connection.Connection(
+        discovery_cache=discovery_cache.FileDiscoveryCache(ttl=3600),
+        **auth_args)
+"""
+import contextlib
+import logging
+import os
+import threading
+import time
+
+from openstack import utils
+
+_logger = logging.getLogger(__name__)
+
+#: The default number of seconds a discovered endpoint is trusted for.
+DEFAULT_TTL = 24 * 60 * 60
+
+
+class DiscoveryCache(object):
+    """Interface of a discovery cache
+
+    Keys are tuples of strings identifying the cloud, region, service type,
+    interface and version of an endpoint. Values are dicts as created by
+    :class:`~openstack.session.Session`, which only need to be stored and
+    returned as they are.
+
+    This base class caches nothing, and can be subclassed to keep the
+    endpoints elsewhere.
+    """
+
+    def get(self, key):
+        """Return the value stored for key, or ``None`` if there is none"""
+        return None
+
+    def set(self, key, value):
+        """Store value for key"""
+
+    def invalidate(self, key):
+        """Forget the value stored for key"""
+
+
+class FileDiscoveryCache(DiscoveryCache):
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL):
+        """Keep discovered endpoints in a JSON file
+
+        The file is read again on every lookup so that endpoints found by
+        other processes are used, and rewritten atomically on every change,
+        while holding a lock on ``<path>.lock`` so that processes changing
+        it at once do not undo each other's changes. Entries expire ``ttl``
+        seconds after they were stored.
+
+        :param str path: The file to use. Defaults to ``endpoints.json`` in
+                         the directory returned by
+                         :func:`~openstack.utils.get_cache_dir`.
+        :param int ttl: The number of seconds an entry is valid for.
+        """
+        self.path = path or os.path.join(utils.get_cache_dir(),
+                                         "endpoints.json")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock:
+            try:
+                lock = utils.lock_file(self.path + ".lock")
+                lock.__enter__()
+            except (IOError, OSError) as e:
+                # The cache is best effort, like its writes.
+                _logger.debug("Unable to lock discovery cache %s: %s",
+                              self.path, e)
+                yield
+                return
+            try:
+                yield
+            finally:
+                lock.__exit__(None, None, None)
+
+    @staticmethod
+    def _key(key):
+        return "|".join("" if part is None else str(part) for part in key)
+
+    def _read(self):
+        entries = utils.read_json_file(self.path)
+        if not isinstance(entries, dict):
+            return {}
+        now = time.time()
+        return dict((key, entry) for key, entry in entries.items()
+                    if isinstance(entry, dict) and
+                    entry.get("expires", 0) > now)
+
+    def _write(self, entries):
+        try:
+            utils.write_json_file(self.path, entries)
+        except (IOError, OSError) as e:
+            _logger.debug("Unable to write discovery cache %s: %s",
+                          self.path, e)
+
+    def get(self, key):
+        entry = self._read().get(self._key(key))
+        if entry is None:
+            return None
+        return entry.get("value")
+
+    def set(self, key, value):
+        with self._locked():
+            entries = self._read()
+            entries[self._key(key)] = {"value": value,
+                                       "expires": time.time() + self.ttl}
+            self._write(entries)
+
+    def invalidate(self, key):
+        with self._locked():
+            entries = self._read()
+            if entries.pop(self._key(key), None) is not None:
+                self._write(entries)
@@ -41,34 +41,18 @@ class Resource(resource.Resource):
         return resource._Request(uri, body, headers)
 
     @classmethod
-    def list(cls, session, paginated=False, **params):
-        """This method is a generator which yields resource objects.
-
-        This resource object list generator handles pagination and takes query
-        params for response filtering.
-
-        :param session: The session to use for making this request.
-        :type session: :class:`~openstack.session.Session`
-        :param bool paginated: ``True`` if a GET to this resource returns
-                               a paginated series of responses, or ``False``
-                               if a GET returns only one page of data.
-                               **When paginated is False only one
-                               page of data will be returned regardless
-                               of the API's support of pagination.**
-        :param dict params: These keyword arguments are passed through the
-            :meth:`~openstack.resource2.QueryParamter._transpose` method
-            to find if any of them match expected query parameters to be
-            sent in the *params* argument to
-            :meth:`~openstack.session.Session.get`. They are additionally
-            checked against the
-            :data:`~openstack.resource2.Resource.base_path` format string
-            to see if any path fragments need to be filled in by the contents
-            of this argument.
-
-        :return: A generator of :class:`Resource` objects.
-        :raises: :exc:`~openstack.exceptions.MethodNotSupported` if
-                 :data:`Resource.allow_list` is not set to ``True``.
+    def _list_pages(cls, session, paginated=False, compact=False,
+                    stream=False, **params):
+        """Generate the resources of each page of a listing
+
+        This overrides :meth:`~openstack.resource2.Resource._list_pages`,
+        which does the requests for
+        :meth:`~openstack.resource2.Resource.list`, yielding a list of
+        resources per page. Streaming is not supported.
         """
+        if stream:
+            raise exceptions.InvalidRequest(
+                "Streaming is not supported when listing %s" % cls.__name__)
 
         more_data = True
         query_params = cls._query_mapping._transpose(params)
@@ -96,7 +80,7 @@ class Resource(resource.Resource):
             # Keep track of how many items we've yielded. If we yielded
             # less than our limit, we don't need to do an extra request
             # to get back an empty data set, which acts as a sentinel.
-            yielded = 0
+            page = []
             new_marker = None
             for data in resp:
                 # Do not allow keys called "self" through. Glance chose
@@ -106,10 +90,11 @@ class Resource(resource.Resource):
                 # argument and is practically a reserved word.
                 data.pop("self", None)
 
-                value = cls.existing(**data)
+                value = cls.existing(_compact=compact, **data)
                 new_marker = value.id
-                yielded += 1
-                yield value
+                page.append(value)
+            yielded = len(page)
+            yield page
 
             if not paginated:
                 return
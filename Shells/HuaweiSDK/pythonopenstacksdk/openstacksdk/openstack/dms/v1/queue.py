@@ -12,6 +12,7 @@
 
 from openstack.dms import dms_service
 from openstack.dms.v1 import dmsresource as _dmsresource
+from openstack import exceptions
 from openstack import resource2 as resource
 
 
@@ -279,7 +280,12 @@ class Quota(resource.Resource):
     used = resource.Body('used', type=int)
 
     @classmethod
-    def list(cls, session, paginated=False, **params):
+    def _list_pages(cls, session, paginated=False, compact=False,
+                    stream=False, **params):
+        if stream:
+            raise exceptions.InvalidRequest(
+                "Streaming is not supported when listing %s" % cls.__name__)
+
         more_data = True
         query_params = cls._query_mapping._transpose(params)
         uri = cls.base_path % params
@@ -307,14 +313,15 @@ class Quota(resource.Resource):
             # Keep track of how many items we've yielded. If we yielded
             # less than our limit, we don't need to do an extra request
             # to get back an empty data set, which acts as a sentinel.
-            yielded = 0
+            page = []
             new_marker = None
             for data in resp:
 
-                value = cls.existing(**data)
+                value = cls.existing(_compact=compact, **data)
                 new_marker = value.id
-                yielded += 1
-                yield value
+                page.append(value)
+            yielded = len(page)
+            yield page
 
             if not paginated:
                 return
@@ -71,6 +71,24 @@ class Proxy(proxy2.BaseProxy):
         """
         return self._delete(_zone.Zone, zone, ignore_missing=ignore_missing)
 
+    def delete_zones(self, zones, ignore_missing=True,
+                     max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Delete many zones
+
+        :param list zones: The values can be the ID of a zone
+             or a :class:`~openstack.dns.v2.zone.Zone` instance.
+        :param bool ignore_missing: When set to ``False``, the result of
+                    a zone which does not exist holds a
+                    :class:`~openstack.exceptions.ResourceNotFound`.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  zone and in the same order.
+        """
+        return self._bulk_delete(_zone.Zone, zones,
+                                 ignore_missing=ignore_missing,
+                                 max_workers=max_workers)
+
     def find_zone(self, name_or_id, ignore_missing=True):
         """Find a single zone
 
@@ -137,6 +155,24 @@ class Proxy(proxy2.BaseProxy):
         attrs.update({'zone_id': zone.id})
         return self._create(_recordset.Recordset, prepend_key=False, **attrs)
 
+    def create_recordsets(self, zone, data,
+                          max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Create many recordsets of zone
+
+        :param zone: The value can be the ID of a zone
+             or a :class:`~openstack.dns.v2.zone.Zone` instance.
+        :param list data: The attributes of each recordset, as passed to
+                          :meth:`create_recordset`.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  item of data and in the same order.
+        """
+        zone = self._get_resource(_zone.Zone, zone)
+        data = [dict(attrs, zone_id=zone.id) for attrs in data]
+        return self._bulk_create(_recordset.Recordset, data,
+                                 prepend_key=False, max_workers=max_workers)
+
     def get_recordset(self, zone, recordset):
         """Get a recordset
 
@@ -191,6 +227,27 @@ class Proxy(proxy2.BaseProxy):
         return self._delete(_recordset.Recordset, recordset,
                             ignore_missing=ignore_missing)
 
+    def delete_recordsets(self, zone, recordsets, ignore_missing=True,
+                          max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Delete many recordsets of zone
+
+        :param zone: The value can be the ID of a zone
+             or a :class:`~openstack.dns.v2.zone.Zone` instance.
+        :param list recordsets: The values can be the ID of a recordset
+             or a :class:`~openstack.dns.v2.recordset.Recordset` instance.
+        :param bool ignore_missing: When set to ``False``, the result of
+                    a recordset which does not exist holds a
+                    :class:`~openstack.exceptions.ResourceNotFound`.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  recordset and in the same order.
+        """
+        zone = self._get_resource(_zone.Zone, zone)
+        return self._bulk_delete(_recordset.Recordset, recordsets,
+                                 ignore_missing=ignore_missing,
+                                 max_workers=max_workers, zone_id=zone.id)
+
     def all_recordsets(self, **query):
         """Retrieve a generator of recordsets which belongs to `zone`
 
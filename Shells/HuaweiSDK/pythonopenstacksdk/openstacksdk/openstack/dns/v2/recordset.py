@@ -27,7 +27,7 @@ class Recordset(resource.Resource):
     allow_get = True
     allow_delete = True
 
-    _query_mapping = resource.QueryParameters("zone_type")
+    _query_mapping = resource.QueryParameters("zone_type", "name")
 
     #: Properties
     #: The id of the Zone which this recordset belongs to
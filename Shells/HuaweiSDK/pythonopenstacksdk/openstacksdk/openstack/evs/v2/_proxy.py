@@ -48,6 +48,20 @@ class Proxy(proxy2.BaseProxy):
         """
         return self._create(_volume_ext.VloumeExt, **attrs)
 
+    def create_volumes_ext(self, data,
+                           max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Create many volumes
+
+        :param list data: The attributes of each volume, as passed to
+                          :meth:`create_volume_ext`.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  item of data and in the same order.
+        """
+        return self._bulk_create(_volume_ext.VloumeExt, data,
+                                 max_workers=max_workers)
+
     def resize_volume_ext(self, volume_id, **data):
         """
         post method to modify volume size
@@ -23,6 +23,7 @@ class Extension(resource.Resource):
     # capabilities
     allow_list = True
     allow_get = True
+    cache_ttl = 300
 
     # Properties
     #: A unique identifier, which will be used for accessing the extension
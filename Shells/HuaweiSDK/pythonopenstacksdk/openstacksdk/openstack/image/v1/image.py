@@ -26,6 +26,7 @@ class Image(resource.Resource):
     allow_update = True
     allow_delete = True
     allow_list = True
+    cache_ttl = 60
 
     #: Hash of the image data used. The Image service uses this value
     #: for verification.
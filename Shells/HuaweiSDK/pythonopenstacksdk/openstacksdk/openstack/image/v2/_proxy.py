@@ -20,7 +20,9 @@ from openstack import resource2
 class Proxy(proxy2.BaseProxy):
 
     def upload_image(self, container_format=None, disk_format=None,
-                     data=None, **attrs):
+                     data=None, filename=None,
+                     chunk_size=_image.DEFAULT_CHUNK_SIZE, progress=None,
+                     **attrs):
         """Upload a new image from attributes
 
         :param container_format: Format of the container.
@@ -28,7 +30,18 @@ class Proxy(proxy2.BaseProxy):
                                  ovf, ova, or docker.
         :param disk_format: The format of the disk. A valid value is ami,
                             ari, aki, vhd, vmdk, raw, qcow2, vdi, or iso.
-        :param data: The data to be uploaded as an image.
+        :param data: The data to be uploaded as an image: bytes, a file
+                     object or an iterable of bytes, such as a generator.
+        :param str filename: The path of a file to upload as the image,
+                             instead of ``data``.
+        :param int chunk_size: The number of bytes read at a time from the
+                               data. It is sent with chunked transfer
+                               encoding, without being loaded in memory.
+        :param progress: A callable given the
+                         :class:`~openstack.image.v2.image.UploadProgress`
+                         of the upload, with the number of bytes sent,
+                         their checksum and the throughput, after every
+                         chunk.
         :param dict attrs: Keyword arguments which will be used to create
                            a :class:`~openstack.image.v2.image.Image`,
                            comprised of the properties on the Image class.
@@ -55,16 +68,27 @@ class Proxy(proxy2.BaseProxy):
         # self._create, especially because the upload_image call doesn't
         # return anything anyway. Otherwise this blocks while uploading
         # significant amounts of image data.
-        img.data = data
-        img.upload(self._session)
+        if filename is not None:
+            with open(filename, "rb") as data:
+                img.data = data
+                img.upload(self._session, chunk_size=chunk_size,
+                           progress=progress)
+        else:
+            img.data = data
+            img.upload(self._session, chunk_size=chunk_size,
+                       progress=progress)
+        self._invalidate_cache(_image.Image)
 
         return img
 
-    def download_image(self, image, stream=False):
+    def download_image(self, image, stream=False, output=None,
+                       chunk_size=_image.DEFAULT_CHUNK_SIZE, resume=False):
         """Download an image
 
         This will download an image to memory when ``stream=False``, or allow
         streaming downloads using an iterator when ``stream=True``.
+        To download an image to a file without holding it in memory, pass
+        the file as ``output``.
         For examples of working with streamed responses, see
         :ref:`download_image-stream-true` and the Requests documentation
         :ref:`body-content-workflow`.
@@ -86,14 +110,25 @@ class Proxy(proxy2.BaseProxy):
 
                             When ``False``, return the entire
                             contents of the response.
-
-        :returns: The bytes comprising the given Image when stream is
-                  False, otherwise a :class:`requests.Response`
-                  instance.
+        :param output: A path, or a file object opened for writing bytes,
+                       the image data is written to as it is received.
+                       Its checksum is verified once it is complete.
+        :param int chunk_size: The number of bytes read at a time when
+                               writing to ``output``.
+        :param bool resume: When ``True``, a download to ``output`` is
+                            continued with Range requests if its
+                            connection breaks, and an existing file at the
+                            ``output`` path is completed rather than
+                            overwritten.
+
+        :returns: ``output`` when it is given. Otherwise, the bytes
+                  comprising the given Image when stream is False, or a
+                  :class:`requests.Response` instance.
         """
 
         image = self._get_resource(_image.Image, image)
-        return image.download(self._session, stream=stream)
+        return image.download(self._session, stream=stream, output=output,
+                              chunk_size=chunk_size, resume=resume)
 
     def delete_image(self, image, ignore_missing=True):
         """Delete an image
@@ -159,7 +194,9 @@ class Proxy(proxy2.BaseProxy):
         :rtype: :class:`~openstack.image.v2.image.Image`
         """
         img = self._get_resource(_image.Image, image)
-        return img.update(self._session, **attrs)
+        img = img.update(self._session, **attrs)
+        self._invalidate_cache(_image.Image)
+        return img
 
     def deactivate_image(self, image):
         """Deactivate an image
@@ -171,6 +208,7 @@ class Proxy(proxy2.BaseProxy):
         """
         image = self._get_resource(_image.Image, image)
         image.deactivate(self._session)
+        self._invalidate_cache(_image.Image)
 
     def reactivate_image(self, image):
         """Deactivate an image
@@ -182,6 +220,7 @@ class Proxy(proxy2.BaseProxy):
         """
         image = self._get_resource(_image.Image, image)
         image.reactivate(self._session)
+        self._invalidate_cache(_image.Image)
 
     def add_tag(self, image, tag):
         """Add a tag to an image
@@ -195,6 +234,7 @@ class Proxy(proxy2.BaseProxy):
         """
         image = self._get_resource(_image.Image, image)
         image.add_tag(self._session, tag)
+        self._invalidate_cache(_image.Image)
 
     def remove_tag(self, image, tag):
         """Remove a tag to an image
@@ -208,6 +248,7 @@ class Proxy(proxy2.BaseProxy):
         """
         image = self._get_resource(_image.Image, image)
         image.remove_tag(self._session, tag)
+        self._invalidate_cache(_image.Image)
 
     def add_member(self, image, **attrs):
         """Create a new member from attributes
@@ -12,8 +12,12 @@
 
 import hashlib
 import logging
+import os
+import time
 
 import jsonpatch
+import requests
+import six
 
 from openstack import exceptions
 from openstack.image import image_service
@@ -22,6 +26,12 @@ from openstack import utils
 
 _logger = logging.getLogger(__name__)
 
+#: The default number of bytes read at a time when uploading, or when
+#: downloading to an output.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+#: The number of times a download is resumed after its connection broke.
+DEFAULT_RESUME_ATTEMPTS = 3
+
 
 class Image(resource2.Resource):
     resources_key = 'images'
@@ -35,6 +45,7 @@ class Image(resource2.Resource):
     allow_delete = True
     allow_list = True
     patch_update = True
+    cache_ttl = 60
 
     _query_mapping = resource2.QueryParameters("name", "visibility",
                                                "member_status", "owner",
@@ -254,17 +265,70 @@ class Image(resource2.Resource):
         endpoint_override = self.service.get_endpoint_override()
         session.delete(url, endpoint_filter=self.service, endpoint_override = endpoint_override)
 
-    def upload(self, session):
-        """Upload data into an existing image"""
+    def upload(self, session, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+        """Upload data into an existing image
+
+        :attr:`data` is sent with chunked transfer encoding, reading
+        ``chunk_size`` bytes at a time, so that it never needs to be held
+        in memory. It can be bytes, a file object or an iterable of bytes.
+
+        :param session: The session to use for making this request.
+        :param int chunk_size: The number of bytes read at a time from
+            bytes and file objects. Iterables are sent as they come.
+        :param progress: A callable given the :class:`UploadProgress` of
+            the upload after every chunk.
+
+        :returns: The :class:`UploadProgress` of the upload, holding the
+            number of bytes sent and their checksum.
+        """
         url = utils.urljoin(self.base_path, self.id, 'file')
         endpoint_override = self.service.get_endpoint_override()
-        session.put(url, endpoint_filter=self.service, data=self.data,
+        upload = UploadProgress(_get_data_size(self.data))
+
+        def body():
+            for chunk in _iter_data(self.data, chunk_size):
+                upload.update(chunk)
+                if progress is not None:
+                    progress(upload)
+                yield chunk
+
+        session.put(url, endpoint_filter=self.service, data=body(),
                     headers={"Content-Type": "application/octet-stream",
                              "Accept": ""},
                     endpoint_override = endpoint_override)
+        upload.finish()
+        _logger.debug("Uploaded %d bytes to image %s at %.0f bytes/s, "
+                      "checksum %s", upload.sent, self.id, upload.rate,
+                      upload.checksum)
+        return upload
+
+    def download(self, session, stream=False, output=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE, resume=False):
+        """Download the data contained in an image
+
+        :param session: The session to use for making this request.
+        :param bool stream: When ``True``, return the response to be read
+            by the caller.
+        :param output: A path, or a file object opened for writing bytes,
+            the data is written to chunk by chunk instead of being returned.
+            Its checksum is computed along the way and verified at the end.
+        :param int chunk_size: The number of bytes read at a time when
+            writing to ``output``.
+        :param bool resume: When ``True``, a download to ``output`` whose
+            connection breaks is continued where it stopped with a Range
+            request, up to :data:`DEFAULT_RESUME_ATTEMPTS` times. When
+            ``output`` is a path to an existing file, its contents are
+            taken as the beginning of the data, completing an earlier
+            interrupted download.
+
+        :returns: ``output`` when it is given, otherwise the response when
+            ``stream`` is ``True`` or the image data.
+        :raises: :class:`~openstack.exceptions.InvalidResponse` when the
+            checksum of the data does not match the one of the image.
+        """
+        if output is not None:
+            return self._download_to(session, output, chunk_size, resume)
 
-    def download(self, session, stream=False):
-        """Download the data contained in an image"""
         # TODO(briancurtin): This method should probably offload the get
         # operation into another thread or something of that nature.
         url = utils.urljoin(self.base_path, self.id, 'file')
@@ -303,6 +367,89 @@ class Image(resource2.Resource):
 
         return resp.content
 
+    def _download_to(self, session, output, chunk_size, resume):
+        md5 = hashlib.md5()
+        if not isinstance(output, six.string_types):
+            checksum, md5 = self._write_data(
+                session, output, md5, output.tell(), 0, chunk_size, resume)
+        else:
+            offset = 0
+            if resume and os.path.exists(output):
+                offset = _hash_file(output, md5, chunk_size)
+            with open(output, "ab" if offset else "wb") as fileobj:
+                checksum, md5 = self._write_data(
+                    session, fileobj, md5, 0, offset, chunk_size, resume)
+
+        if checksum is None:
+            # Use the checksum of the image when it is known already,
+            # rather than making a call for it.
+            checksum = self.checksum or self.get(session).checksum
+        digest = md5.hexdigest()
+        if checksum is None:
+            _logger.warning(
+                "Unable to verify the integrity of image %s" % (self.id))
+        elif digest != checksum:
+            raise exceptions.InvalidResponse(
+                "checksum mismatch: %s != %s" % (checksum, digest))
+        return output
+
+    def _write_data(self, session, fileobj, md5, start, offset, chunk_size,
+                    resume):
+        """Write the image data from offset on to fileobj
+
+        ``start`` is the position of the beginning of the data in fileobj,
+        which it is truncated to when the server ignores a Range request.
+
+        :returns: A tuple of the checksum sent by the server, if any, and
+            the MD5 hash of the data.
+        """
+        url = utils.urljoin(self.base_path, self.id, 'file')
+        endpoint_override = self.service.get_endpoint_override()
+        attempts = DEFAULT_RESUME_ATTEMPTS if resume else 0
+        checksum = None
+        while True:
+            headers = {}
+            if offset:
+                headers["Range"] = "bytes=%d-" % offset
+            try:
+                resp = session.get(url, endpoint_filter=self.service,
+                                   stream=True, headers=headers,
+                                   endpoint_override=endpoint_override)
+            except exceptions.HttpException as e:
+                if offset and e.http_status == 416:
+                    # Nothing is left after offset: the data is complete.
+                    return checksum, md5
+                raise
+            try:
+                checksum = resp.headers.get("Content-MD5") or checksum
+                if offset and resp.status_code != 206:
+                    # The whole data is sent again.
+                    fileobj.seek(start)
+                    fileobj.truncate()
+                    md5 = hashlib.md5()
+                    offset = 0
+                length = resp.headers.get("Content-Length")
+                end = offset + int(length) if length else None
+                for chunk in resp.iter_content(chunk_size=chunk_size):
+                    fileobj.write(chunk)
+                    md5.update(chunk)
+                    offset += len(chunk)
+                if end is None or offset >= end:
+                    return checksum, md5
+                error = "connection closed after %d bytes" % offset
+            except (requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.ConnectionError) as e:
+                error = e
+            finally:
+                resp.close()
+
+            if attempts <= 0:
+                raise exceptions.InvalidResponse(
+                    "Download of image %s interrupted: %s" % (self.id, error))
+            attempts -= 1
+            _logger.debug("Resuming download of image %s at byte %d: %s",
+                          self.id, offset, error)
+
     def update(self, session, **attrs):
         url = utils.urljoin(self.base_path, self.id)
         headers = {
@@ -318,3 +465,87 @@ class Image(resource2.Resource):
                              endpoint_override = endpoint_override)
         self._translate_response(resp, has_body=True)
         return self
+
+
+class UploadProgress(object):
+
+    def __init__(self, total=None):
+        """The progress of an upload
+
+        :param int total: The number of bytes to send, when known.
+        """
+        self.total = total
+        #: The number of bytes sent so far.
+        self.sent = 0
+        self.started = time.time()
+        self.finished = None
+        self._md5 = hashlib.md5()
+
+    def update(self, chunk):
+        self.sent += len(chunk)
+        self._md5.update(chunk)
+
+    def finish(self):
+        self.finished = time.time()
+
+    @property
+    def checksum(self):
+        """The MD5 checksum of the bytes sent so far"""
+        return self._md5.hexdigest()
+
+    @property
+    def elapsed(self):
+        """The number of seconds the upload has been running for"""
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def rate(self):
+        """The throughput of the upload, in bytes per second"""
+        elapsed = self.elapsed
+        return self.sent / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return "UploadProgress(sent=%d, total=%s, rate=%.0f)" % (
+            self.sent, self.total, self.rate)
+
+
+def _iter_data(data, chunk_size):
+    """Yield the bytes of image data in chunks"""
+    if isinstance(data, six.text_type):
+        data = data.encode("utf-8")
+    if data is None:
+        return
+    elif isinstance(data, six.binary_type):
+        for start in six.moves.range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+    elif hasattr(data, "read"):
+        while True:
+            chunk = data.read(chunk_size)
+            if not chunk:
+                return
+            if isinstance(chunk, six.text_type):
+                chunk = chunk.encode("utf-8")
+            yield chunk
+    else:
+        for chunk in data:
+            yield chunk
+
+
+def _get_data_size(data):
+    """Return the number of bytes of image data, or None if unknown"""
+    if isinstance(data, six.binary_type):
+        return len(data)
+    try:
+        return os.fstat(data.fileno()).st_size - data.tell()
+    except (AttributeError, EnvironmentError, ValueError):
+        return None
+
+
+def _hash_file(path, md5, chunk_size):
+    """Update md5 with the contents of a file and return its size"""
+    size = 0
+    with open(path, "rb") as fileobj:
+        for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+            md5.update(chunk)
+            size += len(chunk)
+    return size
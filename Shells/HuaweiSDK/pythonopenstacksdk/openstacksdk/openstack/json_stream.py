@@ -0,0 +1,208 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Incremental decoding of the lists in JSON documents.
+
+Some services return listings of hundreds of megabytes in one response.
+:class:`ItemStream` decodes the items of the list at a path of such a
+document one at a time, while the rest of it is still being received, so
+that only the item being decoded is held in memory rather than the whole
+document.
+
+Examples
+--------
+
+Read the traces of a streamed response::
+
+    response = session.get(url, endpoint_filter=service, stream=True)
+    items = json_stream.ItemStream(response.iter_content(65536), "traces")
+    for trace in items:
+        print(trace["trace_id"])
+    print(items.document)
+"""
+import codecs
+import json
+
+import six
+
+#: The default number of bytes of a response read at a time.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+# Characters which may continue a number.
+_NUMBER = "0123456789+-.eE"
+
+
+class ItemStream(object):
+
+    def __init__(self, chunks, path=None, encoding="utf-8"):
+        """Decode the items of a list in a JSON document as it is read
+
+        :param chunks: An iterable of the bytes of the document, such as
+                       the ``iter_content`` of a streamed response.
+        :param str path: The dotted path of the list in the document, such
+                         as ``quotas.resources``. When ``None``, the
+                         document is the list.
+        :param str encoding: The encoding of the document.
+
+        Iterating over the stream yields the items of the list. Once it is
+        exhausted, :attr:`document` holds the rest of the document, with
+        the list left empty, so that links and markers can be read from it.
+        """
+        self.path = path.split(".") if path else []
+        #: The document without the items of the list, once they were
+        #: all yielded.
+        self.document = None
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._json = json.JSONDecoder()
+        self._buffer = u""
+        self._pos = 0
+        # The number of characters dropped from the buffer.
+        self._offset = 0
+        self._eof = False
+        self._items = None
+
+    def __iter__(self):
+        if self._items is None:
+            self._items = self._decode()
+        return self._items
+
+    def _decode(self):
+        holder = []
+        for item in self._walk(self.path, holder):
+            yield item
+        self.document = holder[0]
+        if self._peek() is not None:
+            raise self._error("Extra data after the JSON document")
+
+    def _walk(self, path, holder):
+        """Yield the items of the list at path, from the current position
+
+        The value at the current position is appended to holder once it was
+        read, without the items yielded.
+        """
+        char = self._peek()
+        if not path:
+            if char != "[":
+                holder.append(self._value())
+                return
+            self._pos += 1
+            first = True
+            while self._next_in("]", first):
+                first = False
+                yield self._value()
+            holder.append([])
+            return
+
+        if char != "{":
+            holder.append(self._value())
+            return
+        self._pos += 1
+        document = {}
+        first = True
+        while self._next_in("}", first):
+            first = False
+            key = self._value()
+            if not isinstance(key, six.string_types):
+                raise self._error("Expected a key")
+            self._expect(":")
+            if key == path[0]:
+                found = []
+                for item in self._walk(path[1:], found):
+                    yield item
+                document[key] = found[0]
+            else:
+                document[key] = self._value()
+        holder.append(document)
+
+    def _next_in(self, end, first):
+        """Whether another value follows in the list or object being read
+
+        The separating comma, or the end character, is consumed.
+        """
+        char = self._peek()
+        if char == end:
+            self._pos += 1
+            return False
+        if char is None:
+            raise self._error("Unterminated JSON document")
+        if not first:
+            if char != ",":
+                raise self._error("Expected ',' or '%s'" % end)
+            self._pos += 1
+        return True
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise self._error("Expected '%s'" % char)
+        self._pos += 1
+
+    def _error(self, message):
+        return ValueError("%s at character %d" %
+                          (message, self._offset + self._pos))
+
+    def _peek(self):
+        """Return the next character which is not whitespace, or None"""
+        while True:
+            while (self._pos < len(self._buffer) and
+                   self._buffer[self._pos] in _WHITESPACE):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                return None
+
+    def _value(self):
+        """Decode the value at the current position
+
+        A number may be cut short by the end of the buffer, so values are
+        only taken once a character which cannot continue them follows, or
+        the document ended.
+        """
+        if self._peek() is None:
+            raise self._error("Unterminated JSON document")
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if not self._read():
+                    raise
+                continue
+            if (end < len(self._buffer) and
+                    self._buffer[end] not in _NUMBER):
+                self._pos = end
+                return value
+            # Reading moves the buffer, so the length of the value is kept.
+            length = end - self._pos
+            if not self._read():
+                self._pos += length
+                return value
+
+    def _read(self):
+        """Append the next chunk to the buffer, or return False at the end"""
+        if self._eof:
+            return False
+        # Drop what was decoded.
+        self._offset += self._pos
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._eof = True
+        text = self._decoder.decode(b"", final=True)
+        self._buffer += text
+        return bool(text)
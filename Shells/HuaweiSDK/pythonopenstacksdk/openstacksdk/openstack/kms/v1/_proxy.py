@@ -26,7 +26,10 @@ class Proxy(proxy2.BaseProxy):
         :rtype: :class:`~openstack.kms.v1.key.Key`
         """
         key_obj = _key.Key.new(**kwargs)
-        return key_obj.create(self._session, **kwargs)
+        try:
+            return key_obj.create(self._session, **kwargs)
+        finally:
+            self._invalidate_cache(_key.Key)
 
     def describe_key(self, key, **kwargs):
         """Describe a encrypt key by given key id or key object
@@ -37,12 +40,19 @@ class Proxy(proxy2.BaseProxy):
         :rtype: :class:`~openstack.kms.v1.key.Key`
         """
         if isinstance(key, _key.Key):
-            key_obj = key
-        else:
-            kwargs.update({"key_id": key})
-            key_obj = _key.Key.new(**kwargs)
+            return key.describe(self._session, **kwargs)
+
+        kwargs.update({"key_id": key})
+        key_obj = _key.Key.new(**kwargs)
+
+        def describe():
+            return key_obj.describe(self._session, **kwargs)
 
-        return key_obj.describe(self._session, **kwargs)
+        # The sequence only identifies the request.
+        cache_key = tuple(sorted((name, value)
+                                 for name, value in kwargs.items()
+                                 if name != "sequence"))
+        return self._cached(_key.Key, cache_key, describe)
 
     def keys(self, **query):
         """List all keys.
@@ -68,7 +78,10 @@ class Proxy(proxy2.BaseProxy):
             params.update({"key_id": key})
             key_obj = _key.Key.new(**params)
 
-        return key_obj.enable(self._session, **params)
+        try:
+            return key_obj.enable(self._session, **params)
+        finally:
+            self._invalidate_cache(_key.Key)
 
     def disable_key(self, key, **params):
         """Disable a key
@@ -85,7 +98,10 @@ class Proxy(proxy2.BaseProxy):
             params.update({"key_id": key})
             key_obj = _key.Key.new(**params)
 
-        return key_obj.disable(self._session, **params)
+        try:
+            return key_obj.disable(self._session, **params)
+        finally:
+            self._invalidate_cache(_key.Key)
 
     def schedule_deletion_key(self, key, pending_days, **params):
         """Schedule a key deletion
@@ -104,7 +120,10 @@ class Proxy(proxy2.BaseProxy):
             params.update({"key_id": key})
             key_obj = _key.Key.new(**params)
 
-        return key_obj.schedule_deletion(self._session, **params)
+        try:
+            return key_obj.schedule_deletion(self._session, **params)
+        finally:
+            self._invalidate_cache(_key.Key)
 
     def cancel_deletion_key(self, key, **params):
         """Cancel a key deletion
@@ -121,7 +140,10 @@ class Proxy(proxy2.BaseProxy):
             params.update({"key_id": key})
             key_obj = _key.Key.new(**params)
 
-        return key_obj.cancel_deletion(self._session, **params)
+        try:
+            return key_obj.cancel_deletion(self._session, **params)
+        finally:
+            self._invalidate_cache(_key.Key)
 
     def create_datakey(self, key, **params):
         """Create a data key
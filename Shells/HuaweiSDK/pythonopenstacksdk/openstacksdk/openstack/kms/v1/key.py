@@ -54,6 +54,7 @@ class KmsResource(resource.Resource):
 
 
 class Key(KmsResource):
+    cache_ttl = 60
 
     # Properties
     #: Secret key ID
@@ -0,0 +1,366 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Metrics of the requests made by :class:`~openstack.session.Session`.
+
+A :class:`RequestMetrics` given to a session measures every request it
+makes: a histogram of its duration, the size of its response and a count of
+its status codes. They are grouped by service type, HTTP method and URL
+template, which is the path of the request with its IDs replaced by
+``{id}``, so that ``GET /servers/{id}`` adds up the polling of all servers.
+
+Callbacks can also be run before and after each request, for instance to
+add tracing headers or to log slow requests.
+
+Examples
+--------
+
+Find which services the requests of a script waited for::
+
+    from openstack import connection
+    from openstack import metrics
+
+    request_metrics = metrics.RequestMetrics()
+    conn = connection.Connection(metrics=request_metrics, **auth_args)
+    ...
+    for series in request_metrics.snapshot():
+        print(series["service_type"], series["method"], series["url"],
+              series["count"], series["duration"]["sum"])
+
+Serve them to Prometheus, with any HTTP server::
+
+    body = request_metrics.to_prometheus()
+"""
+import logging
+import re
+import threading
+import time
+
+from six.moves.urllib import parse
+
+_logger = logging.getLogger(__name__)
+
+#: The default upper bounds of the duration buckets, in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0)
+
+# Path segments taken for IDs: UUIDs and other long hexadecimal strings,
+# and numbers.
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}"
+                         r"-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}"
+                         r"|[0-9a-fA-F]{16,}|[0-9]+)$")
+
+
+def normalize_url(url):
+    """Return the template of a request URL
+
+    The scheme, host and query of the URL are dropped, and the path
+    segments which look like IDs are replaced by ``{id}``.
+    """
+    path = parse.urlsplit(url).path
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment
+                    for segment in path.split("/"))
+
+
+class RequestInfo(object):
+
+    def __init__(self, service_type, method, url, template, headers,
+                 attempt=0, queue_wait=0.0):
+        """A request, as given to the hooks of :class:`RequestMetrics`
+
+        Before hooks can change ``headers``, which are sent with the
+        request. After hooks also get the outcome of the request.
+        """
+        #: The service type of the endpoint, or ``None`` when the request
+        #: is made to a URL.
+        self.service_type = service_type
+        #: The HTTP method.
+        self.method = method
+        #: The URL as given to the session.
+        self.url = url
+        #: The URL template the request is counted under.
+        self.template = template
+        #: The headers of the request.
+        self.headers = headers
+        #: The number of times the request was retried before this attempt.
+        self.attempt = attempt
+        #: The number of seconds the request waited for its rate limit.
+        self.queue_wait = queue_wait
+        #: The time the request started at, in seconds since the epoch.
+        self.started = time.time()
+        #: The number of seconds the request took.
+        self.elapsed = None
+        #: The response, which an error may not have.
+        self.response = None
+        #: The exception raised for the request, if it failed.
+        self.error = None
+        #: The HTTP status code, or ``None`` if no response was received.
+        self.status_code = None
+        #: The number of bytes of the response body, when it is known.
+        self.response_size = None
+
+
+class Histogram(object):
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Count observed values in buckets
+
+        :param buckets: The sorted upper bounds of the buckets. Values
+                        above the last one are only counted in the total.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative(self):
+        """Return (upper bound, number of values up to it) pairs"""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class _Series(object):
+
+    def __init__(self, buckets):
+        self.duration = Histogram(buckets)
+        self.response_bytes = 0
+        self.statuses = {}
+        self.retries = 0
+        self.queue_wait = 0.0
+
+
+class RequestMetrics(object):
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, normalize=normalize_url):
+        """Measure the requests of sessions
+
+        :param buckets: The upper bounds of the duration histogram buckets,
+                        in seconds.
+        :param normalize: A function returning the URL template a request
+                          URL is counted under. Defaults to
+                          :func:`normalize_url`.
+
+        Functions added to :attr:`before_hooks` and :attr:`after_hooks` are
+        called with the :class:`RequestInfo` of each request. A hook which
+        raises is logged and does not stop the request.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.normalize = normalize
+        self.before_hooks = []
+        self.after_hooks = []
+        # (service type, method, template) mapped to their _Series.
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def start(self, url, method, endpoint_filter=None, headers=None,
+              attempt=0, queue_wait=0.0):
+        """Start measuring a request and run the before hooks
+
+        :param str url: The URL given to the session.
+        :param str method: The HTTP method.
+        :param endpoint_filter: The endpoint filter of the request.
+        :param dict headers: The headers of the request, which the hooks
+                             may change.
+        :param int attempt: The number of times the request was retried
+                            before, which are counted as retries.
+        :param float queue_wait: The number of seconds the request waited
+                                 for the rate limit of its service.
+
+        :returns: A :class:`RequestInfo`, to pass to :meth:`finish`.
+        """
+        service_type = None
+        if endpoint_filter:
+            service_type = endpoint_filter.get("service_type")
+        info = RequestInfo(service_type, method.upper(), url,
+                           self.normalize(url), headers, attempt=attempt,
+                           queue_wait=queue_wait)
+        self._run_hooks(self.before_hooks, info)
+        return info
+
+    def finish(self, info, response=None, error=None, stream=False):
+        """Record the outcome of a request and run the after hooks
+
+        :param info: The :class:`RequestInfo` returned by :meth:`start`.
+        :param response: The response received, if any.
+        :param error: The exception raised, if the request failed.
+        :param bool stream: Whether the body of the response is streamed,
+                            in which case its size is only known from its
+                            ``Content-Length``.
+        """
+        info.elapsed = time.time() - info.started
+        info.response = response
+        info.error = error
+        if response is not None:
+            info.status_code = response.status_code
+            info.response_size = _get_size(response, stream)
+        elif error is not None:
+            info.status_code = getattr(error, "http_status", None)
+
+        key = (info.service_type, info.method, info.template)
+        status = ("error" if info.status_code is None
+                  else str(info.status_code))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.buckets)
+            series.duration.observe(info.elapsed)
+            series.response_bytes += info.response_size or 0
+            series.statuses[status] = series.statuses.get(status, 0) + 1
+            if info.attempt:
+                series.retries += 1
+            series.queue_wait += info.queue_wait or 0.0
+
+        self._run_hooks(self.after_hooks, info)
+
+    def _run_hooks(self, hooks, info):
+        for hook in hooks:
+            try:
+                hook(info)
+            except Exception:
+                _logger.warning("Request hook %r failed", hook,
+                                exc_info=True)
+
+    def reset(self):
+        """Forget every recorded request"""
+        with self._lock:
+            self._series = {}
+
+    def snapshot(self):
+        """Return the metrics recorded so far
+
+        :returns: A list of dicts, one per service type, method and URL
+                  template, with their ``count`` of requests, the
+                  ``duration`` histogram with its ``sum`` and cumulative
+                  ``buckets``, the ``response_bytes`` received and the
+                  number of responses per status code in ``statuses``.
+                  Requests which got no response are counted as
+                  ``"error"``. Retries are counted in the above as well
+                  as in ``retries``. The seconds spent waiting for rate
+                  limits are added up in ``queue_wait``.
+        """
+        with self._lock:
+            result = []
+            for key in sorted(self._series, key=_sort_key):
+                series = self._series[key]
+                service_type, method, template = key
+                result.append({
+                    "service_type": service_type,
+                    "method": method,
+                    "url": template,
+                    "count": series.duration.count,
+                    "duration": {
+                        "sum": series.duration.sum,
+                        "buckets": series.duration.cumulative()},
+                    "response_bytes": series.response_bytes,
+                    "statuses": dict(series.statuses),
+                    "retries": series.retries,
+                    "queue_wait": series.queue_wait})
+            return result
+
+    def to_prometheus(self, prefix="openstacksdk"):
+        """Return the metrics in the Prometheus text exposition format
+
+        :param str prefix: The prefix of the metric names.
+        """
+        snapshot = self.snapshot()
+        duration = prefix + "_request_duration_seconds"
+        size = prefix + "_response_bytes_total"
+        responses = prefix + "_responses_total"
+        retries = prefix + "_retries_total"
+        queue_wait = prefix + "_queue_wait_seconds_total"
+        lines = [
+            "# HELP %s Duration of the requests." % duration,
+            "# TYPE %s histogram" % duration]
+        for series in snapshot:
+            labels = _labels(series)
+            for bound, count in series["duration"]["buckets"]:
+                lines.append('%s_bucket{%s,le="%s"} %d' %
+                             (duration, labels, _format(bound), count))
+            lines.append('%s_bucket{%s,le="+Inf"} %d' %
+                         (duration, labels, series["count"]))
+            lines.append("%s_sum{%s} %s" %
+                         (duration, labels,
+                          _format(series["duration"]["sum"])))
+            lines.append("%s_count{%s} %d" %
+                         (duration, labels, series["count"]))
+        lines.extend([
+            "# HELP %s Bytes of the response bodies." % size,
+            "# TYPE %s counter" % size])
+        for series in snapshot:
+            lines.append("%s{%s} %d" % (size, _labels(series),
+                                        series["response_bytes"]))
+        lines.extend([
+            "# HELP %s Responses by status code." % responses,
+            "# TYPE %s counter" % responses])
+        for series in snapshot:
+            labels = _labels(series)
+            for status, count in sorted(series["statuses"].items()):
+                lines.append('%s{%s,status="%s"} %d' %
+                             (responses, labels, status, count))
+        lines.extend([
+            "# HELP %s Requests made again after failing." % retries,
+            "# TYPE %s counter" % retries])
+        for series in snapshot:
+            lines.append("%s{%s} %d" % (retries, _labels(series),
+                                        series["retries"]))
+        lines.extend([
+            "# HELP %s Time waited for rate limits." % queue_wait,
+            "# TYPE %s counter" % queue_wait])
+        for series in snapshot:
+            lines.append("%s{%s} %s" % (queue_wait, _labels(series),
+                                        _format(series["queue_wait"])))
+        return "\n".join(lines) + "\n"
+
+
+def _get_size(response, stream):
+    length = response.headers.get("Content-Length")
+    if length is not None:
+        try:
+            return int(length)
+        except ValueError:
+            pass
+    if stream:
+        return None
+    return len(response.content or b"")
+
+
+def _sort_key(key):
+    return tuple("" if part is None else part for part in key)
+
+
+def _labels(series):
+    return ",".join('%s="%s"' % (name, _escape(series[name]))
+                    for name in ("service_type", "method", "url"))
+
+
+def _escape(value):
+    if value is None:
+        return ""
+    return (value.replace("\\", "\\\\").replace("\n", "\\n")
+            .replace('"', '\\"'))
+
+
+def _format(value):
+    return repr(float(value))
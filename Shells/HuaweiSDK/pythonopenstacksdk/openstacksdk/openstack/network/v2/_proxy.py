@@ -502,6 +502,26 @@ class Proxy(proxy2.BaseProxy):
         self._delete(_floating_ip.FloatingIP, floating_ip,
                      ignore_missing=ignore_missing)
 
+    def delete_ips(self, floating_ips, ignore_missing=True,
+                   max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Delete many floating ips
+
+        :param list floating_ips: The values can be either the ID of a
+                    floating ip or a
+                    :class:`~openstack.network.v2.floating_ip.FloatingIP`
+                    instance.
+        :param bool ignore_missing: When set to ``False``, the result of
+                    a floating ip which does not exist holds a
+                    :class:`~openstack.exceptions.ResourceNotFound`.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  floating ip and in the same order.
+        """
+        return self._bulk_delete(_floating_ip.FloatingIP, floating_ips,
+                                 ignore_missing=ignore_missing,
+                                 max_workers=max_workers)
+
     def find_available_ip(self):
         """Find an available IP
 
@@ -1425,6 +1445,25 @@ class Proxy(proxy2.BaseProxy):
         """
         return self._create(_port.Port, **attrs)
 
+    def create_ports(self, data, bulk_size=None,
+                     max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Create many ports
+
+        Ports are created with bulk requests of up to ``bulk_size`` ports.
+
+        :param list data: The attributes of each port, as passed to
+                          :meth:`create_port`.
+        :param int bulk_size: The maximum number of ports per request.
+                              Defaults to 100.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  item of data and in the same order. All the ports of a
+                  failed request fail with its error.
+        """
+        return self._bulk_create(_port.Port, data, bulk_size=bulk_size,
+                                 max_workers=max_workers)
+
     def delete_port(self, port, ignore_missing=True):
         """Delete a port
 
@@ -1440,6 +1479,24 @@ class Proxy(proxy2.BaseProxy):
         """
         self._delete(_port.Port, port, ignore_missing=ignore_missing)
 
+    def delete_ports(self, ports, ignore_missing=True,
+                     max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Delete many ports
+
+        :param list ports: The values can be either the ID of a port or a
+                           :class:`~openstack.network.v2.port.Port` instance.
+        :param bool ignore_missing: When set to ``False``, the result of
+                    a port which does not exist holds a
+                    :class:`~openstack.exceptions.ResourceNotFound`.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  port and in the same order.
+        """
+        return self._bulk_delete(_port.Port, ports,
+                                 ignore_missing=ignore_missing,
+                                 max_workers=max_workers)
+
     def find_port(self, name_or_id, ignore_missing=True):
         """Find a single port
 
@@ -2381,6 +2438,27 @@ class Proxy(proxy2.BaseProxy):
         self._delete(_security_group.SecurityGroup, security_group,
                      ignore_missing=ignore_missing)
 
+    def delete_security_groups(self, security_groups, ignore_missing=True,
+                               max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Delete many security groups
+
+        :param list security_groups:
+            The values can be either the ID of a security group or a
+            :class:`~openstack.network.v2.security_group.SecurityGroup`
+            instance.
+        :param bool ignore_missing: When set to ``False``, the result of
+                    a security group which does not exist holds a
+                    :class:`~openstack.exceptions.ResourceNotFound`.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  security group and in the same order.
+        """
+        return self._bulk_delete(_security_group.SecurityGroup,
+                                 security_groups,
+                                 ignore_missing=ignore_missing,
+                                 max_workers=max_workers)
+
     def find_security_group(self, name_or_id, ignore_missing=True):
         """Find a single security group
 
@@ -2484,6 +2562,26 @@ class Proxy(proxy2.BaseProxy):
         """
         return self._create(_security_group_rule.SecurityGroupRule, **attrs)
 
+    def create_security_group_rules(self, data, bulk_size=None,
+                                    max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Create many security group rules
+
+        Rules are created with bulk requests of up to ``bulk_size`` rules.
+
+        :param list data: The attributes of each security group rule, as
+                          passed to :meth:`create_security_group_rule`.
+        :param int bulk_size: The maximum number of rules per request.
+                              Defaults to 100.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  item of data and in the same order. All the rules of a
+                  failed request fail with its error.
+        """
+        return self._bulk_create(_security_group_rule.SecurityGroupRule,
+                                 data, bulk_size=bulk_size,
+                                 max_workers=max_workers)
+
     def delete_security_group_rule(self, security_group_rule,
                                    ignore_missing=True):
         """Delete a security group rule
@@ -2503,6 +2601,28 @@ class Proxy(proxy2.BaseProxy):
         self._delete(_security_group_rule.SecurityGroupRule,
                      security_group_rule, ignore_missing=ignore_missing)
 
+    def delete_security_group_rules(self, security_group_rules,
+                                    ignore_missing=True,
+                                    max_workers=proxy2.DEFAULT_BULK_WORKERS):
+        """Delete many security group rules
+
+        :param list security_group_rules:
+            The values can be either the ID of a security group rule
+            or a :class:`~openstack.network.v2.security_group_rule.
+            SecurityGroupRule` instance.
+        :param bool ignore_missing: When set to ``False``, the result of
+                    a security group rule which does not exist holds a
+                    :class:`~openstack.exceptions.ResourceNotFound`.
+        :param int max_workers: The maximum number of concurrent requests.
+
+        :returns: A list of :class:`~openstack.proxy2.BulkResult`, one per
+                  security group rule and in the same order.
+        """
+        return self._bulk_delete(_security_group_rule.SecurityGroupRule,
+                                 security_group_rules,
+                                 ignore_missing=ignore_missing,
+                                 max_workers=max_workers)
+
     def find_security_group_rule(self, name_or_id, ignore_missing=True):
         """Find a single security group rule
 
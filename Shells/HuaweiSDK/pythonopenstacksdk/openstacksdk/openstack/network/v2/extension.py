@@ -23,6 +23,7 @@ class Extension(resource.Resource):
     # capabilities
     allow_get = True
     allow_list = True
+    cache_ttl = 300
 
     # NOTE: No query parameters supported
 
@@ -27,6 +27,7 @@ class Flavor(resource.Resource):
     allow_update = True
     allow_delete = True
     allow_list = True
+    cache_ttl = 300
 
     _query_mapping = resource.QueryParameters(
         'description', 'name', 'service_type', is_enabled='enabled')
@@ -26,6 +26,8 @@ class Port(resource.Resource):
     allow_update = True
     allow_delete = True
     allow_list = True
+    allow_bulk_create = True
+    bulk_size = 100
 
     # NOTE: we skip query on list or datetime fields for now
     _query_mapping = resource.QueryParameters(
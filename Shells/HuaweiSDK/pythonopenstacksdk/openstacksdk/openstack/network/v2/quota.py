@@ -25,6 +25,7 @@ class Quota(resource.Resource):
     allow_update = True
     allow_delete = True
     allow_list = True
+    cache_ttl = 60
 
     # Properties
     #: The maximum amount of floating IPs you can have. *Type: int*
@@ -26,6 +26,8 @@ class SecurityGroupRule(resource.Resource):
     allow_update = False
     allow_delete = True
     allow_list = True
+    allow_bulk_create = True
+    bulk_size = 100
 
     _query_mapping = resource.QueryParameters(
         'description', 'direction', 'protocol',
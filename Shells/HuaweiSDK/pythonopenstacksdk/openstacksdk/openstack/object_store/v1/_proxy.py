@@ -10,9 +10,11 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from openstack import exceptions
 from openstack.object_store.v1 import account as _account
 from openstack.object_store.v1 import container as _container
 from openstack.object_store.v1 import obj as _obj
+from openstack.object_store.v1 import transfer as _transfer
 from openstack import proxy
 
 
@@ -188,25 +190,44 @@ class Proxy(proxy.BaseProxy):
         return self._get(_obj.Object, obj,
                          path_args={"container": container_name})
 
-    def download_object(self, obj, container=None, path=None):
+    def download_object(self, obj, container=None, path=None,
+                        segment_size=_transfer.DEFAULT_SEGMENT_SIZE,
+                        max_workers=_transfer.DEFAULT_MAX_WORKERS,
+                        chunk_size=_transfer.DEFAULT_CHUNK_SIZE):
         """Download the data contained inside an object to disk.
 
+        The data is written as it is received, ``chunk_size`` bytes at a
+        time. Objects larger than ``segment_size`` are downloaded in byte
+        ranges, ``max_workers`` at a time, into a preallocated file.
+        See :class:`~openstack.object_store.v1.transfer.TransferManager`.
+
         :param obj: The value can be the name of an object or a
                        :class:`~openstack.object_store.v1.obj.Object` instance.
         :param container: The value can be the name of a container or a
                :class:`~openstack.object_store.v1.container.Container`
                instance.
         :param path str: Location to write the object contents.
+        :param int segment_size: The number of bytes of each range.
+        :param int max_workers: The number of ranges downloaded at once.
+        :param int chunk_size: The number of bytes written at a time.
 
         :raises: :class:`~openstack.exceptions.ResourceNotFound`
                  when no resource can be found.
         """
-        # TODO(briancurtin): download_object should really have the behavior
-        # of get_object, and this writing to a file should not exist.
-        # TODO(briancurtin): This method should probably offload the get
-        # operation into another thread or something of that nature.
-        with open(path, "w") as out:
-            out.write(self.get_object(obj, container))
+        container_name = self._get_container_name(obj, container)
+        res = self._get_resource(_obj.Object, obj,
+                                 path_args={"container": container_name})
+        manager = _transfer.TransferManager(
+            self._session, max_workers=max_workers,
+            segment_size=segment_size, chunk_size=chunk_size)
+        try:
+            manager.download(container_name, res.name, path)
+        except exceptions.NotFoundException as e:
+            raise exceptions.ResourceNotFound(
+                message="No %s found for %s" % (_obj.Object.__name__, obj),
+                details=e.details, response=e.response,
+                request_id=e.request_id, url=e.url, method=e.method,
+                http_status=e.http_status, cause=e.cause)
 
     def upload_object(self, **attrs):
         """Upload a new object from attributes
@@ -228,9 +249,86 @@ class Proxy(proxy.BaseProxy):
         return self._create(_obj.Object,
                             path_args={"container": container_name}, **attrs)
 
-    def copy_object(self):
-        """Copy an object."""
-        raise NotImplementedError
+    def upload_large_object(self, container, name, filename,
+                            segment_size=_transfer.DEFAULT_SEGMENT_SIZE,
+                            segment_container=None, use_slo=True,
+                            max_workers=_transfer.DEFAULT_MAX_WORKERS,
+                            chunk_size=_transfer.DEFAULT_CHUNK_SIZE,
+                            **attrs):
+        """Upload a file as an object, in concurrent segments
+
+        Files larger than ``segment_size`` are uploaded as segments,
+        ``max_workers`` at a time, joined by a large object manifest.
+        See :class:`~openstack.object_store.v1.transfer.TransferManager`.
+
+        :param container: The value can be the name of a container or a
+               :class:`~openstack.object_store.v1.container.Container`
+               instance.
+        :param str name: The name of the object.
+        :param str filename: The path of the file to upload.
+        :param int segment_size: The number of bytes of each segment.
+        :param segment_container: The value can be the name of the
+               container to upload segments to, or a
+               :class:`~openstack.object_store.v1.container.Container`
+               instance. Defaults to ``<container>_segments``.
+        :param bool use_slo: When set to ``True`` the segments are joined by
+                             a static large object manifest, otherwise by a
+                             dynamic one.
+        :param int max_workers: The number of segments uploaded at once.
+        :param int chunk_size: The number of bytes read at a time.
+        :param dict attrs: Keyword arguments which will be used to create
+               a :class:`~openstack.object_store.v1.obj.Object`,
+               comprised of the properties on the Object class.
+
+        :returns: The results of object creation
+        :rtype: :class:`~openstack.object_store.v1.obj.Object`
+        """
+        container_name = self._get_container_name(None, container)
+        if segment_container is not None:
+            segment_container = self._get_container_name(None,
+                                                         segment_container)
+        manager = _transfer.TransferManager(
+            self._session, max_workers=max_workers,
+            segment_size=segment_size, chunk_size=chunk_size)
+        return manager.upload(container_name, name, filename,
+                              segment_container=segment_container,
+                              use_slo=use_slo, **attrs)
+
+    def copy_object(self, obj, container=None, destination_container=None,
+                    destination_name=None, **attrs):
+        """Copy an object on the server
+
+        The data is copied by the Object Store with ``X-Copy-From``,
+        without being downloaded.
+
+        :param obj: The value can be the name of an object or a
+                    :class:`~openstack.object_store.v1.obj.Object` instance.
+        :param container: The value can be the name of a container or a
+               :class:`~openstack.object_store.v1.container.Container`
+               instance.
+        :param destination_container: The value can be the name of the
+               container to copy to, or a
+               :class:`~openstack.object_store.v1.container.Container`
+               instance. Defaults to the container of the object.
+        :param str destination_name: The name of the copy. Defaults to the
+                                     name of the object.
+        :param dict attrs: Keyword arguments which will be used to create
+               the copy, comprised of the properties on the Object class.
+
+        :returns: The results of object creation
+        :rtype: :class:`~openstack.object_store.v1.obj.Object`
+        """
+        container_name = self._get_container_name(obj, container)
+        res = self._get_resource(_obj.Object, obj,
+                                 path_args={"container": container_name})
+        if destination_container is None:
+            destination_container = container_name
+        else:
+            destination_container = self._get_container_name(
+                None, destination_container)
+        manager = _transfer.TransferManager(self._session)
+        return manager.copy(container_name, res.name, destination_container,
+                            destination_name=destination_name, **attrs)
 
     def delete_object(self, obj, ignore_missing=True, container=None):
         """Delete an object
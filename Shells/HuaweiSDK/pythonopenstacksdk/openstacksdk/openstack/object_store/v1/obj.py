@@ -12,6 +12,8 @@
 # under the License.
 
 import copy
+import json
+
 import six
 
 from openstack.object_store import object_store_service
@@ -218,6 +220,51 @@ class Object(_base.BaseResource):
         self._set_metadata()
         return resp
 
+    def stream(self, session, start=None, end=None, if_match=None):
+        """Get the data of this object as a streamed response
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param int start: The offset of the first byte to get.
+        :param int end: The offset of the last byte to get, included.
+        :param str if_match: An ETag the object must still have, otherwise
+                             the request fails with
+                             ``412 Precondition Failed``.
+
+        :return: A :class:`requests.Response` whose data is read with
+                 ``iter_content``, and which must be closed.
+        """
+        url = self._get_url(self, self.id)
+        headers = {'Accept': 'bytes'}
+        if start is not None or end is not None:
+            end = "" if end is None else end
+            headers['Range'] = "bytes=%s-%s" % (start or 0, end)
+        if if_match:
+            headers['If-Match'] = if_match
+        return session.get(url, endpoint_filter=self.service,
+                           headers=headers, stream=True)
+
+    def create_manifest(self, session, segments):
+        """Create this object as a static large object manifest
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param list segments: The segments of the object, in order, as
+                              dicts of the ``path``, ``etag`` and
+                              ``size_bytes`` of each.
+
+        :return: This instance.
+        """
+        url = self._get_url(self, self.id)
+        headers = self.get_headers()
+        headers['Accept'] = ''
+        resp = session.put(url, endpoint_filter=self.service,
+                           params={"multipart-manifest": "put"},
+                           data=json.dumps(segments),
+                           headers=headers).headers
+        self.set_headers(resp)
+        return self
+
     def create(self, session):
         url = self._get_url(self, self.id)
 
@@ -0,0 +1,384 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Transfers of large objects with the Object Store.
+
+A :class:`TransferManager` moves objects of any size without holding them
+in memory:
+
+* Uploads are split in segments, which are sent concurrently from the file
+  and then joined by a static (SLO) or dynamic (DLO) large object manifest.
+* Downloads get byte ranges of the object concurrently, and write each at
+  its offset in a preallocated file.
+* Copies are made by the server with ``X-Copy-From``, so the data does not
+  go through the client.
+
+Each segment or range is retried on its own when it fails. At most
+``max_workers`` of them are in flight at once, each reading or writing one
+``chunk_size`` buffer at a time, so memory stays bounded by
+``chunk_size * max_workers``.
+
+Ranges are only downloaded while the object keeps the ETag it had when the
+download started, so that an object overwritten meanwhile fails with
+:class:`ObjectChanged` rather than leaving a file mixing both versions. The
+segments of an upload which fails are deleted.
+
+Examples
+--------
+
+Upload a disk image as a static large object and download it back::
+
+    from openstack.object_store.v1 import transfer
+
+    manager = transfer.TransferManager(conn.session, max_workers=8)
+    manager.upload("backups", "disk.img", "/var/tmp/disk.img")
+    manager.download("backups", "disk.img", "/var/tmp/disk-copy.img")
+
+The same transfers are made by
+:meth:`~openstack.object_store.v1._proxy.Proxy.upload_large_object` and
+:meth:`~openstack.object_store.v1._proxy.Proxy.download_object`.
+"""
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+
+from keystoneauth1 import exceptions as _exceptions
+import requests
+import six
+from six.moves.urllib import parse
+
+from openstack import exceptions
+from openstack.object_store.v1 import container as _container
+from openstack.object_store.v1 import obj as _obj
+from openstack import resource2
+
+_logger = logging.getLogger(__name__)
+
+#: The default number of bytes read or written at a time.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+#: The default size of the segments of uploads and ranges of downloads.
+DEFAULT_SEGMENT_SIZE = 128 * 1024 * 1024
+#: The default number of segments or ranges transferred at once.
+DEFAULT_MAX_WORKERS = 4
+#: The default number of times a segment or range is retried.
+DEFAULT_RETRIES = 3
+
+
+class IncompleteTransfer(exceptions.InvalidResponse):
+    """A segment or range was not transferred entirely or correctly."""
+
+
+class ObjectChanged(exceptions.InvalidResponse):
+    """An object was overwritten while it was downloaded."""
+
+
+class TransferManager(object):
+
+    def __init__(self, session, max_workers=DEFAULT_MAX_WORKERS,
+                 segment_size=DEFAULT_SEGMENT_SIZE,
+                 chunk_size=DEFAULT_CHUNK_SIZE, retries=DEFAULT_RETRIES,
+                 retry_interval=1):
+        """Transfer objects in segments on a pool of threads
+
+        :param session: The session to make requests with.
+        :type session: :class:`~openstack.session.Session`
+        :param int max_workers: The number of segments or ranges
+            transferred at once.
+        :param int segment_size: The number of bytes of each segment of an
+            upload, and of each range of a download. Files and objects no
+            larger than this are transferred with a single request.
+        :param int chunk_size: The number of bytes read or written at a
+            time by each transfer.
+        :param int retries: The number of times a segment or range is
+            retried after a connection error, a server error or a checksum
+            mismatch.
+        :param float retry_interval: The number of seconds before the first
+            retry of a segment, doubled for each of the following ones.
+        """
+        self.session = session
+        self.max_workers = max_workers
+        self.segment_size = segment_size
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.retry_interval = retry_interval
+
+    def upload(self, container, name, filename, segment_container=None,
+               use_slo=True, **attrs):
+        """Upload a file as an object, in segments if it is large
+
+        :param str container: The name of the container of the object.
+        :param str name: The name of the object.
+        :param str filename: The path of the file to upload.
+        :param str segment_container: The name of the container to upload
+            segments to. Defaults to ``<container>_segments``, which is
+            created if needed.
+        :param bool use_slo: Whether to join the segments with a static
+            large object manifest, which lists them with their checksum,
+            rather than a dynamic one, which serves all the objects under
+            their prefix.
+        :param attrs: Attributes of the
+            :class:`~openstack.object_store.v1.obj.Object`, such as
+            ``content_type``.
+
+        :returns: The :class:`~openstack.object_store.v1.obj.Object`
+            created, which is the manifest for segmented uploads.
+
+        When a segment still fails after its retries, or the manifest
+        cannot be created, the segments uploaded are deleted before the
+        error is raised.
+        """
+        size = os.path.getsize(filename)
+        if size <= self.segment_size:
+            ob, _ = self._retry(self._put_range, container, name, filename,
+                                0, size, attrs)
+            return ob
+
+        segment_container = segment_container or container + "_segments"
+        _container.Container.new(name=segment_container).create(self.session)
+        prefix = "%s/%s/%f/%d/%d" % (name, "slo" if use_slo else "dlo",
+                                     os.path.getmtime(filename), size,
+                                     self.segment_size)
+        segments = [("%s/%08d" % (prefix, index), start,
+                     min(self.segment_size, size - start))
+                    for index, start in enumerate(
+                        range(0, size, self.segment_size))]
+
+        # The segments uploaded, which are deleted if the upload fails.
+        # Segments still in flight when it fails delete themselves.
+        uploaded = []
+        state = {"failed": False}
+        lock = threading.Lock()
+
+        def put_segment(segment):
+            segment_name, start, length = segment
+            _, etag = self._retry(self._put_range, segment_container,
+                                  segment_name, filename, start, length)
+            with lock:
+                failed = state["failed"]
+                if not failed:
+                    uploaded.append(segment_name)
+            if failed:
+                self._delete_segments(segment_container, [segment_name])
+            return {"path": "/%s/%s" % (segment_container, segment_name),
+                    "etag": etag, "size_bytes": length}
+
+        try:
+            manifest = list(resource2.fetch_pages(put_segment, segments,
+                                                  self.max_workers))
+            if use_slo:
+                ob = _obj.Object.new(container=container, name=name,
+                                     **attrs)
+                return ob.create_manifest(self.session, manifest)
+            ob = _obj.Object.new(container=container, name=name, data=b"",
+                                 object_manifest="%s/%s/" % (
+                                     segment_container, prefix),
+                                 **attrs)
+            return ob.create(self.session)
+        except Exception:
+            error = sys.exc_info()
+            with lock:
+                state["failed"] = True
+                names = list(uploaded)
+            self._delete_segments(segment_container, names)
+            six.reraise(*error)
+
+    def download(self, container, name, path):
+        """Download an object to a file
+
+        Objects larger than the segment size are downloaded in concurrent
+        byte ranges, each written at its offset in the file, which is
+        preallocated to the size of the object. Smaller objects are
+        downloaded with a single request, and their checksum is verified
+        unless they are large object manifests.
+
+        :param str container: The name of the container of the object.
+        :param str name: The name of the object.
+        :param str path: The path of the file to write.
+
+        :returns: The :class:`~openstack.object_store.v1.obj.Object`
+            downloaded, with the headers of its HEAD request.
+        :raises: :class:`ObjectChanged` when the object was overwritten
+            during the download, which leaves the file incomplete.
+        """
+        ob = _obj.Object.new(container=container, name=name)
+        ob.head(self.session)
+        size = int(ob.content_length or 0)
+        with open(path, "wb") as fileobj:
+            fileobj.truncate(size)
+
+        if size <= self.segment_size:
+            self._retry(self._get_range, ob, path, 0, size, True)
+            return ob
+
+        ranges = [(start, min(self.segment_size, size - start))
+                  for start in range(0, size, self.segment_size)]
+
+        def get_range(byte_range):
+            start, length = byte_range
+            self._retry(self._get_range, ob, path, start, length, False)
+
+        for _ in resource2.fetch_pages(get_range, ranges, self.max_workers):
+            pass
+        return ob
+
+    def copy(self, container, name, destination_container,
+             destination_name=None, **attrs):
+        """Copy an object on the server
+
+        :param str container: The name of the container of the object.
+        :param str name: The name of the object.
+        :param str destination_container: The name of the container to
+            copy the object to.
+        :param str destination_name: The name of the copy. Defaults to
+            ``name``.
+        :param attrs: Attributes of the copy, such as ``content_type``.
+
+        :returns: The :class:`~openstack.object_store.v1.obj.Object`
+            created.
+        """
+        copy_from = "%s/%s" % (parse.quote(container), parse.quote(name))
+        ob = _obj.Object.new(container=destination_container,
+                             name=destination_name or name, data=b"",
+                             copy_from=copy_from, **attrs)
+        return ob.create(self.session)
+
+    def _put_range(self, container, name, filename, start, length,
+                   attrs=None):
+        """PUT length bytes of a file from start as an object
+
+        :returns: A tuple of the object created and the MD5 of its data.
+        """
+        md5 = hashlib.md5()
+        with open(filename, "rb") as fileobj:
+            fileobj.seek(start)
+            ob = _obj.Object.new(
+                container=container, name=name,
+                data=_read(fileobj, length, self.chunk_size, md5),
+                **(attrs or {}))
+            ob.create(self.session)
+        digest = md5.hexdigest()
+        etag = (ob.etag or "").strip('"')
+        if etag and etag != digest:
+            raise IncompleteTransfer(
+                "checksum mismatch for %s/%s: %s != %s" %
+                (container, name, etag, digest))
+        return ob, digest
+
+    def _get_range(self, ob, path, start, length, whole):
+        """Write length bytes of an object from start to a file
+
+        When whole is set, the object is requested without a range and its
+        checksum is verified. Otherwise the range is only taken from the
+        version of the object its HEAD request was answered for.
+        """
+        if length == 0:
+            return
+        try:
+            if whole:
+                resp = ob.stream(self.session)
+            else:
+                resp = ob.stream(self.session, start, start + length - 1,
+                                 if_match=ob.etag)
+        except exceptions.HttpException as e:
+            if e.http_status == 412:
+                raise ObjectChanged("%s was changed during the download" %
+                                    ob.name)
+            raise
+        md5 = hashlib.md5()
+        received = 0
+        etag = resp.headers.get("etag") or ob.etag
+        try:
+            if not whole and resp.status_code != 206:
+                raise exceptions.InvalidResponse(
+                    "The server does not support ranges")
+            if not whole and ob.etag and etag != ob.etag:
+                # Servers ignoring If-Match still tell the version sent.
+                raise ObjectChanged("%s was changed during the download" %
+                                    ob.name)
+            with open(path, "r+b") as fileobj:
+                fileobj.seek(start)
+                for chunk in resp.iter_content(chunk_size=self.chunk_size):
+                    received += len(chunk)
+                    if received > length:
+                        raise IncompleteTransfer(
+                            "%s is larger than expected" % ob.name)
+                    fileobj.write(chunk)
+                    md5.update(chunk)
+        finally:
+            resp.close()
+
+        if received < length:
+            raise IncompleteTransfer(
+                "%d of %d bytes received for %s" %
+                (received, length, ob.name))
+        if whole and not _is_large_object(ob):
+            etag = (etag or "").strip('"')
+            if etag and etag != md5.hexdigest():
+                raise IncompleteTransfer(
+                    "checksum mismatch for %s: %s != %s" %
+                    (ob.name, etag, md5.hexdigest()))
+
+    def _delete_segments(self, container, names):
+        """Delete the segments of a failed upload, as far as possible"""
+        for segment_name in names:
+            try:
+                _obj.Object.new(container=container,
+                                name=segment_name).delete(self.session)
+            except exceptions.SDKException as e:
+                _logger.warning("Unable to delete segment %s/%s: %s",
+                                container, segment_name, e)
+
+    def _retry(self, func, *args):
+        attempt = 0
+        while True:
+            try:
+                return func(*args)
+            except Exception as e:
+                if attempt >= self.retries or not _is_retryable(e):
+                    raise
+                attempt += 1
+                _logger.debug("Retrying transfer, attempt %d of %d: %s",
+                              attempt, self.retries, e)
+                time.sleep(self.retry_interval * 2 ** (attempt - 1))
+
+
+def _read(fileobj, length, chunk_size, md5):
+    """Yield length bytes of fileobj in chunks, updating md5"""
+    while length > 0:
+        chunk = fileobj.read(min(chunk_size, length))
+        if not chunk:
+            return
+        md5.update(chunk)
+        length -= len(chunk)
+        yield chunk
+
+
+def _is_large_object(ob):
+    return bool(ob.is_static_large_object or ob.object_manifest)
+
+
+def _is_retryable(error):
+    if isinstance(error, IncompleteTransfer):
+        return True
+    if isinstance(error, requests.exceptions.RequestException):
+        # The connection broke while the data was read or sent.
+        return True
+    if isinstance(error, exceptions.HttpException):
+        status = error.http_status
+        return status is None or status == 429 or status >= 500
+    if isinstance(error, exceptions.SDKException):
+        return isinstance(error.cause, _exceptions.ConnectionError)
+    return False
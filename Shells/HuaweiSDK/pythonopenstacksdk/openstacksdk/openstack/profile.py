@@ -39,6 +39,7 @@ normally be something like 'compute', 'identity', 'object-store', etc.::
     prof.set_region(prof.ALL, 'zion')
     prof.set_version('identity', 'v3')
     prof.set_interface('object-store', 'internal')
+    prof.set_rate_limit('compute', rate=10, max_concurrency=4)
     for service in prof.get_services():
         print(prof.get_filter(service.service_type)
 
@@ -61,6 +62,7 @@ import six
 
 from openstack import exceptions
 from openstack import module_loader
+from openstack import rate_limit as _rate_limit
 from openstack.anti_ddos import anti_ddos_service
 from openstack.auto_scaling import auto_scaling_service
 from openstack.block_store import block_store_service
@@ -253,3 +255,37 @@ class Profile(object):
         :param str interface: Desired service interface.
         """
         self._setter(service, "interface", interface)
+
+    def set_rate_limit(self, service, rate=None, burst=None,
+                       max_concurrency=None, adaptive=False):
+        """Limit the requests made to the specified service.
+
+        Every service gets its own limit, including when all of them are
+        set at once with :attr:`ALL`. Limits are shared by the sessions
+        created with the profile after they are set, and by their threads.
+
+        :param str service: Service type.
+        :param float rate: Number of requests allowed per second.
+        :param int burst: Number of requests allowed at once after a pause.
+        :param int max_concurrency: Number of requests in flight at once.
+        :param bool adaptive: Whether to lower the rate after the service
+                              throttled a request.
+
+        When neither ``rate`` nor ``max_concurrency`` is given, the limit
+        of the service is removed.
+        """
+        for service in self._get_services(service):
+            limit = None
+            if rate is not None or max_concurrency is not None:
+                limit = _rate_limit.RateLimit(
+                    rate=rate, burst=burst, max_concurrency=max_concurrency,
+                    adaptive=adaptive)
+            self._get_filter(service).rate_limit = limit
+
+    def get_rate_limit(self, service):
+        """Get the rate limit of the specified service.
+
+        :param str service: Service type.
+        :returns: A :class:`~openstack.rate_limit.RateLimit`, or ``None``.
+        """
+        return self._get_filter(service).rate_limit
@@ -14,6 +14,9 @@ from openstack import exceptions
 from openstack import resource2
 from openstack import utils
 
+#: The default number of requests made at once by bulk operations.
+DEFAULT_BULK_WORKERS = 8
+
 
 # The _check_resource decorator is used on BaseProxy methods to ensure that
 # the `actual` argument is in fact the type of the `expected` argument.
@@ -40,9 +43,96 @@ def _check_resource(strict=False):
     return wrap
 
 
+class BulkResult(object):
+
+    def __init__(self, value, resource=None, error=None):
+        """The outcome of one item of a bulk operation
+
+        :param value: The item given to the operation: the attributes of a
+                      resource to create, or the resource to delete.
+        :param resource: The resource created or deleted, when the item
+                         succeeded.
+        :param error: The exception raised for the item, when it failed.
+                      This is usually an
+                      :class:`~openstack.exceptions.SDKException`.
+        """
+        self.value = value
+        self.resource = resource
+        self.error = error
+
+    @property
+    def succeeded(self):
+        """Whether the operation succeeded for this item"""
+        return self.error is None
+
+    def __repr__(self):
+        if self.succeeded:
+            return "BulkResult(resource=%r)" % (self.resource,)
+        return "BulkResult(value=%r, error=%r)" % (self.value, self.error)
+
+
+def _run_bulk(operation, items, max_workers):
+    """Call operation for each of items on a pool of threads
+
+    :returns: A list of :class:`BulkResult`, in the order of items.
+    """
+    def run(item):
+        # Any error fails only its item, so that the results of the other
+        # items, which may have been created already, are not lost.
+        try:
+            return BulkResult(item, resource=operation(item))
+        except Exception as e:
+            return BulkResult(item, error=e)
+
+    return list(resource2.fetch_pages(run, items, max_workers))
+
+
+def _run_bulk_requests(operation, items, size, max_workers):
+    """Call operation for chunks of up to size items on a pool of threads
+
+    operation returns the list of resources of its chunk, and a failed
+    chunk fails all its items.
+
+    :returns: A list of :class:`BulkResult`, in the order of items.
+    """
+    if not size:
+        size = max(len(items), 1)
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    results = []
+    for chunk in _run_bulk(operation, chunks, max_workers):
+        if chunk.succeeded:
+            results.extend(BulkResult(item, resource=res)
+                           for item, res in zip(chunk.value, chunk.resource))
+        else:
+            results.extend(BulkResult(item, error=chunk.error)
+                           for item in chunk.value)
+    return results
+
+
 class BaseProxy(object):
-    def __init__(self, session):
+    def __init__(self, session, resource_cache=None):
         self._session = session
+        self._resource_cache = resource_cache
+
+    def _cached(self, resource_type, key, fetch):
+        """Read a resource through the resource cache
+
+        :param resource_type: The type of resource to get.
+        :param key: A hashable identifier of the lookup within
+                    ``resource_type``.
+        :param fetch: A function requesting the resource, which is only
+                      called when the cache holds nothing for ``key``.
+
+        :returns: The result of ``fetch``, or a copy of the cached one.
+        """
+        if self._resource_cache is None:
+            return fetch()
+        return self._resource_cache.fetch(resource_type, key, fetch)
+
+    def _invalidate_cache(self, resource_type):
+        """Drop the cached resources of a type after one changed"""
+        if self._resource_cache is not None:
+            self._resource_cache.invalidate(resource_type)
 
     def _get_resource(self, resource_type, value, **attrs):
         """Get a resource object to work on
@@ -101,9 +191,13 @@ class BaseProxy(object):
 
         :returns: An instance of ``resource_type`` or None
         """
-        return resource_type.find(self._session, name_or_id,
-                                  ignore_missing=ignore_missing,
-                                  **attrs)
+        def find():
+            return resource_type.find(self._session, name_or_id,
+                                      ignore_missing=ignore_missing,
+                                      **attrs)
+
+        key = ("find", name_or_id, tuple(sorted(attrs.items())))
+        return self._cached(resource_type, key, find)
 
     @_check_resource(strict=False)
     def _delete(self, resource_type, value, ignore_missing=True,
@@ -151,6 +245,8 @@ class BaseProxy(object):
                     details=e.details, response=e.response,
                     request_id=e.request_id, url=e.url, method=e.method,
                     http_status=e.http_status, cause=e.cause)
+        finally:
+            self._invalidate_cache(resource_type)
 
         return rv
 
@@ -175,8 +271,11 @@ class BaseProxy(object):
         :rtype: :class:`~openstack.resource2.Resource`
         """
         res = self._get_resource(resource_type, value, **attrs)
-        return res.update(self._session, prepend_key=prepend_key,
-                          has_body=has_body)
+        try:
+            return res.update(self._session, prepend_key=prepend_key,
+                              has_body=has_body)
+        finally:
+            self._invalidate_cache(resource_type)
 
     def _create(self, resource_type, prepend_key=True, **attrs):
         """Create a resource from attributes
@@ -197,7 +296,104 @@ class BaseProxy(object):
         :rtype: :class:`~openstack.resource2.Resource`
         """
         res = resource_type.new(**attrs)
-        return res.create(self._session, prepend_key=prepend_key)
+        try:
+            return res.create(self._session, prepend_key=prepend_key)
+        finally:
+            self._invalidate_cache(resource_type)
+
+    def _bulk_create(self, resource_type, data, prepend_key=True,
+                     max_workers=DEFAULT_BULK_WORKERS, bulk_size=None):
+        """Create many resources
+
+        Resource types which set ``allow_bulk_create`` are created with
+        :meth:`~openstack.resource2.Resource.bulk_create` requests of up to
+        ``bulk_size`` resources. Other types are created one request each.
+        Up to ``max_workers`` requests are made at once.
+
+        :param resource_type: The type of resource to create.
+        :type resource_type: :class:`~openstack.resource2.Resource`
+        :param list data: The attributes of each resource to create, as
+                          passed to :meth:`_create`.
+        :param prepend_key: A boolean indicating whether the resource_key
+                            should be prepended in a resource creation
+                            request. Default to True.
+        :param int max_workers: The maximum number of concurrent requests.
+        :param int bulk_size: The maximum number of resources per bulk
+                              request, overriding the ``bulk_size`` of
+                              ``resource_type``.
+
+        :returns: A list of :class:`BulkResult`, one per item of ``data``
+                  and in the same order. A failure does not stop the other
+                  items from being created.
+        """
+        data = list(data)
+        if resource_type.allow_bulk_create:
+            def create(chunk):
+                try:
+                    return resource_type.bulk_create(self._session, chunk,
+                                                     prepend_key=prepend_key)
+                finally:
+                    self._invalidate_cache(resource_type)
+            return _run_bulk_requests(create, data,
+                                      bulk_size or resource_type.bulk_size,
+                                      max_workers)
+
+        def create_one(attrs):
+            return self._create(resource_type, prepend_key=prepend_key,
+                                **attrs)
+        return _run_bulk(create_one, data, max_workers)
+
+    def _bulk_delete(self, resource_type, values, ignore_missing=True,
+                     max_workers=DEFAULT_BULK_WORKERS, **attrs):
+        """Delete many resources
+
+        Resource types which set ``allow_bulk_delete`` are deleted with
+        :meth:`~openstack.resource2.Resource.bulk_delete` requests of up to
+        ``bulk_size`` resources. Other types are deleted one request each.
+        Up to ``max_workers`` requests are made at once.
+
+        :param resource_type: The type of resource to delete.
+        :type resource_type: :class:`~openstack.resource2.Resource`
+        :param list values: The values to delete. Each can be either the ID
+                            of a resource or a
+                            :class:`~openstack.resource2.Resource` subclass.
+        :param bool ignore_missing: When set to ``False``, the result of a
+                    resource which does not exist holds a
+                    :class:`~openstack.exceptions.ResourceNotFound`.
+        :param int max_workers: The maximum number of concurrent requests.
+        :param dict attrs: Attributes to be passed onto the
+                           :meth:`~openstack.resource2.Resource.delete`
+                           method, such as the ID of a parent resource.
+
+        :returns: A list of :class:`BulkResult`, one per item of ``values``
+                  and in the same order. A failure does not stop the other
+                  items from being deleted.
+        :raises: ``ValueError`` if a value is a
+                 :class:`~openstack.resource2.Resource` that doesn't match
+                 the ``resource_type``.
+        """
+        resources = []
+        for value in values:
+            if (isinstance(value, resource2.Resource) and
+                    not isinstance(value, resource_type)):
+                raise ValueError("Expected %s but received %s" % (
+                    resource_type.__name__, value.__class__.__name__))
+            resources.append(self._get_resource(resource_type, value,
+                                                **attrs))
+
+        if resource_type.allow_bulk_delete:
+            def delete(chunk):
+                try:
+                    return resource_type.bulk_delete(self._session, chunk)
+                finally:
+                    self._invalidate_cache(resource_type)
+            return _run_bulk_requests(delete, resources,
+                                      resource_type.bulk_size, max_workers)
+
+        def delete_one(res):
+            self._delete(resource_type, res, ignore_missing=ignore_missing)
+            return res
+        return _run_bulk(delete_one, resources, max_workers)
 
     @_check_resource(strict=False)
     def _get(self, resource_type, value=None, requires_id=True, **attrs):
@@ -217,20 +413,33 @@ class BaseProxy(object):
 
         :returns: The result of the ``get``
         :rtype: :class:`~openstack.resource2.Resource`
+
+        Resources given by ID are read through the resource cache, if the
+        proxy has one. Resource instances are always requested, as they are
+        refreshed in place.
         """
         res = self._get_resource(resource_type, value, **attrs)
 
-        try:
-            return res.get(self._session, requires_id=requires_id)
-        except exceptions.NotFoundException as e:
-            raise exceptions.ResourceNotFound(
-                message="No %s found for %s" %
-                        (resource_type.__name__, value),
-                details=e.details, response=e.response,
-                request_id=e.request_id, url=e.url, method=e.method,
-                http_status=e.http_status, cause=e.cause)
-
-    def _list(self, resource_type, value=None, paginated=False, **attrs):
+        def get():
+            try:
+                return res.get(self._session, requires_id=requires_id)
+            except exceptions.NotFoundException as e:
+                raise exceptions.ResourceNotFound(
+                    message="No %s found for %s" %
+                            (resource_type.__name__, value),
+                    details=e.details, response=e.response,
+                    request_id=e.request_id, url=e.url, method=e.method,
+                    http_status=e.http_status, cause=e.cause)
+
+        if (self._resource_cache is None or
+                isinstance(value, resource2.Resource)):
+            return get()
+        key = ("get", res.id, requires_id,
+               tuple(sorted(res._uri.attributes.items())))
+        return self._cached(resource_type, key, get)
+
+    def _list(self, resource_type, value=None, paginated=False, parallel=0,
+              stream=False, **attrs):
         """List a resource
 
         :param resource_type: The type of resource to delete. This should
@@ -243,6 +452,14 @@ class BaseProxy(object):
                                to be returned in one response. When set to
                                ``True``, the resource supports data being
                                returned across multiple pages.
+        :param int parallel: When greater than one and ``paginated`` is
+                             ``True``, request up to this many pages at once
+                             for services which page by offset or page
+                             number, such as CDN and auto scaling. Results
+                             are still returned in order.
+        :param bool stream: When ``True``, decode each response while it is
+                            received, for services returning huge lists in
+                            one response, such as CTS traces.
         :param dict attrs: Attributes to be passed onto the
             :meth:`~openstack.resource2.Resource.list` method. These should
             correspond to either :class:`~openstack.resource2.URI` values
@@ -254,6 +471,10 @@ class BaseProxy(object):
                  the ``resource_type``.
         """
         res = self._get_resource(resource_type, value, **attrs)
+        if parallel:
+            attrs["parallel"] = parallel
+        if stream:
+            attrs["stream"] = stream
         return res.list(self._session, paginated=paginated, **attrs)
 
     def _head(self, resource_type, value=None, **attrs):
@@ -282,7 +503,7 @@ class BaseProxy(object):
                                "this as needed. See resource2.wait_for_status "
                                "for this behavior"))
     def wait_for_status(self, value, status, failures=[], interval=2,
-                        wait=120):
+                        wait=120, policy=None):
         """Wait for a resource to be in a particular status.
 
         :param value: The resource to wait on to reach the status. The
@@ -293,6 +514,9 @@ class BaseProxy(object):
                               failed such as 'ERROR'.
         :param interval: Number of seconds to wait between checks.
         :param wait: Maximum number of seconds to wait for the change.
+        :param policy: The schedule of the checks. Defaults to a
+                       :class:`~openstack.resource2.PollingPolicy` starting
+                       at ``interval``.
 
         :return: Method returns resource on success.
         :raises: :class:`~openstack.exceptions.ResourceTimeout` transition
@@ -303,23 +527,60 @@ class BaseProxy(object):
                  status attribute
         """
         return resource2.wait_for_status(self._session, value, status,
-                                         failures, interval, wait)
+                                         failures, interval, wait,
+                                         policy=policy)
 
     @utils.deprecated(deprecated_in="0.9.14", removed_in="1.0",
                       details=("This is no longer a part of the proxy base, "
                                "service-specific subclasses should expose "
                                "this as needed. See resource2.wait_for_delete "
                                "for this behavior"))
-    def wait_for_delete(self, value, interval=2, wait=120):
+    def wait_for_delete(self, value, interval=2, wait=120, policy=None):
         """Wait for the resource to be deleted.
 
         :param value: The resource to wait on to be deleted.
         :type value: :class:`~openstack.resource2.Resource`
         :param interval: Number of seconds to wait between checks.
         :param wait: Maximum number of seconds to wait for the delete.
+        :param policy: The schedule of the checks. Defaults to a
+                       :class:`~openstack.resource2.PollingPolicy` starting
+                       at ``interval``.
 
         :return: Method returns resource on success.
         :raises: :class:`~openstack.exceptions.ResourceTimeout` transition
                  to delete failed to occur in wait seconds.
         """
-        return resource2.wait_for_delete(self._session, value, interval, wait)
+        return resource2.wait_for_delete(self._session, value, interval, wait,
+                                         policy=policy)
+
+    def wait_for_statuses(self, values, status, failures=None, interval=2,
+                          wait=120,
+                          max_workers=resource2.DEFAULT_WAIT_WORKERS,
+                          policy=None):
+        """Wait for many resources to be in a particular status.
+
+        See :func:`~openstack.resource2.wait_for_statuses` for how the
+        resources are polled.
+
+        :param values: The resources to wait on to reach the status. The
+                       resources must have a status attribute.
+        :type values: list of :class:`~openstack.resource2.Resource`
+        :param status: Desired status of the resources.
+        :param list failures: Statuses that would indicate the transition
+                              failed such as 'ERROR'.
+        :param interval: Number of seconds to wait between the first checks.
+        :param wait: Maximum number of seconds to wait for the change.
+        :param int max_workers: The maximum number of concurrent requests.
+        :param policy: The schedule of the checks. Defaults to a
+                       :class:`~openstack.resource2.PollingPolicy` starting
+                       at ``interval``.
+
+        :return: A generator of the resources, each yielded as soon as it
+                 is in ``status`` or one of ``failures``.
+        :raises: :class:`~openstack.exceptions.ResourceTimeout` when some of
+                 the resources have not settled in wait seconds.
+        """
+        return resource2.wait_for_statuses(
+            self._session, values, status, failures=failures,
+            interval=interval, wait=wait, max_workers=max_workers,
+            policy=policy)
@@ -0,0 +1,147 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Client side limits of the requests made to a service.
+
+Services limit the number of API calls a project makes per second, and
+answer the calls beyond it with ``429 Too Many Requests``. A
+:class:`RateLimit` keeps the threads of a program sharing a profile within
+such a limit: requests take a token from a bucket refilled at ``rate``
+tokens per second, and wait for one when it is empty. It can also bound the
+number of requests in flight at once.
+
+Rate limits are set per service type with
+:meth:`~openstack.profile.Profile.set_rate_limit`, and enforced by
+:class:`~openstack.session.Session` for every attempt of a request,
+retries included.
+
+Examples
+--------
+
+Make at most 10 ECS requests per second, 4 at a time, and slow down when
+the service still throttles them::
+
+    from openstack import connection
+    from openstack import profile
+
+    prof = profile.Profile()
+    prof.set_rate_limit("ecs", rate=10, max_concurrency=4, adaptive=True)
+    conn = connection.Connection(profile=prof, **auth_args)
+    ...
+    print(prof.get_rate_limit("ecs").wait_time)
+"""
+import threading
+import time
+
+
+class RateLimit(object):
+
+    def __init__(self, rate=None, burst=None, max_concurrency=None,
+                 adaptive=False, min_rate=None, decrease=0.5, increase=0.05):
+        """Limit the rate and concurrency of requests
+
+        :param float rate: The number of requests allowed per second.
+                           When ``None``, the rate is not limited.
+        :param int burst: The number of requests which can be made at once
+                          after a pause. Defaults to one second of requests.
+        :param int max_concurrency: The number of requests in flight at
+                                    once. When ``None``, it is not limited.
+        :param bool adaptive: Whether to lower the rate when the service
+                              answers ``429 Too Many Requests``, and raise
+                              it back towards ``rate`` as requests succeed.
+        :param float min_rate: The lowest rate an adaptive limit falls to.
+                               Defaults to a tenth of ``rate``.
+        :param float decrease: The factor the rate is multiplied by after
+                               each throttled request.
+        :param float increase: The fraction of ``rate`` added back after
+                               each successful request.
+        """
+        self.max_rate = rate
+        #: The current number of requests allowed per second.
+        self.rate = rate
+        self.burst = burst or (max(1, rate) if rate else None)
+        self.max_concurrency = max_concurrency
+        self.adaptive = adaptive and rate is not None
+        self.min_rate = min_rate or (rate / 10.0 if rate else None)
+        self.decrease = decrease
+        self.increase = increase
+        #: The number of requests which had to wait.
+        self.waits = 0
+        #: The number of seconds requests waited in total.
+        self.wait_time = 0.0
+        #: The number of requests in flight.
+        self.in_flight = 0
+        self._tokens = self.burst
+        self._updated = time.time()
+        self._lock = threading.Lock()
+        self._slots = None
+        if max_concurrency:
+            self._slots = threading.Semaphore(max_concurrency)
+
+    def acquire(self):
+        """Wait until a request can be made
+
+        :returns: The number of seconds waited.
+        """
+        started = time.time()
+        blocked = False
+        if self._slots is not None and not self._slots.acquire(False):
+            blocked = True
+            self._slots.acquire()
+        with self._lock:
+            self.in_flight += 1
+            delay = self._take()
+        if delay > 0:
+            time.sleep(delay)
+        elif not blocked:
+            return 0.0
+        waited = time.time() - started
+        with self._lock:
+            self.waits += 1
+            self.wait_time += waited
+        return waited
+
+    def _take(self):
+        """Take a token, returning how long to wait for it
+
+        Tokens are taken even when the bucket is empty, so that waiting
+        requests are let through in turn, each a token apart.
+        """
+        if self.rate is None:
+            return 0.0
+        now = time.time()
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+    def release(self, status_code=None):
+        """Mark the end of a request
+
+        :param int status_code: The HTTP status of the response, or
+                                ``None`` when none was received.
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if self.adaptive and status_code is not None:
+                if status_code == 429:
+                    self.rate = max(self.min_rate,
+                                    self.rate * self.decrease)
+                elif status_code < 400:
+                    self.rate = min(self.max_rate,
+                                    self.rate + self.max_rate * self.increase)
+        if self._slots is not None:
+            self._slots.release()
@@ -35,14 +35,44 @@ and then returned to the caller.
 """
 
 import collections
+import copy
 import itertools
+import random
+import sys
+import threading
 import time
+import weakref
+
+import six
+from six.moves import queue
 
 from openstack import exceptions
 from openstack import format
+from openstack import json_stream
 from openstack import utils
 
 
+_END_OF_PAGES = object()
+
+#: The default number of resources whose status is fetched at once by
+#: :func:`wait_for_statuses`.
+DEFAULT_WAIT_WORKERS = 8
+
+#: The default maximum number of seconds between two checks of a waiter.
+DEFAULT_MAX_INTERVAL = 30
+
+#: :func:`wait_for_statuses` gets resources one by one rather than listing
+#: them once there are more than this many times as many resources in their
+#: previous listing as there are left to wait for.
+STATUS_LIST_RATIO = 10
+
+try:
+    _monotonic = time.monotonic
+except AttributeError:
+    # Python 2 has no monotonic clock in the standard library.
+    _monotonic = time.time
+
+
 class _BaseComponent(object):
     # The name this component is being tracked as in the Resource
     key = None
@@ -132,6 +162,28 @@ class URI(_BaseComponent):
     key = "_uri"
 
 
+class _Id(Body):
+    """The ``id`` Body attribute of a Resource
+
+    The ID of a resource may be stored under ``id``, under the server-side
+    name a subclass gives to ``id``, or under an ``alternate_id``. The keys
+    to look at are resolved once per class, see
+    :attr:`_ComponentRegistry.id_keys`. Subclasses which redefine ``id`` as
+    a plain :class:`Body` have it replaced with an ``_Id`` by their
+    :class:`_ComponentRegistry`.
+    """
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return None
+
+        body = instance._body
+        for key in type(instance)._component_registry().id_keys:
+            if key in body:
+                return body[key]
+        return None
+
+
 class _ComponentManager(collections.MutableMapping):
     """Storage of a component type"""
 
@@ -142,6 +194,9 @@ class _ComponentManager(collections.MutableMapping):
     def __getitem__(self, key):
         return self.attributes[key]
 
+    def __contains__(self, key):
+        return key in self.attributes
+
     def __setitem__(self, key, value):
         try:
             orig = self.attributes[key]
@@ -181,6 +236,187 @@ class _ComponentManager(collections.MutableMapping):
         self._dirty = set()
 
 
+class _CompactComponentManager(collections.MutableMapping):
+    """Read-only storage of a component type of an existing resource
+
+    Values are kept in a tuple indexed through a key table that is shared
+    by every resource of the same class with the same keys, which makes
+    this much smaller than a :class:`_ComponentManager`. Reading works
+    the same as with a synchronized :class:`_ComponentManager`; anything
+    that modifies the component, or asks for its ``attributes`` dict,
+    first promotes the owning resource to regular component managers
+    through :meth:`Resource._promote`.
+
+    The owning resource is only weakly referenced, so that compact
+    resources are freed as soon as they are no longer used rather than by
+    the cyclic garbage collector.
+    """
+
+    __slots__ = ("_resource", "_keys", "_values")
+
+    def __init__(self, resource, keys, values):
+        #: A weak reference to the owning resource.
+        self._resource = resource
+        self._keys = keys
+        self._values = values
+
+    def __deepcopy__(self, memo):
+        # The copy belongs to the copy of the owning resource, which
+        # deepcopy creates before copying its components.
+        ref = self._resource
+        resource = memo.get(id(ref()))
+        if resource is not None:
+            ref = weakref.ref(resource)
+        return _CompactComponentManager(
+            ref, self._keys, copy.deepcopy(self._values, memo))
+
+    def __getitem__(self, key):
+        return self._values[self._keys[key]]
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _promoted(self):
+        """Promote the owning resource, returning the manager replacing us"""
+        resource = self._resource()
+        for key in ("_body", "_header", "_uri"):
+            if resource is not None and getattr(resource, key) is self:
+                resource._promote()
+                return getattr(resource, key)
+        raise RuntimeError("Component is no longer attached to a resource")
+
+    def __setitem__(self, key, value):
+        self._promoted()[key] = value
+
+    def __delitem__(self, key):
+        del self._promoted()[key]
+
+    @property
+    def attributes(self):
+        return self._promoted().attributes
+
+    @property
+    def _dirty(self):
+        return self._promoted()._dirty
+
+    @property
+    def dirty(self):
+        """Return a dict of modified attributes, which is always empty"""
+        return {}
+
+    def clean(self):
+        """Signal that the resource no longer has modified attributes"""
+
+
+class _ComponentTable(object):
+    """Lookup tables for one component type of one Resource class"""
+
+    def __init__(self, resource_class, component_type):
+        #: Attribute name to component, the first one found in the MRO.
+        self.members = {}
+        #: Attribute name to the name the server knows it as.
+        self.mapping = {}
+        #: Client-side and server-side names to their component.
+        self.fields = {}
+
+        for klass in resource_class.__mro__:
+            for key, component in klass.__dict__.items():
+                if not isinstance(component, component_type):
+                    continue
+                # Make sure base classes don't end up overwriting
+                # mappings we've found previously in subclasses.
+                if key not in self.members:
+                    self.members[key] = component
+                    self.mapping[key] = component.name
+                if key not in self.fields:
+                    self.fields[key] = component
+                    self.fields[component.name] = component
+
+
+class _ComponentRegistry(object):
+    """Per-class cache of the components declared on a Resource
+
+    The components of a Resource class never change once the class has
+    been defined, so walking the MRO to find them is done once per class
+    and component type, and every instance then only does dict lookups.
+    """
+
+    #: Upper bound on the number of shared key tables kept per class.
+    max_key_tables = 256
+
+    def __init__(self, resource_class):
+        self._resource_class = resource_class
+        self._tables = {}
+        self._alternate_id = None
+        self._id_keys = None
+        self._key_tables = {}
+        self._adopt_id()
+
+    def _adopt_id(self):
+        """Give the ``id`` Body of the class the lookup of :class:`_Id`"""
+        for klass in self._resource_class.__mro__:
+            component = klass.__dict__.get("id")
+            if component is None:
+                continue
+            if isinstance(component, Body) and not isinstance(component,
+                                                              _Id):
+                setattr(klass, "id", _Id(component.name,
+                                         type=component.type,
+                                         default=component.default,
+                                         alternate_id=component.alternate_id))
+            break
+
+    def table(self, component_type):
+        try:
+            return self._tables[component_type]
+        except KeyError:
+            table = _ComponentTable(self._resource_class, component_type)
+            self._tables[component_type] = table
+            return table
+
+    @property
+    def alternate_id(self):
+        if self._alternate_id is None:
+            alternate_id = ""
+            # NOTE: Only the class itself is considered, not its bases.
+            for value in self._resource_class.__dict__.values():
+                if isinstance(value, Body) and value.alternate_id:
+                    alternate_id = value.name
+                    break
+            self._alternate_id = alternate_id
+        return self._alternate_id
+
+    @property
+    def id_keys(self):
+        """The body keys that may hold the ID, in order of preference"""
+        if self._id_keys is None:
+            keys = ["id"]
+            for key in (self.table(Body).mapping["id"], self.alternate_id):
+                if key and key not in keys:
+                    keys.append(key)
+            self._id_keys = tuple(keys)
+        return self._id_keys
+
+    def key_table(self, keys):
+        """Return a shared key to index table for a tuple of keys"""
+        try:
+            return self._key_tables[keys]
+        except KeyError:
+            table = {key: index for index, key in enumerate(keys)}
+            # Resources of one class nearly always come back from the
+            # server with the same keys, so only a handful of tables are
+            # expected. Stop sharing rather than grow without bound.
+            if len(self._key_tables) < self.max_key_tables:
+                self._key_tables[keys] = table
+            return table
+
+
 class _Request(object):
     """Prepared components that go into a KSA request"""
 
@@ -223,6 +459,10 @@ class QueryParameters(object):
                 result[value] = query[value]
         return result
 
+    def _accepts(self, name):
+        """Whether name is a client-side or server-side parameter name"""
+        return name in self._mapping or name in self._mapping.values()
+
 
 class Resource(object):
     #: Singular form of key for resource.
@@ -234,9 +474,12 @@ class Resource(object):
     #: marker key in query, default is `marker`
     query_marker_key = "marker"
     query_limit_key = "limit"
+    #: query key :meth:`find` filters listings by name with, when it is
+    #: accepted by `_query_mapping`, default is `name`
+    query_name_key = "name"
 
     #: The ID of this resource.
-    id = Body("id")
+    id = _Id("id")
     #: The name of this resource.
     name = Body("name")
     #: The location of this resource.
@@ -267,13 +510,41 @@ class Resource(object):
     patch_update = False
     #: Use PUT for create operations on this resource.
     put_create = False
-
-    def __init__(self, _synchronized=False, **attrs):
+    #: Make :meth:`get` conditional on the ``ETag`` of its previous
+    #: response, so that an unchanged resource is not sent again.
+    conditional_get = True
+    #: Also make :meth:`get` conditional on the ``Last-Modified`` of its
+    #: previous response when it had no ``ETag``. HTTP dates are only
+    #: precise to the second, so a change made in the same second as the
+    #: previous response goes unnoticed, which is why it is off by default.
+    conditional_last_modified = False
+    #: Allow the status of many resources to be polled with one listing.
+    #: See :func:`~openstack.resource2.wait_for_statuses`.
+    allow_status_list = False
+    #: Allow many resources to be created with one request.
+    #: See :meth:`~openstack.resource2.Resource.bulk_create`.
+    allow_bulk_create = False
+    #: Allow many resources to be deleted with one request.
+    #: See :meth:`~openstack.resource2.Resource.bulk_delete`.
+    allow_bulk_delete = False
+    #: The maximum number of resources per bulk request, or ``None`` when
+    #: there is no limit.
+    bulk_size = None
+    #: The number of seconds a :class:`~openstack.resource_cache.ResourceCache`
+    #: keeps this resource by default, or ``None`` when it is not cached.
+    cache_ttl = None
+
+    # The URI, ETag and Last-Modified of the response of the last get.
+    _validators = None
+
+    def __init__(self, _synchronized=False, _compact=False, **attrs):
         """The base resource
 
         :param bool _synchronized: This is not intended to be used directly.
                     See :meth:`~openstack.resource2.Resource.new` and
                     :meth:`~openstack.resource2.Resource.existing`.
+        :param bool _compact: This is not intended to be used directly.
+                    See :meth:`~openstack.resource2.Resource.existing`.
         """
 
         # NOTE: _collect_attrs modifies **attrs in place, removing
@@ -284,6 +555,13 @@ class Resource(object):
         # they're not being set anywhere. Log this? Raise exception?
         # How strict should we be here? Should strict be an option?
 
+        if _compact:
+            ref = weakref.ref(self)
+            self._body = self._compact_component(ref, body)
+            self._header = self._compact_component(ref, header)
+            self._uri = self._compact_component(ref, uri)
+            return
+
         self._body = _ComponentManager(attributes=body,
                                        synchronized=_synchronized)
         self._header = _ComponentManager(attributes=header,
@@ -291,11 +569,35 @@ class Resource(object):
         self._uri = _ComponentManager(attributes=uri,
                                       synchronized=_synchronized)
 
+    def _compact_component(self, ref, attributes):
+        """Return read-only storage of attributes for a compact resource
+
+        :param ref: A weak reference to this resource.
+        """
+        keys = tuple(attributes)
+        table = self._component_registry().key_table(keys)
+        values = tuple(attributes[key] for key in keys)
+        return _CompactComponentManager(ref, table, values)
+
+    def _promote(self):
+        """Replace compact component storage with regular managers
+
+        This happens the first time a compact resource, as created by
+        ``existing(_compact=True)``, is modified in any way.
+        """
+        for key in ("_body", "_header", "_uri"):
+            component = getattr(self, key)
+            if isinstance(component, _CompactComponentManager):
+                setattr(self, key, _ComponentManager(
+                    attributes=dict(component), synchronized=True))
+
     def __repr__(self):
+        # Components are read as mappings rather than through their
+        # attributes, which would promote compact resources.
         pairs = ["%s=%s" % (k, v) for k, v in dict(itertools.chain(
-            self._body.attributes.items(),
-            self._header.attributes.items(),
-            self._uri.attributes.items())).items()]
+            self._body.items(),
+            self._header.items(),
+            self._uri.items())).items()]
         args = ", ".join(pairs)
 
         return "%s.%s(%s)" % (
@@ -303,31 +605,9 @@ class Resource(object):
 
     def __eq__(self, comparand):
         """Return True if another resource has the same contents"""
-        return all([self._body.attributes == comparand._body.attributes,
-                    self._header.attributes == comparand._header.attributes,
-                    self._uri.attributes == comparand._uri.attributes])
-
-    def __getattribute__(self, name):
-        """Return an attribute on this instance
-
-        This is mostly a pass-through except for a specialization on
-        the 'id' name, as this can exist under a different name via the
-        `alternate_id` argument to resource.Body.
-        """
-        if name == "id":
-            if name in self._body:
-                return self._body[name]
-
-            real_id_name = self._body_mapping()[name]
-            if real_id_name in self._body:
-                return self._body[real_id_name]
-            else:
-                try:
-                    return self._body[self._alternate_id()]
-                except KeyError:
-                    return None
-        else:
-            return object.__getattribute__(self, name)
+        return all([dict(self._body) == dict(comparand._body),
+                    dict(self._header) == dict(comparand._header),
+                    dict(self._uri) == dict(comparand._uri)])
 
     def _update(self, **attrs):
         """Given attributes, update them on this instance
@@ -355,6 +635,19 @@ class Resource(object):
 
         return body, header, uri
 
+    @classmethod
+    def _component_registry(cls):
+        """Return the cached components of this class
+
+        The registry is stored on the class itself, so each subclass
+        builds its own the first time one of its instances needs it.
+        """
+        registry = cls.__dict__.get("_registry")
+        if registry is None:
+            registry = _ComponentRegistry(cls)
+            cls._registry = registry
+        return registry
+
     @classmethod
     def _consume_attrs(cls, component_type, attrs):
         """Given a mapping and attributes, return relevant matches
@@ -367,15 +660,7 @@ class Resource(object):
         same source dict several times.
         """
 
-        fields = {}
-        for klass in cls.__mro__:
-            for key, component in klass.__dict__.items():
-                if isinstance(component, component_type):
-                    # Make sure base classes don't end up overwriting
-                    # mappings we've found previously in subclasses.
-                    if key not in fields:
-                        fields[key] = component
-                        fields[component.name] = component
+        fields = cls._component_registry().table(component_type).fields
 
         relevant_attrs = {}
         attr_keys = list(attrs.keys())
@@ -428,17 +713,7 @@ class Resource(object):
         """Return a dict of attributes of a given component on the class
 
         """
-        mapping = {}
-        # Since we're looking at class definitions we need to include
-        # subclasses, so check the whole MRO.
-        for klass in cls.__mro__:
-            for key, value in klass.__dict__.items():
-                if isinstance(value, component):
-                    # Make sure base classes don't end up overwriting
-                    # mappings we've found previously in subclasses.
-                    if key not in mapping:
-                        mapping[key] = value.name
-        return mapping
+        return dict(cls._component_registry().table(component).mapping)
 
     @classmethod
     def _body_mapping(cls):
@@ -465,11 +740,7 @@ class Resource(object):
         Returns an empty string if no name exists, as this method is
         consumed by _get_id and passed to getattr.
         """
-        for value in cls.__dict__.values():
-            if isinstance(value, Body):
-                if value.alternate_id:
-                    return value.name
-        return ""
+        return cls._component_registry().alternate_id
 
     @staticmethod
     def _get_id(value):
@@ -511,6 +782,11 @@ class Resource(object):
         :meth:`update` call would not generate a body of attributes to be
         modified on the server.
 
+        Passing ``_compact=True`` stores the attributes in a compact
+        read-only form, which uses much less memory when holding many
+        resources. The instance is promoted to regular storage the first
+        time it is modified.
+
         :param dict kwargs: Each of the named arguments will be set as
                             attributes on the resulting Resource object.
         """
@@ -530,36 +806,23 @@ class Resource(object):
         :return: A dictionary of key/value pairs where keys are named
                  as they exist as attributes of this class.
         """
-        mapping = {}
-
-        components = []
-        if body:
-            components.append(Body)
-        if headers:
-            components.append(Header)
-        if not components:
+        if not (body or headers):
             raise ValueError(
                 "At least one of `body` or `headers` must be True")
 
-        # isinstance stricly requires this to be a tuple
-        components = tuple(components)
-
-        # NOTE: This is similar to the implementation in _get_mapping
-        # but is slightly different in that we're looking at an instance
-        # and we're mapping names on this class to their actual stored
-        # values.
-        # Since we're looking at class definitions we need to include
-        # subclasses, so check the whole MRO.
-        for klass in self.__class__.__mro__:
-            for key, value in klass.__dict__.items():
-                if isinstance(value, components):
-                    # Make sure base classes don't end up overwriting
-                    # mappings we've found previously in subclasses.
-                    if key not in mapping:
-                        value = getattr(self, key, None)
-                        if ignore_none and value is None:
-                            continue
-                        mapping[key] = value
+        registry = self._component_registry()
+        members = {}
+        if headers:
+            members.update(registry.table(Header).members)
+        if body:
+            members.update(registry.table(Body).members)
+
+        mapping = {}
+        for key in members:
+            value = getattr(self, key, None)
+            if ignore_none and value is None:
+                continue
+            mapping[key] = value
 
         return mapping
 
@@ -599,7 +862,8 @@ class Resource(object):
         This method converts a dict of server-side data to contain
         only the appropriate keys for attributes on this instance.
         """
-        return {k: v for k, v in component.items() if k in mapping.values()}
+        names = set(mapping.values())
+        return {k: v for k, v in component.items() if k in names}
 
     def _translate_response(self, response, has_body=True):
         """Given a KSA response, inflate this instance with its data
@@ -610,20 +874,28 @@ class Resource(object):
         This method updates attributes that correspond to headers
         and body on this instance and clears the dirty set.
         """
+        # Validators only describe the response of a get, which sets
+        # them again once translated.
+        self._validators = None
+        registry = self._component_registry()
         if has_body:
             body = response.json()
             if self.resource_key and self.resource_key in body:
                 body = body[self.resource_key]
 
-            body = self._filter_component(body, self._body_mapping())
-            self._body.attributes.update(body)
-            self._body.clean()
+            self._translate_body(body)
 
         headers = self._filter_component(response.headers,
-                                         self._header_mapping())
+                                         registry.table(Header).mapping)
         self._header.attributes.update(headers)
         self._header.clean()
 
+    def _translate_body(self, body):
+        """Update the body attributes of this instance from server data"""
+        mapping = self._component_registry().table(Body).mapping
+        self._body.attributes.update(self._filter_component(body, mapping))
+        self._body.clean()
+
     def create(self, session, prepend_key=True):
         """Create a remote resource based on this instance.
 
@@ -673,12 +945,43 @@ class Resource(object):
 
         request = self._prepare_request(requires_id=requires_id)
         endpoint_override = self.service.get_endpoint_override()
+        kwargs = {}
+        headers = self._get_conditional_headers(request.uri)
+        if headers:
+            kwargs["headers"] = headers
         response = session.get(request.uri, endpoint_filter=self.service,
-                               endpoint_override=endpoint_override)
+                               endpoint_override=endpoint_override, **kwargs)
+        if headers and response.status_code == 304:
+            # Nothing changed since the previous response, which this
+            # instance already holds.
+            return self
 
         self._translate_response(response)
+        if self.conditional_get:
+            self._validators = _get_validators(request.uri, response)
         return self
 
+    def _get_conditional_headers(self, uri):
+        """Return the headers making a get of uri conditional
+
+        They are only sent for the URI of the previous get, and while no
+        attribute was changed since, as a 304 response leaves the instance
+        as it is.
+        """
+        if not self.conditional_get or self._validators is None:
+            return {}
+        validated_uri, etag, last_modified = self._validators
+        if (validated_uri != uri or self._body.dirty or
+                self._header.dirty):
+            return {}
+        # If-None-Match takes precedence, and If-Modified-Since is only
+        # precise to the second.
+        if etag:
+            return {"If-None-Match": etag}
+        if last_modified and self.conditional_last_modified:
+            return {"If-Modified-Since": last_modified}
+        return {}
+
     def head(self, session):
         """Get headers from a remote resource based on this instance.
 
@@ -717,7 +1020,7 @@ class Resource(object):
         """
         # The id cannot be dirty for an update
         self._body._dirty.discard("id")
-        id_mapping_name = self._body_mapping()["id"]
+        id_mapping_name = self._component_registry().table(Body).mapping["id"]
         self._body._dirty.discard(id_mapping_name)
 
         # Only try to update if we actually have anything to update.
@@ -776,6 +1079,25 @@ class Resource(object):
                                               cls.next_marker_path)
         return None
 
+    @classmethod
+    def get_remaining_pages(cls, response_json, yielded, query_params):
+        """Get the query parameters of the pages following the first one
+
+        Services which page by offset or page number, and report the total
+        number of resources, allow any page to be requested without the
+        previous one. Their resources override this so that
+        :meth:`list` can request those pages concurrently.
+
+        :param dict response_json: The body of the first page.
+        :param int yielded: The number of resources in the first page.
+        :param dict query_params: The query parameters sent for the first
+                                  page.
+
+        :returns: A list of query parameter dicts, one per remaining page,
+                  or ``None`` if pages must be requested one after another.
+        """
+        return None
+
     @staticmethod
     def find_value_by_accessor(input_dict, accessor):
         """Gets value from a dictionary using a dotted accessor"""
@@ -792,7 +1114,8 @@ class Resource(object):
         return cls.base_path % params
 
     @classmethod
-    def list(cls, session, paginated=False, **params):
+    def list(cls, session, paginated=False, compact=False, prefetch=0,
+             parallel=0, stream=False, **params):
         """This method is a generator which yields resource objects.
 
         This resource object list generator handles pagination and takes query
@@ -806,6 +1129,28 @@ class Resource(object):
                                **When paginated is False only one
                                page of data will be returned regardless
                                of the API's support of pagination.**
+        :param bool compact: When ``True``, yield resources that store their
+                             attributes in a compact read-only form until
+                             they are first modified. This greatly reduces
+                             the memory used when holding on to many
+                             results. See :meth:`existing`.
+        :param int prefetch: When greater than zero, pages are requested
+                             in a background thread while the caller
+                             consumes the current one, keeping at most
+                             this many pages buffered ahead. Closing the
+                             generator stops the background requests.
+        :param int parallel: When greater than one and ``paginated`` is
+                             ``True``, the pages following the first one
+                             are requested on this many threads at once,
+                             for resources whose service pages by offset.
+                             See :meth:`get_remaining_pages`. Resources
+                             are still yielded in order.
+        :param bool stream: When ``True``, each page is decoded as it is
+                            received, and its resources are yielded before
+                            the rest of it arrives. This keeps the memory
+                            used flat for services which return huge lists
+                            in one response. ``prefetch`` and ``parallel``
+                            are ignored when streaming.
         :param dict params: These keyword arguments are passed through the
             :meth:`~openstack.resource2.QueryParamter._transpose` method
             to find if any of them match expected query parameters to be
@@ -823,43 +1168,73 @@ class Resource(object):
         if not cls.allow_list:
             raise exceptions.MethodNotSupported(cls, "list")
 
+        if stream:
+            # Only passed when set, for subclasses which override
+            # _list_pages without streaming.
+            pages = cls._list_pages(session, paginated=paginated,
+                                    compact=compact, stream=True, **params)
+        else:
+            pages = cls._list_pages(session, paginated=paginated,
+                                    compact=compact, parallel=parallel,
+                                    **params)
+        if prefetch > 0 and not stream:
+            pages = prefetch_pages(pages, prefetch)
+
+        for page in pages:
+            for value in page:
+                yield value
+
+    @classmethod
+    def _list_pages(cls, session, paginated=False, compact=False, parallel=0,
+                    stream=False, **params):
+        """Generate the resources of each page of a listing
+
+        This does the actual requests for :meth:`list`, yielding a list
+        of resources per page. The request for a page is only made once
+        the previous page has been consumed, which allows it to be run
+        ahead of the caller by :func:`prefetch_pages`. When streaming, a
+        :class:`_StreamedPage` is yielded instead of a list.
+        """
         more_data = True
         query_params = cls._query_mapping._transpose(params)
         uri = cls.get_list_uri(params)
 
         while more_data:
-            endpoint_override = cls.service.get_endpoint_override()
-            resp = session.get(uri, endpoint_filter=cls.service,
-                               endpoint_override=endpoint_override,
-                               headers={"Accept": "application/json"},
-                               params=query_params)
-            response_json = resp.json()
-            if cls.resources_key:
-                resources = cls.find_value_by_accessor(response_json,
-                                                       cls.resources_key)
+            if stream:
+                page = cls._stream_page(session, uri, query_params,
+                                        compact=compact)
+                try:
+                    yield page
+                except GeneratorExit:
+                    page.close()
+                    raise
+                # Read what the caller left of the page, to get to the
+                # markers following the resources.
+                page.finish()
+                response_json = page.document
+                yielded = page.count
+                new_marker = page.last.id if page.last is not None else None
             else:
-                resources = response_json
-
-            if not resources:
+                response_json, page = cls._list_page(session, uri,
+                                                     query_params,
+                                                     compact=compact)
+                # Keep track of how many items we've yielded. If we yielded
+                # less than our limit, we don't need to do an extra request
+                # to get back an empty data set, which acts as a sentinel.
+                yielded = len(page)
+                new_marker = page[-1].id if page else None
+                yield page
+            if not yielded:
                 more_data = False
 
-            # Keep track of how many items we've yielded. If we yielded
-            # less than our limit, we don't need to do an extra request
-            # to get back an empty data set, which acts as a sentinel.
-            yielded = 0
-            new_marker = None
-            for data in resources:
-                # Do not allow keys called "self" through. Glance chose
-                # to name a key "self", so we need to pop it out because
-                # we can't send it through cls.existing and into the
-                # Resource initializer. "self" is already the first
-                # argument and is practically a reserved word.
-                data.pop("self", None)
-
-                value = cls.existing(**data)
-                new_marker = value.id
-                yielded += 1
-                yield value
+            if paginated and parallel > 1:
+                remaining = cls._list_remaining_pages(
+                    session, uri, response_json, yielded, query_params,
+                    compact=compact, parallel=parallel)
+                if remaining is not None:
+                    for page in remaining:
+                        yield page
+                    return
 
             query_params = dict(query_params)
             # if `next marker path` is explicit specified, use it as marker
@@ -886,6 +1261,164 @@ class Resource(object):
             query_params[cls.query_limit_key] = yielded
             query_params[cls.query_marker_key] = new_marker
 
+    @classmethod
+    def _list_page(cls, session, uri, query_params, compact=False):
+        """Request one page of a listing
+
+        :returns: A tuple of the decoded response body and the list of
+                  resources it holds.
+        """
+        endpoint_override = cls.service.get_endpoint_override()
+        resp = session.get(uri, endpoint_filter=cls.service,
+                           endpoint_override=endpoint_override,
+                           headers={"Accept": "application/json"},
+                           params=query_params)
+        response_json = resp.json()
+        if cls.resources_key:
+            resources = cls.find_value_by_accessor(response_json,
+                                                   cls.resources_key)
+        else:
+            resources = response_json
+
+        page = [cls._from_list_item(data, compact=compact)
+                for data in resources or []]
+        return response_json, page
+
+    @classmethod
+    def _stream_page(cls, session, uri, query_params, compact=False):
+        """Request one page of a listing, to be decoded as it is received
+
+        :returns: A :class:`_StreamedPage` of the resources.
+        """
+        endpoint_override = cls.service.get_endpoint_override()
+        resp = session.get(uri, endpoint_filter=cls.service,
+                           endpoint_override=endpoint_override,
+                           headers={"Accept": "application/json"},
+                           params=query_params, stream=True)
+        return _StreamedPage(cls, resp, compact=compact)
+
+    @classmethod
+    def _from_list_item(cls, data, compact=False):
+        """Create a resource from an item of a listing"""
+        # Do not allow keys called "self" through. Glance chose
+        # to name a key "self", so we need to pop it out because
+        # we can't send it through cls.existing and into the
+        # Resource initializer. "self" is already the first
+        # argument and is practically a reserved word.
+        data.pop("self", None)
+
+        if compact:
+            return cls.existing(_compact=True, **data)
+        return cls.existing(**data)
+
+    @classmethod
+    def _list_remaining_pages(cls, session, uri, response_json, yielded,
+                              query_params, compact=False, parallel=2):
+        """Request the pages following the first one concurrently
+
+        :returns: A generator of the remaining pages in order, or ``None``
+                  when :meth:`get_remaining_pages` cannot tell them in
+                  advance and they must be requested one after another.
+        """
+        remaining = cls.get_remaining_pages(response_json, yielded,
+                                            query_params)
+        if remaining is None:
+            return None
+
+        def fetch(params):
+            return cls._list_page(session, uri, params, compact=compact)[1]
+
+        return fetch_pages(fetch, remaining, parallel)
+
+    @classmethod
+    def bulk_create(cls, session, data, prepend_key=True):
+        """Create many remote resources with one request
+
+        The bodies of the resources are sent as a list, within a dict with
+        the ``resources_key`` when prepend_key is True, and the response
+        is expected to hold the created resources the same way. This is
+        how Neutron creates resources in bulk.
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param list data: The attributes of each resource to create. The
+                          resources must have the same URI attributes.
+        :param prepend_key: A boolean indicating whether the resources_key
+                            should be prepended in a resource creation
+                            request. Default to True.
+
+        :return: The list of created resources, in the order of ``data``.
+        :raises: :exc:`~openstack.exceptions.MethodNotSupported` if
+                 :data:`Resource.allow_bulk_create` is not set to ``True``.
+        """
+        if not cls.allow_bulk_create:
+            raise exceptions.MethodNotSupported(cls, "bulk_create")
+
+        resources = [cls.new(**attrs) for attrs in data]
+        if not resources:
+            return []
+        requests = [res._prepare_request(requires_id=False)
+                    for res in resources]
+        uri = requests[0].uri
+        if any(request.uri != uri for request in requests):
+            raise exceptions.InvalidRequest(
+                "Resources created in bulk must have the same URI")
+        body = [request.body for request in requests]
+        if prepend_key and cls.resources_key is not None:
+            body = {cls.resources_key: body}
+
+        endpoint_override = cls.service.get_endpoint_override()
+        response = session.post(uri, endpoint_filter=cls.service,
+                                endpoint_override=endpoint_override,
+                                json=body, headers=requests[0].headers)
+        try:
+            items = response.json()
+            if cls.resources_key and isinstance(items, dict):
+                items = items[cls.resources_key]
+        except (ValueError, KeyError):
+            raise exceptions.InvalidResponse(response)
+        if not isinstance(items, list) or len(items) != len(resources):
+            raise exceptions.InvalidResponse(response)
+        for res, item in zip(resources, items):
+            res._translate_body(item)
+        return resources
+
+    @classmethod
+    def bulk_delete(cls, session, resources):
+        """Delete many remote resources with one request
+
+        Subclasses setting ``allow_bulk_delete`` implement this for the
+        bulk endpoint of their service.
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param list resources: The resources to delete.
+
+        :return: The list of deleted resources.
+        :raises: :exc:`~openstack.exceptions.MethodNotSupported` if
+                 :data:`Resource.allow_bulk_delete` is not set to ``True``.
+        """
+        raise exceptions.MethodNotSupported(cls, "bulk_delete")
+
+    @classmethod
+    def list_statuses(cls, session, **params):
+        """List the resources whose status is polled together
+
+        This is used by :func:`~openstack.resource2.wait_for_statuses` for
+        resources which set ``allow_status_list``. Subclasses whose listing
+        does not report the status can override it to list another
+        resource type, such as a detailed listing.
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param dict params: The URI parameters of the resources, and the
+                            ``id`` or ``status`` query parameters filtering
+                            the listing when ``_query_mapping`` accepts them.
+
+        :return: A generator of resources reporting their status.
+        """
+        return cls.list(session, paginated=True, **params)
+
     @classmethod
     def _get_one_match(cls, name_or_id, results):
         """Given a list of results, return the match"""
@@ -924,6 +1457,12 @@ class Resource(object):
                             :meth:`~openstack.resource2.Resource.existing`
                             in order to pass on URI parameters.
 
+        When no resource has ``name_or_id`` as its id, resources are listed
+        to look for it by name. If ``_query_mapping`` accepts the
+        :data:`query_name_key` parameter, the server is asked for the
+        resources with that name only. Otherwise, the first page of all
+        resources is searched.
+
         :return: The :class:`Resource` object matching the given name or id
                  or None if nothing matches.
         :raises: :class:`openstack.exceptions.DuplicateResource` if more
@@ -938,7 +1477,16 @@ class Resource(object):
         except exceptions.NotFoundException:
             pass
 
-        data = cls.list(session, **params)
+        name_key = cls.query_name_key
+        if (name_key and name_key not in params and
+                cls._query_mapping._accepts(name_key)):
+            # The server narrows the listing down to the candidates, which
+            # fit in one page. They are still compared to name_or_id, as
+            # servers may match names loosely.
+            data = cls.list(session,
+                            **dict(params, **{name_key: name_or_id}))
+        else:
+            data = cls.list(session, **params)
 
         result = cls._get_one_match(name_or_id, data)
         if result is not None:
@@ -950,8 +1498,301 @@ class Resource(object):
             "No %s found for %s" % (cls.__name__, name_or_id))
 
 
+class _StreamedPage(object):
+
+    def __init__(self, resource_type, response, compact=False):
+        """The resources of a streamed page of a listing
+
+        Iterating over the page yields the resources as the items holding
+        them are received, and closes the response once they were all read.
+        Afterwards, :attr:`document` holds the rest of the body.
+        """
+        self.resource_type = resource_type
+        self.compact = compact
+        #: The number of resources yielded so far.
+        self.count = 0
+        #: The last resource yielded.
+        self.last = None
+        self._response = response
+        self._closed = False
+        self._items = json_stream.ItemStream(
+            response.iter_content(chunk_size=json_stream.DEFAULT_CHUNK_SIZE),
+            resource_type.resources_key,
+            encoding=response.encoding or "utf-8")
+        self._resources = self._read()
+
+    @property
+    def document(self):
+        """The body of the response, without the resources"""
+        return self._items.document
+
+    def __iter__(self):
+        return self._resources
+
+    def _read(self):
+        try:
+            for data in self._items:
+                self.last = self.resource_type._from_list_item(
+                    data, compact=self.compact)
+                self.count += 1
+                yield self.last
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop reading the page, closing its response"""
+        if not self._closed:
+            self._closed = True
+            self._response.close()
+
+    def finish(self):
+        """Read the resources the caller did not consume"""
+        for _ in self._resources:
+            pass
+
+
+def prefetch_pages(pages, size):
+    """Consume an iterator of pages in a background thread
+
+    Pages are requested ahead of the caller and buffered, with at most
+    ``size`` pages waiting to be consumed at any time. Any exception raised
+    while fetching is re-raised to the caller in order. When the returned
+    generator is closed, or garbage collected, the background thread stops
+    after the request it is currently making.
+
+    :param pages: An iterator of pages, such as the one returned by
+                  :meth:`~openstack.resource2.Resource._list_pages`.
+    :param int size: The maximum number of buffered pages.
+
+    :return: A generator of the pages from ``pages``.
+    """
+    buffer = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+
+    def fetch():
+        try:
+            for page in pages:
+                buffer.put((page, None))
+                if stopped.is_set():
+                    return
+            buffer.put((_END_OF_PAGES, None))
+        except Exception:
+            buffer.put((_END_OF_PAGES, sys.exc_info()))
+
+    fetcher = threading.Thread(target=fetch)
+    fetcher.daemon = True
+    fetcher.start()
+
+    try:
+        while True:
+            page, error = buffer.get()
+            if page is _END_OF_PAGES:
+                if error is not None:
+                    six.reraise(*error)
+                return
+            yield page
+    finally:
+        stopped.set()
+        # Make room for the fetcher in case it is blocked on a full buffer
+        # so that it gets to see it has been stopped.
+        try:
+            while True:
+                buffer.get_nowait()
+        except queue.Empty:
+            pass
+
+
+def fetch_pages(fetch, requests, workers):
+    """Call ``fetch`` for each of ``requests`` on a pool of threads
+
+    Up to ``workers`` requests are in flight at once, and the results are
+    yielded in the order of ``requests``. Workers do not run further than
+    ``2 * workers`` results ahead of the caller. Any exception raised by
+    ``fetch`` is re-raised to the caller in order. When the returned
+    generator is closed, the workers stop after their current request.
+
+    :param fetch: A callable taking one item of ``requests`` and returning
+                  a page.
+    :param list requests: The arguments to call ``fetch`` with.
+    :param int workers: The maximum number of concurrent calls.
+
+    :return: A generator of the pages returned by ``fetch``.
+    """
+    requests = list(requests)
+    results = {}
+    state = {"next": 0, "consumed": 0, "stopped": False}
+    condition = threading.Condition()
+
+    def work():
+        while True:
+            with condition:
+                while (not state["stopped"] and
+                       state["next"] < len(requests) and
+                       state["next"] >= state["consumed"] + 2 * workers):
+                    condition.wait()
+                if state["stopped"] or state["next"] >= len(requests):
+                    return
+                index = state["next"]
+                state["next"] += 1
+            try:
+                result = (fetch(requests[index]), None)
+            except Exception:
+                result = (None, sys.exc_info())
+            with condition:
+                results[index] = result
+                condition.notify_all()
+
+    for _ in range(min(workers, len(requests))):
+        worker = threading.Thread(target=work)
+        worker.daemon = True
+        worker.start()
+
+    try:
+        for index in range(len(requests)):
+            with condition:
+                while index not in results:
+                    condition.wait()
+                page, error = results.pop(index)
+                state["consumed"] = index + 1
+                condition.notify_all()
+            if error is not None:
+                six.reraise(*error)
+            yield page
+    finally:
+        with condition:
+            state["stopped"] = True
+            condition.notify_all()
+
+
+class PollingPolicy(object):
+
+    def __init__(self, interval=2, max_interval=DEFAULT_MAX_INTERVAL,
+                 backoff=1.5, jitter=0.1):
+        """The schedule of the requests made by the waiters
+
+        The first check is made at once, the second one ``interval``
+        seconds later, and every following wait is ``backoff`` times longer
+        than the previous one, up to ``max_interval``. Each wait is
+        shortened by a random fraction of up to ``jitter`` so that clients
+        started together spread their requests. When a check is throttled
+        with a 429 or 503 response, its ``Retry-After`` header gives the
+        next wait instead.
+
+        :param interval: Number of seconds to wait before the second check.
+        :param max_interval: Maximum number of seconds to wait between
+                             checks.
+        :param float backoff: The factor each wait grows by.
+        :param float jitter: The maximum fraction of a wait cut at random.
+        """
+        self.interval = interval
+        self.max_interval = max(interval, max_interval)
+        self.backoff = backoff
+        self.jitter = jitter
+
+    def start(self, wait):
+        """Start polling for at most wait seconds
+
+        :return: A :class:`Poll` following this policy.
+        """
+        return Poll(self, wait)
+
+
+class Poll(object):
+
+    def __init__(self, policy, wait):
+        """The progress of a waiter through a :class:`PollingPolicy`
+
+        The deadline is measured on a monotonic clock when there is one, so
+        that the time taken by the checks themselves counts.
+        """
+        self.policy = policy
+        self.deadline = _monotonic() + wait
+        self.delay = policy.interval
+
+    @property
+    def remaining(self):
+        """Return the number of seconds left before the deadline"""
+        return self.deadline - _monotonic()
+
+    @property
+    def expired(self):
+        return self.remaining <= 0
+
+    def reset(self):
+        """Make the next wait ``interval`` long again"""
+        self.delay = self.policy.interval
+
+    def sleep(self, retry_after=None):
+        """Wait before the next check, never beyond the deadline
+
+        :param retry_after: The number of seconds a throttled check asked
+                            to wait, used instead of the policy's wait.
+        """
+        if retry_after is None:
+            delay = self.delay * (1 - random.uniform(0, self.policy.jitter))
+            self.delay = min(self.delay * self.policy.backoff,
+                             self.policy.max_interval)
+        else:
+            delay = retry_after
+        remaining = self.remaining
+        if remaining > 0:
+            time.sleep(min(delay, remaining))
+
+
+def _start_poll(policy, interval, wait):
+    if policy is None:
+        policy = PollingPolicy(interval)
+    return policy.start(wait)
+
+
+def _refresh(session, resource):
+    """Get a resource for a waiter
+
+    :return: ``None``, or the number of seconds to wait for when the
+             request was throttled and said for how long.
+    """
+    try:
+        resource.get(session)
+    except exceptions.HttpException as e:
+        if not _is_throttled(e):
+            raise
+        return utils.get_retry_after(e.response)
+    return None
+
+
+def _is_throttled(error):
+    return error.http_status in (429, 503)
+
+
+def _status_queries(resource_type, resources, statuses):
+    """Return the queries listing the status of resources
+
+    :return: A tuple of the list of query parameters of each listing to
+             make, and whether they list all of the resources, rather than
+             only those in one of statuses.
+    """
+    accepts = resource_type._query_mapping._accepts
+    if accepts("id"):
+        return [{"id": [resource.id for resource in resources]}], True
+    if statuses and accepts("status"):
+        return [{"status": status} for status in statuses], False
+    return [{}], True
+
+
+def _get_validators(uri, response):
+    """Return the validators of a response to a get of uri, or ``None``"""
+    validators = []
+    for name in ("ETag", "Last-Modified"):
+        value = response.headers.get(name)
+        validators.append(value if isinstance(value, six.string_types)
+                          else None)
+    if not any(validators):
+        return None
+    return tuple([uri] + validators)
+
+
 def wait_for_status(session, resource, status,
-                    failures=[], interval=5, wait=120):
+                    failures=[], interval=5, wait=120, policy=None):
     """Wait for the resource to be in a particular status.
 
     :param session: The session to use for making this request.
@@ -962,8 +1803,11 @@ def wait_for_status(session, resource, status,
     :param status: Desired status of the resource.
     :param list failures: Statuses that would indicate the transition
                           failed such as 'ERROR'.
-    :param interval: Number of seconds to wait between checks.
+    :param interval: Number of seconds to wait between the first checks.
     :param wait: Maximum number of seconds to wait for transition.
+    :param policy: The schedule of the checks. Defaults to a
+                   :class:`PollingPolicy` starting at ``interval``.
+    :type policy: :class:`PollingPolicy`
 
     :return: Method returns self on success.
     :raises: :class:`~openstack.exceptions.ResourceTimeout` transition
@@ -976,45 +1820,189 @@ def wait_for_status(session, resource, status,
     if resource.status == status:
         return resource
 
-    total_sleep = 0
     if failures is None:
         failures = []
 
-    while total_sleep < wait:
-        resource.get(session)
+    poll = _start_poll(policy, interval, wait)
+    while not poll.expired:
+        retry_after = _refresh(session, resource)
         if resource.status == status:
             return resource
         if resource.status in failures:
             msg = ("Resource %s transitioned to failure state %s" %
                    (resource.id, resource.status))
             raise exceptions.ResourceFailure(msg)
-        time.sleep(interval)
-        total_sleep += interval
+        poll.sleep(retry_after)
     msg = "Timeout waiting for %s to transition to %s" % (resource.id, status)
     raise exceptions.ResourceTimeout(msg)
 
 
-def wait_for_delete(session, resource, interval, wait):
+def wait_for_delete(session, resource, interval, wait, policy=None):
     """Wait for the resource to be deleted.
 
     :param session: The session to use for making this request.
     :type session: :class:`~openstack.session.Session`
     :param resource: The resource to wait on to be deleted.
     :type resource: :class:`~openstack.resource.Resource`
-    :param interval: Number of seconds to wait between checks.
+    :param interval: Number of seconds to wait between the first checks.
     :param wait: Maximum number of seconds to wait for the delete.
+    :param policy: The schedule of the checks. Defaults to a
+                   :class:`PollingPolicy` starting at ``interval``.
+    :type policy: :class:`PollingPolicy`
 
     :return: Method returns self on success.
     :raises: :class:`~openstack.exceptions.ResourceTimeout` transition
              to status failed to occur in wait seconds.
     """
-    total_sleep = 0
-    while total_sleep < wait:
+    poll = _start_poll(policy, interval, wait)
+    while not poll.expired:
         try:
-            resource.get(session)
+            retry_after = _refresh(session, resource)
         except exceptions.NotFoundException:
             return resource
-        time.sleep(interval)
-        total_sleep += interval
+        poll.sleep(retry_after)
     msg = "Timeout waiting for %s delete" % (resource.id)
     raise exceptions.ResourceTimeout(msg)
+
+
+def wait_for_statuses(session, resources, status, failures=None,
+                      interval=2, wait=120, max_workers=DEFAULT_WAIT_WORKERS,
+                      policy=None):
+    """Wait for many resources to be in a particular status.
+
+    All the resources are polled at each interval. Those of a type which
+    sets ``allow_status_list`` are polled with one listing per type and
+    URI parameters, and the others, along with any missing from their
+    listing, with one GET each on up to ``max_workers`` threads. The
+    interval grows after every poll where no resource settled, and goes
+    back to ``interval`` when one does.
+
+    Listings are filtered by the ids of the resources when their
+    ``_query_mapping`` accepts ``id``, or otherwise by ``status`` and each
+    of ``failures`` when it accepts ``status``. Once the resources left are
+    few compared to their previous listing, see :data:`STATUS_LIST_RATIO`,
+    they are fetched one by one instead.
+
+    :param session: The session to use for making this request.
+    :type session: :class:`~openstack.session.Session`
+    :param resources: The resources to wait on to reach the status. The
+                      resources must have a status attribute.
+    :type resources: list of :class:`~openstack.resource2.Resource`
+    :param status: Desired status of the resources.
+    :param list failures: Statuses that would indicate the transition
+                          failed such as 'ERROR'.
+    :param interval: Number of seconds to wait between the first checks.
+    :param wait: Maximum number of seconds to wait for transition.
+    :param int max_workers: The maximum number of concurrent GET requests.
+    :param policy: The schedule of the checks. Defaults to a
+                   :class:`PollingPolicy` starting at ``interval``.
+    :type policy: :class:`PollingPolicy`
+
+    :return: A generator of the resources, each yielded as soon as it is
+             in ``status`` or one of ``failures``, which the caller should
+             check.
+    :raises: :class:`~openstack.exceptions.ResourceTimeout` when some of the
+             resources are not in ``status`` or one of ``failures`` after
+             wait seconds. The resources which settled are yielded first.
+    :raises: :class:`~AttributeError` if a resource does not have a status
+             attribute
+    """
+    if failures is None:
+        failures = []
+    poll = _start_poll(policy, interval, wait)
+    pending = list(resources)
+    statuses = [status] + [failure for failure in failures
+                           if failure != status]
+    # The number of resources in the previous listing of each group.
+    sizes = {}
+
+    retry_after = None
+    polled = False
+    while True:
+        remaining = []
+        for resource in pending:
+            if resource.status == status or resource.status in failures:
+                yield resource
+            else:
+                remaining.append(resource)
+        if not remaining:
+            return
+
+        if polled:
+            if poll.expired:
+                break
+            if len(remaining) < len(pending):
+                poll.reset()
+            poll.sleep(retry_after)
+        pending = remaining
+        retry_after = _poll_statuses(session, pending, max_workers,
+                                     statuses=statuses, sizes=sizes)
+        polled = True
+
+    msg = "Timeout waiting for %s to transition to %s" % (
+        ", ".join(str(resource.id) for resource in remaining), status)
+    raise exceptions.ResourceTimeout(msg)
+
+
+def _poll_statuses(session, resources, max_workers, statuses=None,
+                   sizes=None):
+    """Refresh the status of resources for :func:`wait_for_statuses`
+
+    :param list statuses: The statuses waited for, which listings are
+                          filtered by when the ids of the resources cannot
+                          be.
+    :param dict sizes: The number of resources in the previous listing of
+                       each group of resources, which is updated.
+
+    :return: The longest wait asked for by throttled requests, if any.
+    """
+    if sizes is None:
+        sizes = {}
+    listings = collections.OrderedDict()
+    gets = []
+    for resource in resources:
+        if not resource.allow_status_list:
+            gets.append(resource)
+            continue
+        params = dict((key, value) for key, value in resource._uri.items()
+                      if value is not None and key != "id")
+        key = (type(resource), tuple(sorted(params.items())))
+        listings.setdefault(key, (params, []))[1].append(resource)
+
+    delays = []
+    for key, (params, members) in listings.items():
+        resource_type = key[0]
+        size = sizes.get(key)
+        if size is not None and len(members) * STATUS_LIST_RATIO < size:
+            # Listing everything again would cost more than a few gets.
+            gets.extend(members)
+            continue
+        queries, complete = _status_queries(resource_type, members,
+                                            statuses)
+        listed = {}
+        try:
+            for query in queries:
+                query.update(params)
+                for found in resource_type.list_statuses(session, **query):
+                    listed[found.id] = found
+        except exceptions.HttpException as e:
+            if not _is_throttled(e):
+                raise
+            delays.append(utils.get_retry_after(e.response))
+            continue
+        sizes[key] = len(listed)
+        for resource in members:
+            found = listed.get(resource.id)
+            if found is None:
+                # Not listed, e.g. filtered out by default, so ask directly,
+                # unless the listing only had the statuses waited for.
+                if complete:
+                    gets.append(resource)
+                continue
+            resource._body.attributes.update(dict(found._body))
+            resource._body.clean()
+
+    delays.extend(fetch_pages(lambda resource: _refresh(session, resource),
+                              gets, max_workers))
+    delays = [delay for delay in delays if delay is not None]
+    return max(delays) if delays else None
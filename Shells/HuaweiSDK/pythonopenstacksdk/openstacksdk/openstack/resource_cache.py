@@ -0,0 +1,213 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+A cache of the resources returned by proxies.
+
+Flavors, images, extensions, quotas and other resources which rarely change
+are requested again by every ``get_*`` and ``find_*`` call of a proxy. A
+resource cache keeps what these calls return for a number of seconds, so
+that scripts resolving the same names over and over only request them once.
+
+Only resource types with a policy are cached. Their policy is given to the
+cache, or taken from the ``cache_ttl`` of the resource class, which is set
+for slowly changing catalog resources. The entries of a type are dropped
+when a resource of that type is created, updated or deleted through a
+proxy, and the least recently used ones are evicted when there are more
+than ``max_size`` of them.
+
+Examples
+--------
+
+Cache flavors for an hour and images for the default time::
+
+    from openstack.compute.v2 import flavor
+    from openstack import connection
+    from openstack import resource_cache
+
+    cache = resource_cache.ResourceCache(
+        policies={flavor.Flavor: resource_cache.CachePolicy(ttl=3600)})
+    conn = connection.Connection(resource_cache=cache, **auth_args)
+
+    for _ in range(100):
+        conn.compute.find_flavor("s3.large.2")
+    print(cache.hits, cache.misses)
+"""
+import collections
+import copy
+import threading
+import time
+
+#: The default number of resources of a type kept by a cache.
+DEFAULT_MAX_SIZE = 256
+
+
+class CachePolicy(object):
+
+    def __init__(self, ttl, max_size=None):
+        """How resources of a type are cached
+
+        :param float ttl: The number of seconds a resource is kept. When
+                          ``None`` or 0, resources of the type are not
+                          cached.
+        :param int max_size: The number of resources of the type kept, the
+                             least recently used being evicted first.
+                             Defaults to the ``max_size`` of the cache.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+
+
+class CacheStats(object):
+
+    def __init__(self):
+        """The counters of a resource type in a cache"""
+        #: The number of lookups answered from the cache.
+        self.hits = 0
+        #: The number of lookups which had to make a request.
+        self.misses = 0
+        #: The number of resources dropped because they were least
+        #: recently used.
+        self.evictions = 0
+        #: The number of resources currently kept.
+        self.size = 0
+
+    def __repr__(self):
+        return ("CacheStats(hits=%d, misses=%d, evictions=%d, size=%d)" %
+                (self.hits, self.misses, self.evictions, self.size))
+
+
+class ResourceCache(object):
+
+    def __init__(self, policies=None, max_size=DEFAULT_MAX_SIZE):
+        """Keep the resources returned by proxies in memory
+
+        :param dict policies: A :class:`CachePolicy` for resource classes,
+                              which applies to their subclasses too. They
+                              override the ``cache_ttl`` of the classes.
+        :param int max_size: The number of resources of each type kept,
+                             unless their policy tells otherwise.
+
+        The number of lookups answered from the cache and the number of
+        requests it had to let through are counted in :attr:`hits` and
+        :attr:`misses`, and per resource type by :meth:`stats`.
+        """
+        self.policies = dict(policies or {})
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # Resource types mapped to the OrderedDict of their entries, each
+        # an (expires, resource) tuple, from least to most recently used.
+        self._entries = {}
+        self._stats = {}
+        # Incremented by invalidate, so that resources requested before
+        # are not stored after.
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_policy(self, resource_type):
+        """Return the :class:`CachePolicy` of a resource type, or ``None``"""
+        for cls in resource_type.__mro__:
+            if cls in self.policies:
+                policy = self.policies[cls]
+                break
+        else:
+            ttl = getattr(resource_type, "cache_ttl", None)
+            policy = CachePolicy(ttl) if ttl else None
+        if policy is None or not policy.ttl:
+            return None
+        return policy
+
+    def fetch(self, resource_type, key, func):
+        """Return the resource cached for key, or the result of func
+
+        :param resource_type: The type of resource looked up.
+        :param key: A hashable identifier of the lookup within its type.
+        :param func: A function making the request, which is called when
+                     nothing is cached. Its result is cached unless it is
+                     ``None``.
+
+        :returns: A copy of the cached resource, so that changes made by
+                  the caller do not alter the cache.
+        """
+        policy = self.get_policy(resource_type)
+        try:
+            hash(key)
+        except TypeError:
+            policy = None
+        if policy is None:
+            return func()
+
+        with self._lock:
+            entries = self._entries.setdefault(resource_type,
+                                               collections.OrderedDict())
+            stats = self._stats.setdefault(resource_type, CacheStats())
+            entry = entries.pop(key, None)
+            if entry is not None and entry[0] > time.time():
+                entries[key] = entry
+                stats.hits += 1
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            stats.misses += 1
+            self.misses += 1
+            stats.size = len(entries)
+            generation = self._generation
+
+        value = func()
+        if value is None:
+            return value
+
+        with self._lock:
+            if generation != self._generation:
+                return value
+            entries = self._entries.setdefault(resource_type,
+                                               collections.OrderedDict())
+            stats = self._stats.setdefault(resource_type, CacheStats())
+            entries.pop(key, None)
+            entries[key] = (time.time() + policy.ttl, copy.deepcopy(value))
+            max_size = policy.max_size or self.max_size
+            while len(entries) > max_size:
+                entries.popitem(last=False)
+                stats.evictions += 1
+            stats.size = len(entries)
+        return value
+
+    def invalidate(self, resource_type=None):
+        """Forget the cached resources of a type
+
+        :param resource_type: The type of resource which changed. Its
+                              subclasses and base classes are forgotten
+                              too, as they represent the same resources.
+                              When ``None``, everything is forgotten.
+        """
+        with self._lock:
+            self._generation += 1
+            for cached in list(self._entries):
+                if (resource_type is None or
+                        issubclass(cached, resource_type) or
+                        issubclass(resource_type, cached)):
+                    del self._entries[cached]
+                    self._stats[cached].size = 0
+
+    def clear(self):
+        """Forget every cached resource"""
+        self.invalidate()
+
+    def stats(self):
+        """Return the counters of each resource type
+
+        :returns: A dict mapping the resource types looked up to their
+                  :class:`CacheStats`.
+        """
+        with self._lock:
+            return dict((resource_type, copy.copy(stats))
+                        for resource_type, stats in self._stats.items())
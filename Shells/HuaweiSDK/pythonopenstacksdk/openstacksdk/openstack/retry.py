@@ -0,0 +1,123 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Retries of the requests made by :class:`~openstack.session.Session`.
+
+Services under load answer some requests with ``429 Too Many Requests`` or
+``503 Service Unavailable``, and connections to them occasionally fail. A
+:class:`RetryPolicy` given to a session makes it retry such requests on its
+own, after waiting as long as their ``Retry-After`` header asks, or for an
+exponentially growing time otherwise.
+
+Only requests which can safely be sent twice are retried: those with an
+idempotent method, and a body which can be sent again.
+
+Examples
+--------
+
+Retry requests up to five times, waiting up to a minute between them::
+
+    from openstack import connection
+    from openstack import retry
+
+    conn = connection.Connection(
+        retry_policy=retry.RetryPolicy(retries=5, max_backoff=60),
+        **auth_args)
+
+The number of retries is counted by
+:class:`~openstack.metrics.RequestMetrics`, when the session has one.
+"""
+import random
+
+from keystoneauth1 import exceptions as _exceptions
+import six
+
+from openstack import utils
+
+#: The default number of times a request is retried.
+DEFAULT_RETRIES = 3
+#: The HTTP methods retried by default.
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+#: The HTTP status codes retried by default.
+RETRY_STATUSES = frozenset([429, 503])
+
+
+class RetryPolicy(object):
+
+    def __init__(self, retries=DEFAULT_RETRIES, backoff=0.5, max_backoff=30,
+                 jitter=0.5, max_retry_after=120, statuses=RETRY_STATUSES,
+                 methods=IDEMPOTENT_METHODS):
+        """When and how long after failing a request is retried
+
+        The first retry waits ``backoff`` seconds, and every following one
+        twice as long as the previous one, up to ``max_backoff``. Each wait
+        is shortened by a random fraction of up to ``jitter`` so that
+        clients throttled together spread their retries. A response with a
+        ``Retry-After`` header gives the wait instead.
+
+        :param int retries: The number of times a request is retried.
+        :param float backoff: The number of seconds before the first retry.
+        :param float max_backoff: The maximum number of seconds between
+                                  retries.
+        :param float jitter: The maximum fraction of a wait cut at random.
+        :param float max_retry_after: The longest ``Retry-After`` waited
+                                      for. Responses asking for more are
+                                      not retried.
+        :param statuses: The HTTP status codes retried.
+        :param methods: The HTTP methods retried.
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max(backoff, max_backoff)
+        self.jitter = jitter
+        self.max_retry_after = max_retry_after
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+
+    def get_delay(self, method, attempt, error, data=None):
+        """Return how long to wait before retrying a failed request
+
+        :param str method: The HTTP method of the request.
+        :param int attempt: The number of retries already made.
+        :param error: The keystoneauth exception the request raised.
+        :param data: The body of the request.
+
+        :returns: A number of seconds, or ``None`` when the request must
+                  not be retried.
+        """
+        if (attempt >= self.retries or
+                (method or "").upper() not in self.methods or
+                not _is_replayable(data)):
+            return None
+        if isinstance(error, _exceptions.HttpError):
+            if error.http_status not in self.statuses:
+                return None
+            retry_after = utils.get_retry_after(error.response)
+            if retry_after is not None:
+                if retry_after > self.max_retry_after:
+                    return None
+                return retry_after
+        elif (not isinstance(error, _exceptions.ConnectionError) or
+                isinstance(error, _exceptions.SSLError)):
+            return None
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        return delay * (1 - random.uniform(0, self.jitter))
+
+
+def _is_replayable(data):
+    """Whether a request body can be sent again
+
+    Files and generators are consumed by the first attempt.
+    """
+    return data is None or isinstance(data, (six.binary_type,
+                                             six.text_type))
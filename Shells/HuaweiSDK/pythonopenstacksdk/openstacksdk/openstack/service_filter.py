@@ -74,6 +74,9 @@ class ServiceFilter(dict):
     INTERNAL = 'internal'
     ADMIN = 'admin'
     valid_versions = []
+    #: The :class:`~openstack.rate_limit.RateLimit` of the requests made to
+    #: the service, if any. It is not part of the filter.
+    rate_limit = None
 
     def __init__(self, service_type, interface=PUBLIC, region=None,
                  service_name=None, version=None, api_version=None,
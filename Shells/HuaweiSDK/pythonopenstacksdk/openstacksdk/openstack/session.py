@@ -21,6 +21,7 @@ mapping KSA exceptions to SDK exceptions.
 """
 from collections import namedtuple
 import logging
+import time
 
 try:
     from itertools import accumulate
@@ -47,6 +48,7 @@ except ImportError:
 from keystoneauth1 import exceptions as _exceptions
 from keystoneauth1 import session as _session
 
+from openstack import coalesce
 from openstack import exceptions
 from openstack import utils
 from openstack import version as openstack_version
@@ -75,7 +77,10 @@ def map_exceptions(func):
 
 class Session(_session.Session):
 
-    def __init__(self, profile, user_agent=None, **kwargs):
+    def __init__(self, profile, user_agent=None, discovery_cache=None,
+                 auth_cache=None, pool_connections=None, pool_maxsize=None,
+                 pool_block=None, max_retries=None, metrics=None,
+                 retry_policy=None, coalescer=None, **kwargs):
         """Create a new Keystone auth session with a profile.
 
         :param profile: If the user has any special profiles such as the
@@ -88,7 +93,43 @@ class Session(_session.Session):
                            is used, which contains the openstacksdk version
                            When a non-None value is passed, it will be
                            prepended to the default.
+        :param discovery_cache: A cache to share the endpoints found by
+            :meth:`get_endpoint` with other sessions, in addition to the
+            per instance ``endpoint_cache``. By default nothing is shared.
+        :type discovery_cache:
+            :class:`~openstack.discovery_cache.DiscoveryCache`
+        :param auth_cache: A cache to share tokens with other sessions
+            authenticating with the same parameters. By default every
+            session authenticates on its own.
+        :type auth_cache: :class:`~openstack.auth_cache.AuthCache`
+        :param int pool_connections: The number of hosts to keep pools of
+            connections for. Defaults to the value of requests, 10.
+        :param int pool_maxsize: The number of connections kept open per
+            host. Requests made from more threads at once than this open
+            connections which are closed afterwards, so set it to the
+            number of threads used. Defaults to the value of requests, 10.
+        :param bool pool_block: Whether to wait for a free connection when
+            ``pool_maxsize`` are in use, rather than opening a new one.
+        :param max_retries: The number of times a failed connection is
+            retried, or a :class:`urllib3.util.retry.Retry` for finer
+            control. Defaults to the value of requests, 0.
+        :param metrics: Where to record the duration, response size and
+            status of every request, and the hooks to run around them. By
+            default nothing is recorded.
+        :type metrics: :class:`~openstack.metrics.RequestMetrics`
+        :param retry_policy: When to retry requests which were throttled,
+            or failed with a transient error or connection failure. By
+            default failed requests are not retried, besides
+            ``max_retries`` connection attempts.
+        :type retry_policy: :class:`~openstack.retry.RetryPolicy`
+        :param coalescer: Where identical concurrent ``GET`` requests are
+            made once, their response being shared. By default every
+            request is made.
+        :type coalescer: :class:`~openstack.coalesce.RequestCoalescer`
         :type profile: :class:`~openstack.profile.Profile`
+
+        The rate limits set in the profile for each service type are
+        enforced for every attempt of the requests made to it.
         """
         if user_agent is not None:
             self.user_agent = "%s %s" % (user_agent, DEFAULT_USER_AGENT)
@@ -97,12 +138,32 @@ class Session(_session.Session):
 
         self.profile = profile
         api_version_header = self._get_api_requests()
+        self.rate_limits = self._get_rate_limits()
         self.endpoint_cache = {}
+        self.discovery_cache = discovery_cache
+        self.auth_cache = auth_cache
+        self.metrics = metrics
+        self.retry_policy = retry_policy
+        self.coalescer = coalescer
+        # Endpoints taken from the discovery cache which have not yet
+        # served a request, mapped to their discovery cache keys.
+        self._unverified_endpoints = {}
 
         super(Session, self).__init__(user_agent=self.user_agent,
                                       additional_headers=api_version_header,
                                       **kwargs)
 
+        adapter_args = dict((name, value) for name, value in (
+            ("pool_connections", pool_connections),
+            ("pool_maxsize", pool_maxsize),
+            ("pool_block", pool_block),
+            ("max_retries", max_retries)) if value is not None)
+        if adapter_args:
+            # Keep the TCP keep-alive settings of the default adapter.
+            adapter = _session.TCPKeepAliveAdapter(**adapter_args)
+            for scheme in ("https://", "http://"):
+                self.session.mount(scheme, adapter)
+
     def _get_api_requests(self):
         """Get API micro-version requests.
 
@@ -124,6 +185,19 @@ class Session(_session.Session):
 
         return None
 
+    def _get_rate_limits(self):
+        """Get the rate limits of the services of the profile.
+
+        :return: A dict mapping service types to their
+                 :class:`~openstack.rate_limit.RateLimit`.
+        """
+        if self.profile is None:
+            return {}
+
+        return dict((svc.service_type, svc.rate_limit)
+                    for svc in self.profile.get_services()
+                    if svc.rate_limit is not None)
+
     class _Endpoint(object):
 
         def __init__(self, uri, versions,
@@ -313,12 +387,15 @@ class Session(_session.Session):
 
         Endpoints are cached per service type and interface combination
         so that they're only requested from the remote service once
-        per instance of this class.
+        per instance of this class. When the session has a
+        ``discovery_cache``, endpoints are also looked up there and stored
+        in it, so that other sessions do not need to discover them again.
         """
         key = (service_type, interface)
         if key in self.endpoint_cache:
             return self.endpoint_cache[key]
 
+        self._reuse_auth(auth)
         filt = self.profile.get_filter(service_type)
         if filt.interface is None:
             filt.interface = interface
@@ -333,6 +410,19 @@ class Session(_session.Session):
             self.endpoint_cache[key] = sc_endpoint
             return sc_endpoint
 
+        cache_key = None
+        if self.discovery_cache is not None:
+            cache_key = self._get_discovery_cache_key(filt)
+            cached = self.discovery_cache.get(cache_key)
+            # The catalog endpoint is kept to notice when the catalog, or
+            # the project it is scoped to, no longer matches the entry.
+            if cached and cached.get("catalog") == sc_endpoint:
+                _logger.debug("Using cached %s as %s %s endpoint",
+                              cached["endpoint"], interface, service_type)
+                self.endpoint_cache[key] = cached["endpoint"]
+                self._unverified_endpoints[key] = cache_key
+                return cached["endpoint"]
+
         # NOTE(QianBiao.NG) if we could not get matched endpoint (no matter
         # no response from endpoint or version not matched), we just use
         # service endpoint directly
@@ -348,13 +438,175 @@ class Session(_session.Session):
                           match, interface, service_type)
 
             self.endpoint_cache[key] = match
+            if cache_key is not None:
+                self.discovery_cache.set(cache_key, {"catalog": sc_endpoint,
+                                                     "endpoint": match})
             return match
         except exceptions.EndpointNotFound:
             return sc_endpoint
 
+    def _reuse_auth(self, auth=None):
+        """Give the auth plugin a cached token if it has none"""
+        plugin = auth or self.auth
+        if self.auth_cache is not None and plugin is not None:
+            self.auth_cache.authenticate(plugin, self)
+
+    def get_auth_headers(self, auth=None, **kwargs):
+        self._reuse_auth(auth)
+        return super(Session, self).get_auth_headers(auth, **kwargs)
+
+    def get_project_id(self, auth=None):
+        self._reuse_auth(auth)
+        return super(Session, self).get_project_id(auth)
+
+    def invalidate(self, auth=None):
+        # The token was rejected, so it must not be handed out again.
+        plugin = auth or self.auth
+        if self.auth_cache is not None and plugin is not None:
+            self.auth_cache.invalidate_plugin(plugin)
+        return super(Session, self).invalidate(auth)
+
+    def _get_discovery_cache_key(self, filt):
+        return (getattr(self.auth, "auth_url", None), filt.region,
+                filt.service_type, filt.interface, filt.version)
+
+    def invalidate_endpoint(self, service_type, interface=None):
+        """Forget the endpoint found for a service
+
+        The endpoint is removed from ``endpoint_cache`` and, when it came
+        from there, from the ``discovery_cache``, so that the next request
+        discovers it again.
+        """
+        key = (service_type, interface)
+        self.endpoint_cache.pop(key, None)
+        cache_key = self._unverified_endpoints.pop(key, None)
+        if cache_key is not None:
+            self.discovery_cache.invalidate(cache_key)
+
     @map_exceptions
     def request(self, *args, **kwargs):
         # Fix MRS service require *Content-Type* header in GET request
         headers = kwargs.setdefault('headers', dict())
         headers.setdefault('Content-Type', 'application/json')
-        return super(Session, self).request(*args, **kwargs)
+        if self.coalescer is not None:
+            url = args[0] if args else kwargs.get('url')
+            method = args[1] if len(args) > 1 else kwargs.get('method')
+            key = coalesce.get_key(method, url, kwargs,
+                                   auth=kwargs.get('auth') or self.auth)
+            if key is not None:
+                return self.coalescer.run(
+                    key, lambda: self._retry(*args, **kwargs))
+        return self._retry(*args, **kwargs)
+
+    def _retry(self, *args, **kwargs):
+        """Make a request, retrying it as the retry policy tells"""
+        method = args[1] if len(args) > 1 else kwargs.get('method')
+        endpoint_filter = kwargs.get('endpoint_filter') or {}
+        rate_limit = self.rate_limits.get(
+            endpoint_filter.get('service_type'))
+        attempt = 0
+        while True:
+            try:
+                return self._limit(rate_limit, attempt, *args, **kwargs)
+            except _exceptions.ClientException as e:
+                if self.retry_policy is None:
+                    raise
+                delay = self.retry_policy.get_delay(method, attempt, e,
+                                                    data=kwargs.get('data'))
+                if delay is None:
+                    raise
+                attempt += 1
+                _logger.debug("Retrying %s request in %.2f seconds, "
+                              "attempt %d of %d: %s", method, delay, attempt,
+                              self.retry_policy.retries, e)
+            time.sleep(delay)
+
+    def _limit(self, rate_limit, attempt, *args, **kwargs):
+        """Make a request within the rate limit of its service"""
+        if rate_limit is None:
+            return self._measure(attempt, 0.0, *args, **kwargs)
+
+        queue_wait = rate_limit.acquire()
+        status_code = None
+        try:
+            response = self._measure(attempt, queue_wait, *args, **kwargs)
+            status_code = response.status_code
+            return response
+        except _exceptions.HttpError as e:
+            status_code = e.http_status
+            raise
+        finally:
+            rate_limit.release(status_code)
+
+    def _measure(self, attempt, queue_wait, *args, **kwargs):
+        """Make a request, recording it in metrics if there are any"""
+        if self.metrics is None:
+            return self._request(*args, **kwargs)
+
+        url = args[0] if args else kwargs.get('url')
+        method = args[1] if len(args) > 1 else kwargs.get('method')
+        info = self.metrics.start(url, method,
+                                  endpoint_filter=kwargs.get(
+                                      'endpoint_filter'),
+                                  headers=kwargs.get('headers'),
+                                  attempt=attempt,
+                                  queue_wait=queue_wait)
+        try:
+            response = self._request(*args, **kwargs)
+        except Exception as e:
+            self.metrics.finish(info, response=getattr(e, 'response', None),
+                                error=e)
+            raise
+        self.metrics.finish(info, response=response,
+                            stream=kwargs.get('stream', False))
+        return response
+
+    def _request(self, *args, **kwargs):
+        if self.discovery_cache is None:
+            return super(Session, self).request(*args, **kwargs)
+
+        endpoint_filter = kwargs.get('endpoint_filter')
+        key = None
+        if endpoint_filter and not kwargs.get('endpoint_override'):
+            key = (endpoint_filter.get('service_type'),
+                   endpoint_filter.get('interface'))
+        try:
+            response = super(Session, self).request(*args, **kwargs)
+        except _exceptions.HttpError as e:
+            # A 404 on the first use of a cached endpoint may mean it is
+            # stale, or only that the resource asked for does not exist.
+            # The version root of the endpoint tells them apart.
+            if e.http_status == 404 and key in self._unverified_endpoints:
+                found = self._find_version_root(self.endpoint_cache.get(key))
+                if found is False:
+                    _logger.debug("Invalidating cached %s %s endpoint",
+                                  key[1], key[0])
+                    self.invalidate_endpoint(*key)
+                elif found:
+                    self._unverified_endpoints.pop(key, None)
+            raise
+        self._unverified_endpoints.pop(key, None)
+        return response
+
+    def _find_version_root(self, endpoint):
+        """Whether the version root of an endpoint exists
+
+        :returns: ``True`` or ``False``, or ``None`` when it could not be
+                  told, as the request failed.
+        """
+        if not endpoint:
+            return False
+        parts = parse.urlparse(endpoint)
+        path = parts.path
+        try:
+            project_id = self.get_project_id()
+            if project_id and project_id in path:
+                path = path[:path.find(project_id)]
+            uri = "://".join([parts.scheme, parts.netloc]) + path
+            response = super(Session, self).request(uri, "GET",
+                                                    raise_exc=False)
+        except _exceptions.HttpError as e:
+            return e.http_status != 404
+        except _exceptions.ClientException:
+            return None
+        return response.status_code != 404
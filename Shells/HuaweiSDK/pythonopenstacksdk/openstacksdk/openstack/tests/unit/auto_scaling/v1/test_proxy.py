@@ -185,6 +185,22 @@ class TestAutoScalingConfig(TestAutoScalingProxy):
                                               ]
                                           })
 
+    def test_delete_configs(self):
+        configs = ["config-id-%d" % i for i in range(60)]
+        configs[1] = _config.Config(id="config-id-1")
+
+        results = self.proxy.delete_configs(configs, max_workers=1)
+
+        self.assertEqual(2, self.session.post.call_count)
+        chunks = [c[1]["json"]["scaling_configuration_id"]
+                  for c in self.session.post.call_args_list]
+        self.assertEqual(["config-id-%d" % i for i in range(50)], chunks[0])
+        self.assertEqual(["config-id-%d" % i for i in range(50, 60)],
+                         chunks[1])
+        self.assertEqual(60, len(results))
+        self.assertTrue(all(result.succeeded for result in results))
+        self.assertEqual("config-id-1", results[1].resource.id)
+
 
 class TestAutoScalingGroup(TestAutoScalingProxy):
     def __init__(self, *args, **kwargs):
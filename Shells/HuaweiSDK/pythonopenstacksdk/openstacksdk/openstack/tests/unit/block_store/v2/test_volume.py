@@ -65,6 +65,7 @@ class TestVolume(testtools.TestCase):
         self.assertTrue(sot.allow_update)
         self.assertTrue(sot.allow_delete)
         self.assertTrue(sot.allow_list)
+        self.assertTrue(sot.allow_status_list)
 
         self.assertDictEqual({"name": "name",
                               "status": "status",
@@ -70,6 +70,30 @@ class TestCDNResource(testtools.TestCase):
         self.assertTrue(more)
         self.assertEqual(2, next_page_number)
 
+    def test_get_remaining_pages(self):
+        resp = {'total': 25, 'domains': []}
+        query_params = {'page_size': 10, 'page_number': 1, 'status': 'a'}
+
+        sot = cdn_resource.Resource()
+        remaining = sot.get_remaining_pages(resp, 10, query_params)
+        self.assertEqual([{'page_size': 10, 'page_number': 2, 'status': 'a'},
+                          {'page_size': 10, 'page_number': 3, 'status': 'a'}],
+                         remaining)
+        self.assertEqual(1, query_params['page_number'])
+
+    def test_get_remaining_pages_none_left(self):
+        resp = {'total': 10, 'domains': []}
+        query_params = {'page_size': 10, 'page_number': 1}
+
+        sot = cdn_resource.Resource()
+        self.assertEqual([], sot.get_remaining_pages(resp, 10, query_params))
+
+    def test_get_remaining_pages_not_numbered(self):
+        class Test(cdn_resource.Resource):
+            query_page_number_key = None
+
+        self.assertIsNone(Test.get_remaining_pages({'total': 10}, 1, {}))
+
     def test__translate_response_no_body(self):
         class Test(cdn_resource.Resource):
             attr = resource2.Header("attr")
@@ -147,6 +171,14 @@ class TestCDNResource(testtools.TestCase):
 
         self.assertRaises(InvalidRequest, wrapper, self.session)
 
+    def test_list_stream(self):
+        def wrapper(sess):
+            return list(self.sot.list(sess, stream=True, page_size=10,
+                                      page_number=1))
+
+        self.assertRaises(InvalidRequest, wrapper, self.session)
+        self.session.get.assert_not_called()
+
     # NOTE: As list returns a generator, testing it requires consuming
     # the generator. Wrap calls to self.sot.list in a `list`
     # and then test the results as a list of responses.
@@ -275,6 +307,44 @@ class TestCDNResource(testtools.TestCase):
 
         self.assertRaises(StopIteration, next, results)
 
+    def test_list_parallel(self):
+        pages = {1: [{'id': 1}, {'id': 2}],
+                 2: [{'id': 3}, {'id': 4}],
+                 3: [{'id': 5}]}
+
+        def get(uri, params=None, **kwargs):
+            resp = mock.Mock()
+            resp.json.return_value = {
+                'total': 5, 'resources': pages[params['page_number']]}
+            return resp
+
+        self.session.get.side_effect = get
+
+        results = list(self.sot.list(self.session, paginated=True,
+                                     parallel=2, page_size=2, page_number=1))
+
+        self.assertEqual([1, 2, 3, 4, 5], [r.id for r in results])
+        self.assertEqual(
+            [1, 2, 3],
+            sorted(c[1]['params']['page_number']
+                   for c in self.session.get.call_args_list))
+
+    def test_list_parallel_error(self):
+        resp1 = mock.Mock()
+        resp1.json.return_value = {'total': 2,
+                                   'resources': [{'id': 1}]}
+        resp2 = mock.Mock()
+        resp2.json.return_value = {'error': {'error_code': 'CDN.0001',
+                                             'error_msg': 'msg'}}
+
+        self.session.get.side_effect = [resp1, resp2]
+
+        results = self.sot.list(self.session, paginated=True, parallel=4,
+                                page_size=1, page_number=1)
+
+        self.assertEqual(1, next(results).id)
+        self.assertRaises(CDNException, next, results)
+
 
 class TestQueryParameters(testtools.TestCase):
     def test_basic(self):
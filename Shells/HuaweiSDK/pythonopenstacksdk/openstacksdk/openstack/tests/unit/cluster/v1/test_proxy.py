@@ -506,17 +506,21 @@ class TestClusterProxy(test_proxy_base2.TestProxyBase):
         self.proxy.wait_for_status(mock_resource, 'ACTIVE')
 
         mock_wait.assert_called_once_with(self.session, mock_resource,
-                                          'ACTIVE', [], 2, 120)
+                                          'ACTIVE', [], 2, 120, policy=None)
 
     @mock.patch("openstack.resource2.wait_for_status")
     def test_wait_for_params(self, mock_wait):
         mock_resource = mock.Mock()
         mock_wait.return_value = mock_resource
 
-        self.proxy.wait_for_status(mock_resource, 'ACTIVE', ['ERROR'], 1, 2)
+        policy = mock.Mock()
+
+        self.proxy.wait_for_status(mock_resource, 'ACTIVE', ['ERROR'], 1, 2,
+                                   policy)
 
         mock_wait.assert_called_once_with(self.session, mock_resource,
-                                          'ACTIVE', ['ERROR'], 1, 2)
+                                          'ACTIVE', ['ERROR'], 1, 2,
+                                          policy=policy)
 
     @mock.patch("openstack.resource2.wait_for_delete")
     def test_wait_for_delete(self, mock_wait):
@@ -525,13 +529,17 @@ class TestClusterProxy(test_proxy_base2.TestProxyBase):
 
         self.proxy.wait_for_delete(mock_resource)
 
-        mock_wait.assert_called_once_with(self.session, mock_resource, 2, 120)
+        mock_wait.assert_called_once_with(self.session, mock_resource, 2, 120,
+                                          policy=None)
 
     @mock.patch("openstack.resource2.wait_for_delete")
     def test_wait_for_delete_params(self, mock_wait):
         mock_resource = mock.Mock()
         mock_wait.return_value = mock_resource
 
-        self.proxy.wait_for_delete(mock_resource, 1, 2)
+        policy = mock.Mock()
+
+        self.proxy.wait_for_delete(mock_resource, 1, 2, policy)
 
-        mock_wait.assert_called_once_with(self.session, mock_resource, 1, 2)
+        mock_wait.assert_called_once_with(self.session, mock_resource, 1, 2,
+                                          policy=policy)
@@ -202,12 +202,19 @@ class TestComputeProxy(test_proxy_base2.TestProxyBase):
     def test_server_create_attrs(self):
         self.verify_create(self.proxy.create_server, server.Server)
 
+    def test_servers_create(self):
+        self.verify_bulk_create(self.proxy.create_servers, server.Server)
+
     def test_server_delete(self):
         self.verify_delete(self.proxy.delete_server, server.Server, False)
 
     def test_server_delete_ignore(self):
         self.verify_delete(self.proxy.delete_server, server.Server, True)
 
+    def test_servers_delete(self):
+        self.verify_bulk_delete(self.proxy.delete_servers, server.Server,
+                                False)
+
     def test_server_force_delete(self):
         self._verify("openstack.compute.v2.server.Server.force_delete",
                      self.proxy.delete_server,
@@ -242,7 +249,8 @@ class TestComputeProxy(test_proxy_base2.TestProxyBase):
         self.verify_wait_for_status(
             self.proxy.wait_for_server,
             method_args=[value],
-            expected_args=[value, 'ACTIVE', ['ERROR'], 2, 120])
+            expected_args=[value, 'ACTIVE', ['ERROR'], 2, 120],
+            expected_kwargs={'policy': None})
 
     def test_server_resize(self):
         self._verify("openstack.compute.v2.server.Server.resize",
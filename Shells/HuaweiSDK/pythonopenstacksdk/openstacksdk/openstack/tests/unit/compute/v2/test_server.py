@@ -78,6 +78,7 @@ class TestServer(testtools.TestCase):
         self.assertTrue(sot.allow_update)
         self.assertTrue(sot.allow_delete)
         self.assertTrue(sot.allow_list)
+        self.assertTrue(sot.allow_status_list)
 
         self.assertDictEqual({"image": "image",
                               "flavor": "flavor",
@@ -161,6 +162,13 @@ class TestServer(testtools.TestCase):
         self.assertFalse(sot.allow_delete)
         self.assertTrue(sot.allow_list)
 
+    def test_list_statuses(self):
+        with mock.patch.object(server.ServerDetail, "list") as mock_list:
+            result = server.Server.list_statuses(self.sess)
+
+        self.assertEqual(mock_list.return_value, result)
+        mock_list.assert_called_once_with(self.sess, paginated=True)
+
     def test__prepare_server(self):
         zone = 1
         data = 2
@@ -14,6 +14,7 @@ import mock
 import testtools
 
 from openstack.dms.v1 import queue
+from openstack import exceptions
 
 EXAMPLE = {
     "id": "9bf46390-38a2-462d-b392-4d5b2d519c55",
@@ -76,6 +77,13 @@ class TestQueue(testtools.TestCase):
         self.assertEqual(self.example['produced_messages'],
                          sot.produced_messages)
 
+    def test_list_stream(self):
+        sess = mock.Mock()
+
+        self.assertRaises(exceptions.InvalidRequest, list,
+                          self.objcls.list(sess, stream=True))
+        sess.get.assert_not_called()
+
 
 class TestGroup(testtools.TestCase):
 
@@ -150,3 +158,13 @@ class TestMessageConsume(testtools.TestCase):
         sot = self.objcls(**self.example)
         self.assertEqual(self.example['message'], sot.message)
         self.assertEqual(self.example['handler'], sot.handler)
+
+
+class TestQuota(testtools.TestCase):
+
+    def test_list_stream(self):
+        sess = mock.Mock()
+
+        self.assertRaises(exceptions.InvalidRequest, list,
+                          queue.Quota.list(sess, stream=True))
+        sess.get.assert_not_called()
@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import mock
+
 from openstack.dns import dns_service
 from openstack.dns.v2 import _proxy
 from openstack.dns.v2 import ptr as _ptr
@@ -311,6 +313,38 @@ class TestRecordset(TestDNSProxy):
                                     _recordset.Recordset(id="recordset-id"))
         self.assert_session_delete("zones/zone-id/recordsets/recordset-id")
 
+    def test_delete_recordsets(self):
+        results = self.proxy.delete_recordsets(
+            "zone-id", ["recordset-1", _recordset.Recordset(id="recordset-2")],
+            max_workers=1)
+
+        self.assertEqual(
+            ["zones/zone-id/recordsets/recordset-1",
+             "zones/zone-id/recordsets/recordset-2"],
+            [c[0][0] for c in self.session.delete.call_args_list])
+        self.assertEqual(["recordset-1", "recordset-2"],
+                         [result.resource.id for result in results])
+
+    def test_create_recordsets(self):
+        self.mock_response_json_file_values(
+            "create_recordset_response.json")
+        data = [{"name": "www.example.com.", "type": "A"},
+                {"name": "mail.example.com.", "type": "A"}]
+
+        results = self.proxy.create_recordsets("zone-id", data,
+                                               max_workers=1)
+
+        self.assertEqual(
+            [mock.call("/zones/zone-id/recordsets",
+                       endpoint_filter=self.service,
+                       endpoint_override=self.service.get_endpoint_override(),
+                       headers={}, json=attrs)
+             for attrs in data],
+            self.session.post.call_args_list)
+        self.assertEqual([dict(attrs, zone_id="zone-id") for attrs in data],
+                         [result.value for result in results])
+        self.assertIsInstance(results[0].resource, _recordset.Recordset)
+
 
 class TestPTR(TestDNSProxy):
     def __init__(self, *args, **kwargs):
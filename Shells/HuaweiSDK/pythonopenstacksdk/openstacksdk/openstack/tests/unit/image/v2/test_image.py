@@ -10,15 +10,20 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import io
 import json
+import os
 
+import fixtures
 import mock
+import requests
 import testtools
 
 from openstack import exceptions
 from openstack.image.v2 import image
 
 IDENTIFIER = 'IDENTIFIER'
+MD5_ABC = "900150983cd24fb0d6963f7d28e17f72"
 EXAMPLE = {
     'id': IDENTIFIER,
     'checksum': '1',
@@ -195,14 +200,22 @@ class TestImage(testtools.TestCase):
 
     def test_upload(self):
         sot = image.Image(**EXAMPLE)
+        sot.data = "abc"
+        sent = []
+        self.sess.put.side_effect = (
+            lambda *args, **kwargs: sent.extend(kwargs["data"]))
+
+        rv = sot.upload(self.sess)
 
-        self.assertIsNone(sot.upload(self.sess))
         self.sess.put.assert_called_with('images/IDENTIFIER/file',
                                          endpoint_filter=sot.service,
-                                         data=sot.data,
+                                         data=mock.ANY,
                                          headers={"Content-Type":
                                                   "application/octet-stream",
-                                                  "Accept": ""})
+                                                  "Accept": ""},
+                                         endpoint_override=None)
+        self.assertEqual([b"abc"], sent)
+        self.assertEqual(MD5_ABC, rv.checksum)
 
     def test_download_checksum_match(self):
         sot = image.Image(**EXAMPLE)
@@ -330,3 +343,224 @@ class TestImage(testtools.TestCase):
         call_args, call_kwargs = call
         self.assertEqual(url, call_args[0])
         self.assertEqual(json.loads(value), json.loads(call_kwargs['data']))
+
+
+class TestImageUpload(testtools.TestCase):
+
+    def setUp(self):
+        super(TestImageUpload, self).setUp()
+        self.sent = []
+        self.sess = mock.Mock()
+        self.sess.put.side_effect = (
+            lambda *args, **kwargs: self.sent.extend(kwargs["data"]))
+
+    def _upload(self, data, **kwargs):
+        sot = image.Image(id=IDENTIFIER)
+        sot.data = data
+        return sot.upload(self.sess, **kwargs)
+
+    def test_bytes(self):
+        rv = self._upload(b"abc", chunk_size=2)
+
+        self.assertEqual([b"ab", b"c"], self.sent)
+        self.assertEqual(3, rv.sent)
+        self.assertEqual(3, rv.total)
+        self.assertEqual(MD5_ABC, rv.checksum)
+
+    def test_file_object(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            "image")
+        with open(path, "wb") as fileobj:
+            fileobj.write(b"abc")
+
+        with open(path, "rb") as fileobj:
+            rv = self._upload(fileobj, chunk_size=2)
+
+        self.assertEqual([b"ab", b"c"], self.sent)
+        self.assertEqual(3, rv.total)
+        self.assertEqual(MD5_ABC, rv.checksum)
+
+    def test_stream(self):
+        rv = self._upload(io.BytesIO(b"abc"), chunk_size=1)
+
+        self.assertEqual([b"a", b"b", b"c"], self.sent)
+        self.assertEqual(MD5_ABC, rv.checksum)
+
+    def test_generator(self):
+        rv = self._upload((chunk for chunk in [b"a", b"bc"]), chunk_size=1)
+
+        # Chunks of iterables are sent as they are.
+        self.assertEqual([b"a", b"bc"], self.sent)
+        self.assertIsNone(rv.total)
+        self.assertEqual(3, rv.sent)
+        self.assertEqual(MD5_ABC, rv.checksum)
+
+    def test_progress(self):
+        progress = mock.Mock()
+        sent = []
+        progress.side_effect = lambda upload: sent.append(upload.sent)
+
+        rv = self._upload(b"abc", chunk_size=2, progress=progress)
+
+        self.assertEqual([2, 3], sent)
+        progress.assert_called_with(rv)
+        self.assertIsNotNone(rv.finished)
+        self.assertGreaterEqual(rv.rate, 0)
+
+
+def _data_response(chunks, status_code=200, headers=None, error=None):
+    resp = mock.Mock()
+    resp.status_code = status_code
+    resp.headers = headers or {}
+
+    def iter_content(chunk_size):
+        for chunk in chunks:
+            yield chunk
+        if error is not None:
+            raise error
+
+    resp.iter_content = iter_content
+    return resp
+
+
+class TestImageDownloadTo(testtools.TestCase):
+
+    def setUp(self):
+        super(TestImageDownloadTo, self).setUp()
+        self.sess = mock.Mock()
+        self.sot = image.Image(id=IDENTIFIER, checksum=MD5_ABC)
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 "image")
+
+    def _read(self):
+        with open(self.path, "rb") as fileobj:
+            return fileobj.read()
+
+    def _write(self, data):
+        with open(self.path, "wb") as fileobj:
+            fileobj.write(data)
+
+    def _range(self, call):
+        return call[1]["headers"].get("Range")
+
+    def test_path(self):
+        resp = _data_response([b"a", b"bc"],
+                              headers={"Content-MD5": MD5_ABC})
+        self.sess.get.return_value = resp
+        sot = image.Image(id=IDENTIFIER)
+
+        rv = sot.download(self.sess, output=self.path, chunk_size=2)
+
+        self.assertEqual(self.path, rv)
+        self.assertEqual(b"abc", self._read())
+        self.sess.get.assert_called_once_with(
+            'images/IDENTIFIER/file', endpoint_filter=sot.service,
+            stream=True, headers={}, endpoint_override=None)
+        resp.close.assert_called_once_with()
+
+    def test_file_object_known_checksum(self):
+        self.sess.get.return_value = _data_response([b"abc"])
+        output = io.BytesIO()
+
+        rv = self.sot.download(self.sess, output=output)
+
+        self.assertIs(output, rv)
+        self.assertEqual(b"abc", output.getvalue())
+        # The checksum of the image is used, without getting it again.
+        self.assertEqual(1, self.sess.get.call_count)
+
+    def test_checksum_fetched(self):
+        data = _data_response([b"abc"])
+        details = mock.Mock()
+        details.headers = {}
+        details.json.return_value = {"checksum": MD5_ABC}
+        self.sess.get.side_effect = [data, details]
+
+        image.Image(id=IDENTIFIER).download(self.sess, output=self.path)
+
+        self.assertEqual(2, self.sess.get.call_count)
+
+    def test_checksum_mismatch(self):
+        self.sess.get.return_value = _data_response(
+            [b"abd"], headers={"Content-MD5": MD5_ABC})
+
+        self.assertRaises(exceptions.InvalidResponse, self.sot.download,
+                          self.sess, output=self.path)
+
+    def test_interrupted(self):
+        self.sess.get.return_value = _data_response(
+            [b"ab"], error=requests.exceptions.ChunkedEncodingError())
+
+        self.assertRaises(exceptions.InvalidResponse, self.sot.download,
+                          self.sess, output=self.path)
+        self.assertEqual(1, self.sess.get.call_count)
+
+    def test_resume_interrupted(self):
+        self.sess.get.side_effect = [
+            _data_response([b"ab"],
+                           error=requests.exceptions.ConnectionError()),
+            _data_response([b"c"], status_code=206)]
+
+        self.sot.download(self.sess, output=self.path, resume=True)
+
+        self.assertEqual(b"abc", self._read())
+        calls = self.sess.get.call_args_list
+        self.assertIsNone(self._range(calls[0]))
+        self.assertEqual("bytes=2-", self._range(calls[1]))
+
+    def test_resume_short_read(self):
+        self.sess.get.side_effect = [
+            _data_response([b"a"], headers={"Content-Length": "3"}),
+            _data_response([b"bc"], status_code=206,
+                           headers={"Content-Length": "2"})]
+
+        self.sot.download(self.sess, output=self.path, resume=True)
+
+        self.assertEqual(b"abc", self._read())
+        self.assertEqual("bytes=1-",
+                         self._range(self.sess.get.call_args_list[1]))
+
+    def test_resume_attempts(self):
+        error = requests.exceptions.ConnectionError()
+        self.sess.get.side_effect = [
+            _data_response([], error=error)
+            for _ in range(image.DEFAULT_RESUME_ATTEMPTS + 1)]
+
+        self.assertRaises(exceptions.InvalidResponse, self.sot.download,
+                          self.sess, output=self.path, resume=True)
+        self.assertEqual(image.DEFAULT_RESUME_ATTEMPTS + 1,
+                         self.sess.get.call_count)
+
+    def test_resume_file(self):
+        self._write(b"ab")
+        self.sess.get.return_value = _data_response([b"c"], status_code=206)
+
+        self.sot.download(self.sess, output=self.path, resume=True)
+
+        self.assertEqual(b"abc", self._read())
+        self.assertEqual("bytes=2-", self._range(self.sess.get.call_args))
+
+    def test_resume_file_range_ignored(self):
+        self._write(b"xy")
+        self.sess.get.return_value = _data_response([b"abc"])
+
+        self.sot.download(self.sess, output=self.path, resume=True)
+
+        self.assertEqual(b"abc", self._read())
+
+    def test_resume_file_complete(self):
+        self._write(b"abc")
+        self.sess.get.side_effect = exceptions.HttpException(http_status=416)
+
+        self.sot.download(self.sess, output=self.path, resume=True)
+
+        self.assertEqual(b"abc", self._read())
+
+    def test_overwrite_file(self):
+        self._write(b"xyz")
+        self.sess.get.return_value = _data_response([b"abc"])
+
+        self.sot.download(self.sess, output=self.path)
+
+        self.assertEqual(b"abc", self._read())
+        self.assertEqual({}, self.sess.get.call_args[1]["headers"])
@@ -47,9 +47,39 @@ class TestImageProxy(test_proxy_base2.TestProxyBase):
                                               container_format="x",
                                               disk_format="y",
                                               name="z")
-        created_image.upload.assert_called_with(self.session)
+        created_image.upload.assert_called_with(
+            self.session, chunk_size=image.DEFAULT_CHUNK_SIZE, progress=None)
         self.assertEqual(rv, created_image)
 
+    def test_image_create_filename(self):
+        created_image = mock.Mock(spec=image.Image(id="id"))
+        self.proxy._create = mock.Mock(return_value=created_image)
+        progress = mock.Mock()
+        uploaded = []
+        created_image.upload.side_effect = (
+            lambda *args, **kwargs: uploaded.append(created_image.data.read()))
+
+        with mock.patch("openstack.image.v2._proxy.open",
+                        mock.mock_open(read_data=b"data"), create=True) as m:
+            self.proxy.upload_image(filename="image.qcow2", chunk_size=2,
+                                    progress=progress, container_format="x",
+                                    disk_format="y")
+
+        m.assert_called_once_with("image.qcow2", "rb")
+        self.assertEqual([b"data"], uploaded)
+        created_image.upload.assert_called_with(
+            self.session, chunk_size=2, progress=progress)
+
+    def test_image_download(self):
+        self._verify("openstack.image.v2.image.Image.download",
+                     self.proxy.download_image,
+                     method_args=["image"],
+                     method_kwargs={"output": "path", "chunk_size": 10,
+                                    "resume": True},
+                     expected_kwargs={"stream": False, "output": "path",
+                                      "chunk_size": 10, "resume": True},
+                     expected_result="path")
+
     def test_image_delete(self):
         self.verify_delete(self.proxy.delete_image, image.Image, False)
 
@@ -14,6 +14,8 @@ import hashlib
 import mock
 
 from openstack.kms.v1 import _proxy
+from openstack.kms.v1 import key as _key
+from openstack import resource_cache
 from openstack.tests.unit import test_proxy_base2
 
 
@@ -42,6 +44,21 @@ class TestKMSProxy(test_proxy_base2.TestProxyBase):
                       expected_args=[mock.ANY],
                       expected_kwargs={'key_id': 'key'})
 
+    @mock.patch.object(_key.Key, 'describe')
+    def test_describe_key_cached(self, mock_describe):
+        mock_describe.return_value = _key.Key.existing(key_id='key')
+        self.proxy = _proxy.Proxy(
+            self.session, resource_cache=resource_cache.ResourceCache())
+
+        self.proxy.describe_key('key', sequence='1')
+        self.proxy.describe_key('key', sequence='2')
+        self.assertEqual(1, mock_describe.call_count)
+
+        with mock.patch.object(_key.Key, 'disable'):
+            self.proxy.disable_key('key')
+        self.proxy.describe_key('key')
+        self.assertEqual(2, mock_describe.call_count)
+
     def test_keys(self):
         self._verify2('openstack.kms.v1.key.Key.list',
                       self.proxy.keys,
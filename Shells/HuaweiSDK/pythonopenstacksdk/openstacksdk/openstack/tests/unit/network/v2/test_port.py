@@ -70,6 +70,8 @@ class TestPort(testtools.TestCase):
         self.assertTrue(sot.allow_update)
         self.assertTrue(sot.allow_delete)
         self.assertTrue(sot.allow_list)
+        self.assertTrue(sot.allow_bulk_create)
+        self.assertEqual(100, sot.bulk_size)
 
     def test_make_it(self):
         sot = port.Port(**EXAMPLE)
@@ -149,6 +149,10 @@ class TestNetworkProxy(test_proxy_base2.TestProxyBase):
         self.verify_delete(self.proxy.delete_ip, floating_ip.FloatingIP,
                            True)
 
+    def test_floating_ips_delete(self):
+        self.verify_bulk_delete(self.proxy.delete_ips,
+                                floating_ip.FloatingIP, False)
+
     def test_floating_ip_find(self):
         self.verify_find(self.proxy.find_ip, floating_ip.FloatingIP)
 
@@ -446,12 +450,28 @@ class TestNetworkProxy(test_proxy_base2.TestProxyBase):
     def test_port_create_attrs(self):
         self.verify_create(self.proxy.create_port, port.Port)
 
+    def test_ports_create(self):
+        self.verify_bulk_create(self.proxy.create_ports, port.Port,
+                                expected_kwargs={"bulk_size": None})
+
+    def test_ports_create_bulk_size(self):
+        data = [{"x": 1}]
+        self._verify2("openstack.proxy2.BaseProxy._bulk_create",
+                      self.proxy.create_ports,
+                      method_args=[data],
+                      method_kwargs={"bulk_size": 10},
+                      expected_args=[port.Port, data],
+                      expected_kwargs={"bulk_size": 10, "max_workers": 8})
+
     def test_port_delete(self):
         self.verify_delete(self.proxy.delete_port, port.Port, False)
 
     def test_port_delete_ignore(self):
         self.verify_delete(self.proxy.delete_port, port.Port, True)
 
+    def test_ports_delete(self):
+        self.verify_bulk_delete(self.proxy.delete_ports, port.Port, True)
+
     def test_port_find(self):
         self.verify_find(self.proxy.find_port, port.Port)
 
@@ -854,6 +874,10 @@ class TestNetworkProxy(test_proxy_base2.TestProxyBase):
         self.verify_delete(self.proxy.delete_security_group,
                            security_group.SecurityGroup, True)
 
+    def test_security_groups_delete(self):
+        self.verify_bulk_delete(self.proxy.delete_security_groups,
+                                security_group.SecurityGroup, True)
+
     def test_security_group_find(self):
         self.verify_find(self.proxy.find_security_group,
                          security_group.SecurityGroup)
@@ -918,6 +942,11 @@ class TestNetworkProxy(test_proxy_base2.TestProxyBase):
         self.verify_create(self.proxy.create_security_group_rule,
                            security_group_rule.SecurityGroupRule)
 
+    def test_security_group_rules_create(self):
+        self.verify_bulk_create(self.proxy.create_security_group_rules,
+                                security_group_rule.SecurityGroupRule,
+                                expected_kwargs={"bulk_size": None})
+
     def test_security_group_rule_delete(self):
         self.verify_delete(self.proxy.delete_security_group_rule,
                            security_group_rule.SecurityGroupRule, False)
@@ -926,6 +955,10 @@ class TestNetworkProxy(test_proxy_base2.TestProxyBase):
         self.verify_delete(self.proxy.delete_security_group_rule,
                            security_group_rule.SecurityGroupRule, True)
 
+    def test_security_group_rules_delete(self):
+        self.verify_bulk_delete(self.proxy.delete_security_group_rules,
+                                security_group_rule.SecurityGroupRule, False)
+
     def test_security_group_rule_find(self):
         self.verify_find(self.proxy.find_security_group_rule,
                          security_group_rule.SecurityGroupRule)
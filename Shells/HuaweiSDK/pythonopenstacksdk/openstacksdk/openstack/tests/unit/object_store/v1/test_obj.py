@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import json
+
 import mock
 import testtools
 
@@ -117,6 +119,50 @@ class TestObject(testtools.TestCase):
                                          headers=headers)
         self.assertEqual(self.resp.content, rv)
 
+    def test_stream(self):
+        sot = obj.Object.new(container=CONTAINER_NAME, name=OBJECT_NAME)
+
+        rv = sot.stream(self.sess)
+
+        url = "%s/%s" % (CONTAINER_NAME, OBJECT_NAME)
+        self.sess.get.assert_called_with(url, endpoint_filter=sot.service,
+                                         headers={'Accept': 'bytes'},
+                                         stream=True)
+        self.assertEqual(self.resp, rv)
+
+    def test_stream_range(self):
+        sot = obj.Object.new(container=CONTAINER_NAME, name=OBJECT_NAME)
+
+        sot.stream(self.sess, 10, 19)
+        self.assertEqual("bytes=10-19",
+                         self.sess.get.call_args[1]["headers"]["Range"])
+
+        sot.stream(self.sess, start=10)
+        self.assertEqual("bytes=10-",
+                         self.sess.get.call_args[1]["headers"]["Range"])
+
+    def test_stream_if_match(self):
+        sot = obj.Object.new(container=CONTAINER_NAME, name=OBJECT_NAME)
+
+        sot.stream(self.sess, 10, 19, if_match="abc")
+
+        headers = self.sess.get.call_args[1]["headers"]
+        self.assertEqual("abc", headers["If-Match"])
+        self.assertEqual("bytes=10-19", headers["Range"])
+
+    def test_create_manifest(self):
+        sot = obj.Object.new(container=CONTAINER_NAME, name=OBJECT_NAME)
+        segments = [{"path": "/segs/1", "etag": "abc", "size_bytes": 3}]
+
+        rv = sot.create_manifest(self.sess, segments)
+
+        url = "%s/%s" % (CONTAINER_NAME, OBJECT_NAME)
+        self.sess.put.assert_called_with(
+            url, endpoint_filter=sot.service,
+            params={"multipart-manifest": "put"},
+            data=json.dumps(segments), headers={"Accept": ""})
+        self.assertEqual(self.resp.headers, rv.get_headers())
+
     def _test_create(self, method, data, accept):
         sot = obj.Object.new(container=CONTAINER_NAME, name=OBJECT_NAME,
                              data=data)
@@ -13,6 +13,7 @@
 import mock
 import six
 
+from openstack import exceptions
 from openstack.object_store.v1 import _proxy
 from openstack.object_store.v1 import account
 from openstack.object_store.v1 import container
@@ -254,24 +255,72 @@ class Test_objects(TestObjectStoreProxy):
 
 class Test_download_object(TestObjectStoreProxy):
 
-    @mock.patch("openstack.object_store.v1._proxy.Proxy.get_object")
-    def test_download(self, mock_get):
-        the_data = "here's some data"
-        mock_get.return_value = the_data
-        ob = mock.Mock()
-
-        fake_open = mock.mock_open()
+    @mock.patch("openstack.object_store.v1.transfer.TransferManager")
+    def test_download(self, mock_manager):
+        ob = obj.Object.new(container="tainer", name="ob")
         file_path = "blarga/somefile"
-        with mock.patch("openstack.object_store.v1._proxy.open",
-                        fake_open, create=True):
-            self.proxy.download_object(ob, container="tainer", path=file_path)
 
-        fake_open.assert_called_once_with(file_path, "w")
-        fake_handle = fake_open()
-        fake_handle.write.assert_called_once_with(the_data)
+        self.proxy.download_object(ob, path=file_path, segment_size=10,
+                                   max_workers=2, chunk_size=5)
+
+        mock_manager.assert_called_once_with(
+            self.session, max_workers=2, segment_size=10, chunk_size=5)
+        mock_manager.return_value.download.assert_called_once_with(
+            "tainer", "ob", file_path)
+
+    @mock.patch("openstack.object_store.v1.transfer.TransferManager")
+    def test_download_not_found(self, mock_manager):
+        mock_manager.return_value.download.side_effect = (
+            exceptions.NotFoundException(http_status=404))
+
+        self.assertRaises(exceptions.ResourceNotFound,
+                          self.proxy.download_object, "ob",
+                          container="tainer", path="somefile")
+
+
+class Test_upload_large_object(TestObjectStoreProxy):
+
+    @mock.patch("openstack.object_store.v1.transfer.TransferManager")
+    def test_upload(self, mock_manager):
+        upload = mock_manager.return_value.upload
+        upload.return_value = "result"
+
+        rv = self.proxy.upload_large_object(
+            container.Container.new(name="tainer"), "ob", "somefile",
+            segment_size=10, segment_container="segs", use_slo=False,
+            max_workers=2, chunk_size=5, content_type="text/plain")
+
+        self.assertEqual("result", rv)
+        mock_manager.assert_called_once_with(
+            self.session, max_workers=2, segment_size=10, chunk_size=5)
+        upload.assert_called_once_with("tainer", "ob", "somefile",
+                                       segment_container="segs",
+                                       use_slo=False,
+                                       content_type="text/plain")
 
 
 class Test_copy_object(TestObjectStoreProxy):
 
-    def test_copy_object(self):
-        self.assertRaises(NotImplementedError, self.proxy.copy_object)
+    @mock.patch("openstack.object_store.v1.transfer.TransferManager")
+    def test_copy_object(self, mock_manager):
+        copy = mock_manager.return_value.copy
+        copy.return_value = "result"
+
+        rv = self.proxy.copy_object("ob", container="tainer",
+                                    destination_container="other",
+                                    destination_name="copy",
+                                    content_type="text/plain")
+
+        self.assertEqual("result", rv)
+        copy.assert_called_once_with("tainer", "ob", "other",
+                                     destination_name="copy",
+                                     content_type="text/plain")
+
+    @mock.patch("openstack.object_store.v1.transfer.TransferManager")
+    def test_copy_object_same_container(self, mock_manager):
+        ob = obj.Object.new(container="tainer", name="ob")
+
+        self.proxy.copy_object(ob, destination_name="copy")
+
+        mock_manager.return_value.copy.assert_called_once_with(
+            "tainer", "ob", "tainer", destination_name="copy")
@@ -0,0 +1,324 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import hashlib
+import json
+import os
+import threading
+
+import fixtures
+import mock
+import requests
+from requests import structures
+import six
+import testtools
+
+from openstack import exceptions
+from openstack.object_store.v1 import transfer
+
+
+class FakeObjectStore(object):
+    """A session storing objects in memory"""
+
+    def __init__(self):
+        self.objects = {}
+        self.containers = set()
+        self.requests = []
+        self.failures = []
+        self._lock = threading.Lock()
+
+    def _response(self, status_code=200, headers=None, data=b""):
+        resp = mock.Mock()
+        resp.status_code = status_code
+        resp.headers = structures.CaseInsensitiveDict(headers or {})
+        resp.json.return_value = {}
+
+        def iter_content(chunk_size):
+            for start in range(0, len(data), chunk_size):
+                yield data[start:start + chunk_size]
+
+        resp.iter_content = iter_content
+        return resp
+
+    def _fail(self, method, url):
+        url = url.lstrip("/")
+        with self._lock:
+            self.requests.append((method, url))
+            for failure in self.failures:
+                if failure[0] == method and failure[1] == url:
+                    self.failures.remove(failure)
+                    raise failure[2]
+
+    def put(self, url, endpoint_filter, headers=None, data=None,
+            params=None):
+        if isinstance(data, six.text_type):
+            data = data.encode("utf-8")
+        elif data is not None and not isinstance(data, bytes):
+            data = b"".join(data)
+        self._fail("PUT", url)
+        url = url.lstrip("/")
+        headers = structures.CaseInsensitiveDict(headers or {})
+        if "/" not in url:
+            self.containers.add(url)
+            return self._response(201)
+        if params == {"multipart-manifest": "put"}:
+            segments = json.loads(data)
+            data = b"".join(self.objects[segment["path"].lstrip("/")][0]
+                            for segment in segments)
+            headers["x-static-large-object"] = "True"
+        elif "x-copy-from" in headers:
+            data = self.objects[headers["x-copy-from"]][0]
+        self.objects[url] = (data, headers)
+        return self._response(201, {"etag": hashlib.md5(data).hexdigest()})
+
+    def head(self, url, endpoint_filter, headers=None):
+        self._fail("HEAD", url)
+        data, headers = self.objects[url]
+        headers = dict(headers, etag=hashlib.md5(data).hexdigest())
+        headers["content-length"] = len(data)
+        return self._response(headers=headers)
+
+    def get(self, url, endpoint_filter, headers=None, stream=False):
+        self._fail("GET", url)
+        data, _ = self.objects[url]
+        etag = hashlib.md5(data).hexdigest()
+        if_match = (headers or {}).get("If-Match")
+        if if_match is not None and if_match != etag:
+            raise exceptions.HttpException(http_status=412)
+        byte_range = (headers or {}).get("Range")
+        if byte_range is None:
+            return self._response(200, {"etag": etag}, data)
+        start, end = byte_range[len("bytes="):].split("-")
+        return self._response(206, {"etag": etag},
+                              data[int(start):int(end) + 1])
+
+    def delete(self, url, endpoint_filter, headers=None):
+        self._fail("DELETE", url)
+        del self.objects[url.lstrip("/")]
+        return self._response(204)
+
+
+class TestTransferManager(testtools.TestCase):
+
+    def setUp(self):
+        super(TestTransferManager, self).setUp()
+        self.dir = self.useFixture(fixtures.TempDir()).path
+        self.store = FakeObjectStore()
+        self.manager = transfer.TransferManager(
+            self.store, max_workers=3, segment_size=4, chunk_size=3,
+            retry_interval=0)
+        self.data = b"0123456789"
+        self.path = os.path.join(self.dir, "data")
+        with open(self.path, "wb") as fileobj:
+            fileobj.write(self.data)
+
+    def _read(self, path):
+        with open(path, "rb") as fileobj:
+            return fileobj.read()
+
+    def _segments(self):
+        return sorted(url for url in self.store.objects
+                      if url.startswith("c_segments/"))
+
+    def test_upload_small(self):
+        self.manager.segment_size = 10
+
+        ob = self.manager.upload("c", "o", self.path)
+
+        self.assertEqual(self.data, self.store.objects["c/o"][0])
+        self.assertEqual(hashlib.md5(self.data).hexdigest(), ob.etag)
+        self.assertEqual([], self._segments())
+
+    def test_upload_slo(self):
+        self.manager.upload("c", "o", self.path, content_type="text/plain")
+
+        self.assertEqual({"c_segments"}, self.store.containers)
+        segments = self._segments()
+        self.assertEqual(3, len(segments))
+        self.assertEqual([b"0123", b"4567", b"89"],
+                         [self.store.objects[url][0] for url in segments])
+        self.assertTrue(segments[0].startswith("c_segments/o/slo/"))
+        data, headers = self.store.objects["c/o"]
+        self.assertEqual(self.data, data)
+        self.assertEqual("text/plain", headers["content-type"])
+
+    def test_upload_dlo(self):
+        self.manager.upload("c", "o", self.path, segment_container="segs",
+                            use_slo=False)
+
+        self.assertEqual({"segs"}, self.store.containers)
+        data, headers = self.store.objects["c/o"]
+        self.assertEqual(b"", data)
+        prefix = headers["x-object-manifest"]
+        self.assertTrue(prefix.startswith("segs/o/dlo/"))
+        self.assertEqual(3, len([url for url in self.store.objects
+                                 if url.startswith(prefix)]))
+
+    def test_upload_retries_segment(self):
+        self.manager.upload("c", "o", self.path)
+        segment = self._segments()[1]
+        self.store.objects.clear()
+        self.store.requests = []
+        self.store.failures.append(
+            ("PUT", segment, exceptions.HttpException(http_status=503)))
+
+        self.manager.upload("c", "o", self.path)
+
+        self.assertEqual(self.data, self.store.objects["c/o"][0])
+        self.assertEqual(2, self.store.requests.count(("PUT", segment)))
+        self.assertEqual(1, self.store.requests.count(("PUT", "c/o")))
+
+    def test_upload_client_error_not_retried(self):
+        self.store.failures.append(
+            ("PUT", "c/o", exceptions.HttpException(http_status=401)))
+        self.manager.segment_size = 10
+
+        self.assertRaises(exceptions.HttpException, self.manager.upload,
+                          "c", "o", self.path)
+        self.assertEqual(1, self.store.requests.count(("PUT", "c/o")))
+
+    def test_upload_retries_exhausted(self):
+        self.manager.segment_size = 10
+        for _ in range(self.manager.retries + 1):
+            self.store.failures.append(
+                ("PUT", "c/o", requests.exceptions.ConnectionError()))
+
+        self.assertRaises(requests.exceptions.ConnectionError,
+                          self.manager.upload, "c", "o", self.path)
+        self.assertEqual(self.manager.retries + 1,
+                         self.store.requests.count(("PUT", "c/o")))
+
+    def test_upload_failure_deletes_segments(self):
+        self.manager.upload("c", "o", self.path)
+        segment = self._segments()[2]
+        self.store.objects.clear()
+        for _ in range(self.manager.retries + 1):
+            self.store.failures.append(
+                ("PUT", segment, exceptions.HttpException(http_status=503)))
+
+        self.assertRaises(exceptions.HttpException, self.manager.upload,
+                          "c", "o", self.path)
+
+        self.assertEqual([], self._segments())
+        self.assertNotIn("c/o", self.store.objects)
+
+    def test_upload_manifest_failure_deletes_segments(self):
+        self.store.failures.append(
+            ("PUT", "c/o", exceptions.HttpException(http_status=400)))
+
+        self.assertRaises(exceptions.HttpException, self.manager.upload,
+                          "c", "o", self.path)
+
+        self.assertEqual([], self._segments())
+        self.assertEqual(3, len([request for request in self.store.requests
+                                 if request[0] == "DELETE"]))
+
+    def test_download_small(self):
+        self.store.objects["c/o"] = (self.data, {})
+        self.manager.segment_size = 10
+        path = os.path.join(self.dir, "out")
+
+        self.manager.download("c", "o", path)
+
+        self.assertEqual(self.data, self._read(path))
+        self.assertEqual(1, self.store.requests.count(("GET", "c/o")))
+
+    def test_download_ranges(self):
+        self.store.objects["c/o"] = (self.data, {})
+        path = os.path.join(self.dir, "out")
+
+        self.manager.download("c", "o", path)
+
+        self.assertEqual(self.data, self._read(path))
+        self.assertEqual(3, self.store.requests.count(("GET", "c/o")))
+
+    def test_download_retries_range(self):
+        self.store.objects["c/o"] = (self.data, {})
+        self.store.failures.append(
+            ("GET", "c/o", requests.exceptions.ChunkedEncodingError()))
+        path = os.path.join(self.dir, "out")
+
+        self.manager.download("c", "o", path)
+
+        self.assertEqual(self.data, self._read(path))
+        self.assertEqual(4, self.store.requests.count(("GET", "c/o")))
+
+    def test_download_ranges_if_match(self):
+        self.store.objects["c/o"] = (self.data, {})
+        path = os.path.join(self.dir, "out")
+        etag = hashlib.md5(self.data).hexdigest()
+
+        with mock.patch.object(self.store, "get",
+                               wraps=self.store.get) as get:
+            self.manager.download("c", "o", path)
+
+        for call in get.call_args_list:
+            self.assertEqual(etag, call[1]["headers"]["If-Match"])
+
+    def test_download_object_changed(self):
+        self.store.objects["c/o"] = (self.data, {})
+        path = os.path.join(self.dir, "out")
+        head = self.store.head
+
+        def overwrite(url, endpoint_filter, headers=None):
+            resp = head(url, endpoint_filter, headers)
+            self.store.objects["c/o"] = (b"abcdefghij", {})
+            return resp
+
+        with mock.patch.object(self.store, "head", side_effect=overwrite):
+            self.assertRaises(transfer.ObjectChanged,
+                              self.manager.download, "c", "o", path)
+
+        # Ranges of a changed object are not retried.
+        self.assertEqual(3, self.store.requests.count(("GET", "c/o")))
+
+    def test_download_object_changed_if_match_ignored(self):
+        self.store.objects["c/o"] = (self.data, {})
+        self.manager.max_workers = 1
+        path = os.path.join(self.dir, "out")
+        response = self.store._response(206, {"etag": "other"}, b"0123")
+
+        with mock.patch.object(self.store, "get", return_value=response):
+            self.assertRaises(transfer.ObjectChanged,
+                              self.manager.download, "c", "o", path)
+
+    def test_download_checksum_mismatch(self):
+        self.store.objects["c/o"] = (self.data, {})
+        self.manager.segment_size = 10
+        self.manager.retries = 0
+        path = os.path.join(self.dir, "out")
+
+        with mock.patch.object(self.store, "get") as get:
+            get.return_value = self.store._response(
+                200, {"etag": "wrong"}, self.data)
+            self.assertRaises(transfer.IncompleteTransfer,
+                              self.manager.download, "c", "o", path)
+
+    def test_download_empty(self):
+        self.store.objects["c/o"] = (b"", {})
+        path = os.path.join(self.dir, "out")
+
+        self.manager.download("c", "o", path)
+
+        self.assertEqual(b"", self._read(path))
+        self.assertNotIn(("GET", "c/o"), self.store.requests)
+
+    def test_copy(self):
+        self.store.objects["c/o"] = (self.data, {})
+
+        self.manager.copy("c", "o", "d", "p", content_type="text/plain")
+
+        data, headers = self.store.objects["d/p"]
+        self.assertEqual(self.data, data)
+        self.assertEqual("c/o", headers["x-copy-from"])
+        self.assertEqual("text/plain", headers["content-type"])
+        self.assertEqual([("PUT", "d/p")], self.store.requests)
@@ -0,0 +1,119 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import fixtures
+from keystoneauth1 import token_endpoint
+from requests_mock.contrib import fixture as requests_fixture
+import testtools
+
+from openstack import connection
+from openstack import exceptions
+from openstack import profile
+from openstack import session
+from openstack.tests.unit import base
+
+try:
+    import asyncio
+
+    from openstack import async_connection
+except ImportError:
+    async_connection = None
+
+ENDPOINT = "http://compute.example/v2"
+
+
+@testtools.skipIf(async_connection is None, "asyncio is not available")
+class TestAsyncConnection(base.TestCase):
+
+    def setUp(self):
+        super(TestAsyncConnection, self).setUp()
+        self.useFixture(fixtures.EnvironmentVariable(
+            "OS_COMPUTE_ENDPOINT_OVERRIDE", ENDPOINT))
+        self.server = self.useFixture(requests_fixture.Fixture())
+
+        sess = session.Session(
+            profile.Profile(),
+            auth=token_endpoint.Token("http://identity.example", "token"))
+        self.sot = async_connection.AsyncConnection(
+            connection.Connection(session=sess), max_workers=4)
+        self.addCleanup(self.sot.close)
+
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+
+    def _collect(self, iterable):
+        iterator = iterable.__aiter__()
+        results = []
+        while True:
+            try:
+                results.append(
+                    self.loop.run_until_complete(iterator.__anext__()))
+            except StopAsyncIteration:
+                return results
+
+    def test_await(self):
+        self.server.get(ENDPOINT + "/servers/1",
+                        json={"server": {"id": "1", "name": "one"}})
+
+        server = self.loop.run_until_complete(
+            self.sot.compute.get_server("1"))
+
+        self.assertEqual("one", server.name)
+        self.assertEqual("token",
+                         self.server.last_request.headers["X-Auth-Token"])
+
+    def test_gather(self):
+        for i in range(8):
+            self.server.get(ENDPOINT + "/servers/%d" % i,
+                            json={"server": {"id": str(i)}})
+
+        servers = self.loop.run_until_complete(asyncio.gather(
+            *[self.sot.compute.get_server(str(i)) for i in range(8)]))
+
+        self.assertEqual([str(i) for i in range(8)],
+                         [server.id for server in servers])
+
+    def test_async_for(self):
+        self.server.get(ENDPOINT + "/servers/detail",
+                        [{"json": {"servers": [{"id": "1"}, {"id": "2"}]}},
+                         {"json": {"servers": []}}])
+
+        servers = self._collect(self.sot.compute.servers())
+
+        self.assertEqual(["1", "2"], [server.id for server in servers])
+
+    def test_error(self):
+        self.server.get(ENDPOINT + "/servers/1", status_code=404,
+                        json={"itemNotFound": {"message": "missing"}})
+
+        self.assertRaises(exceptions.ResourceNotFound,
+                          self.loop.run_until_complete,
+                          self.sot.compute.get_server("1"))
+
+    def test_proxy_wrapped_once(self):
+        self.assertIs(self.sot.compute, self.sot.compute)
+        self.assertIs(self.sot.connection.compute, self.sot.compute.proxy)
+
+    def test_not_a_service(self):
+        self.assertRaises(AttributeError, getattr, self.sot, "authenticator")
+        self.assertRaises(AttributeError, getattr, self.sot, "not_a_service")
+
+    def test_context_manager(self):
+        sot = async_connection.AsyncConnection(self.sot.connection)
+
+        entered = self.loop.run_until_complete(sot.__aenter__())
+        self.loop.run_until_complete(sot.__aexit__(None, None, None))
+
+        self.assertIs(sot, entered)
+        self.assertRaises(RuntimeError, sot.executor.submit, len, "")
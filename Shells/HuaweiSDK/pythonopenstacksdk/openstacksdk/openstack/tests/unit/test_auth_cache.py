@@ -0,0 +1,162 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import os
+import stat
+
+import fixtures
+import mock
+
+from openstack import auth_cache
+from openstack import session
+from openstack.tests.unit import base
+
+
+def _plugin(cache_id="key", lifetime=3600):
+    plugin = mock.Mock()
+    plugin.get_cache_id.return_value = cache_id
+    plugin.auth_ref = None
+    access = mock.Mock()
+    access.expires = (datetime.datetime.utcnow() +
+                      datetime.timedelta(seconds=lifetime))
+    plugin.get_access.return_value = access
+    plugin.get_auth_state.return_value = "state-%s" % cache_id
+    return plugin
+
+
+class TestAuthCache(base.TestCase):
+
+    def setUp(self):
+        super(TestAuthCache, self).setUp()
+        self.session = mock.Mock()
+        self.sot = self._cache()
+
+    def _cache(self, **kwargs):
+        return auth_cache.AuthCache(**kwargs)
+
+    def test_miss_then_hit(self):
+        first = _plugin()
+        self.sot.authenticate(first, self.session)
+
+        first.get_access.assert_called_once_with(self.session)
+        self.assertEqual((0, 1), (self.sot.hits, self.sot.misses))
+
+        second = _plugin()
+        self.sot.authenticate(second, self.session)
+
+        second.get_access.assert_not_called()
+        second.set_auth_state.assert_called_once_with("state-key")
+        self.assertEqual((1, 1), (self.sot.hits, self.sot.misses))
+
+    def test_keyed_by_parameters(self):
+        self.sot.authenticate(_plugin("one"), self.session)
+        other = _plugin("two")
+
+        self.sot.authenticate(other, self.session)
+
+        other.get_access.assert_called_once_with(self.session)
+        self.assertEqual((0, 2), (self.sot.hits, self.sot.misses))
+
+    def test_token_about_to_expire(self):
+        sot = self._cache(expiry_margin=300)
+        sot.authenticate(_plugin(lifetime=200), self.session)
+        plugin = _plugin()
+
+        sot.authenticate(plugin, self.session)
+
+        plugin.get_access.assert_called_once_with(self.session)
+        self.assertEqual(2, sot.misses)
+
+    def test_valid_token_left_alone(self):
+        plugin = _plugin()
+        plugin.auth_ref = mock.Mock()
+        plugin.auth_ref.will_expire_soon.return_value = False
+
+        self.sot.authenticate(plugin, self.session)
+
+        plugin.get_access.assert_not_called()
+        plugin.set_auth_state.assert_not_called()
+        self.assertEqual((0, 0), (self.sot.hits, self.sot.misses))
+
+    def test_plugin_without_cache_id(self):
+        plugin = _plugin(cache_id=None)
+
+        self.sot.authenticate(plugin, self.session)
+
+        plugin.get_access.assert_not_called()
+        self.assertEqual((0, 0), (self.sot.hits, self.sot.misses))
+
+    def test_invalidate_plugin(self):
+        plugin = _plugin()
+        self.sot.authenticate(plugin, self.session)
+
+        self.sot.invalidate_plugin(plugin)
+
+        self.assertIsNone(self.sot.get("key"))
+
+
+class TestFileAuthCache(TestAuthCache):
+
+    def _cache(self, **kwargs):
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 "cache", "tokens.json")
+        return auth_cache.FileAuthCache(self.path, **kwargs)
+
+    def test_shared_between_instances(self):
+        self.sot.authenticate(_plugin(), self.session)
+        other = auth_cache.FileAuthCache(self.path)
+        plugin = _plugin()
+
+        other.authenticate(plugin, self.session)
+
+        plugin.set_auth_state.assert_called_once_with("state-key")
+        self.assertEqual(1, other.hits)
+
+    def test_owner_only(self):
+        self.sot.authenticate(_plugin(), self.session)
+
+        mode = stat.S_IMODE(os.stat(self.path).st_mode)
+        if os.name != "nt":
+            self.assertEqual(0o600, mode)
+
+    def test_without_lock(self):
+        sot = auth_cache.FileAuthCache(self.path, lock=False)
+        sot.authenticate(_plugin(), self.session)
+
+        self.assertEqual("state-key", sot.get("key"))
+        self.assertFalse(os.path.exists(self.path + ".lock"))
+
+
+class TestSessionAuthCache(base.TestCase):
+
+    def setUp(self):
+        super(TestSessionAuthCache, self).setUp()
+        self.cache = mock.Mock(spec=auth_cache.AuthCache)
+        self.plugin = mock.Mock()
+        self.sot = session.Session(None, auth=self.plugin,
+                                   auth_cache=self.cache)
+
+    def test_get_auth_headers(self):
+        self.sot.get_auth_headers()
+        self.cache.authenticate.assert_called_once_with(self.plugin,
+                                                        self.sot)
+
+    def test_get_project_id(self):
+        self.sot.get_project_id()
+        self.cache.authenticate.assert_called_once_with(self.plugin,
+                                                        self.sot)
+
+    def test_invalidate(self):
+        self.sot.invalidate()
+        self.cache.invalidate_plugin.assert_called_once_with(self.plugin)
+        self.plugin.invalidate.assert_called_once_with()
@@ -0,0 +1,160 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import threading
+
+import mock
+
+from openstack import coalesce
+from openstack.tests.unit import base
+
+
+class TestRequestCoalescer(base.TestCase):
+
+    def setUp(self):
+        super(TestRequestCoalescer, self).setUp()
+        self.now = 0.0
+        time_patcher = mock.patch("time.time", side_effect=lambda: self.now)
+        time_patcher.start()
+        self.addCleanup(time_patcher.stop)
+
+    def _run_concurrently(self, sot, func, count=5):
+        """Run func for count threads, the first blocking until all ran"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def leader():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return func()
+
+        results = []
+        errors = []
+
+        def run(target):
+            try:
+                results.append(sot.run("key", target))
+            except Exception as e:
+                errors.append(e)
+
+        first = threading.Thread(target=run, args=(leader,))
+        first.start()
+        started.wait(5)
+        others = [threading.Thread(target=run, args=(leader,))
+                  for _ in range(count - 1)]
+        for thread in others:
+            thread.start()
+        while sot.coalesced < count - 1:
+            release.wait(0.001)
+        release.set()
+        for thread in [first] + others:
+            thread.join(5)
+        return calls, results, errors
+
+    def test_concurrent(self):
+        sot = coalesce.RequestCoalescer()
+        response = object()
+
+        calls, results, errors = self._run_concurrently(
+            sot, lambda: response)
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual([response] * 5, results)
+        self.assertEqual([], errors)
+        self.assertEqual(4, sot.coalesced)
+        self.assertEqual({}, sot._calls)
+
+    def test_concurrent_error(self):
+        sot = coalesce.RequestCoalescer()
+        error = ValueError("down")
+
+        def fail():
+            raise error
+
+        calls, results, errors = self._run_concurrently(sot, fail)
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual([], results)
+        self.assertEqual([error] * 5, errors)
+        self.assertEqual({}, sot._calls)
+
+    def test_sequential_without_window(self):
+        sot = coalesce.RequestCoalescer()
+        func = mock.Mock(side_effect=[1, 2])
+
+        self.assertEqual([1, 2], [sot.run("key", func) for _ in range(2)])
+        self.assertEqual(0, sot.coalesced)
+
+    def test_window(self):
+        sot = coalesce.RequestCoalescer(window=1)
+        func = mock.Mock(side_effect=[1, 2, 3, 4])
+
+        self.assertEqual(1, sot.run("key", func))
+        self.now += 0.5
+        self.assertEqual(1, sot.run("key", func))
+        self.assertEqual(2, sot.run("other", func))
+        self.now += 0.5
+        self.assertEqual(3, sot.run("key", func))
+
+        self.assertEqual(1, sot.coalesced)
+        self.assertEqual(3, func.call_count)
+        self.assertEqual(["key", "other"], sorted(sot._calls))
+        self.now += 1
+        sot.run("new", func)
+        self.assertEqual(["new"], list(sot._calls))
+
+    def test_window_not_for_errors(self):
+        sot = coalesce.RequestCoalescer(window=1)
+        func = mock.Mock(side_effect=[ValueError, 1])
+
+        self.assertRaises(ValueError, sot.run, "key", func)
+        self.assertEqual(1, sot.run("key", func))
+
+    def test_clear(self):
+        sot = coalesce.RequestCoalescer(window=1)
+        func = mock.Mock(side_effect=[1, 2])
+        sot.run("key", func)
+
+        sot.clear()
+
+        self.assertEqual(2, sot.run("key", func))
+
+
+class TestGetKey(base.TestCase):
+
+    def test_same_request(self):
+        kwargs = {"endpoint_filter": {"service_type": "compute"},
+                  "params": {"name": "a", "tags": ["x", "y"]},
+                  "headers": {"Accept": "application/json"}}
+
+        key = coalesce.get_key("GET", "/flavors", kwargs, auth="auth")
+
+        self.assertEqual(key, coalesce.get_key(
+            "get", "/flavors", dict(kwargs), auth="auth"))
+        self.assertNotEqual(key, coalesce.get_key(
+            "GET", "/flavors", kwargs, auth="other"))
+        self.assertNotEqual(key, coalesce.get_key(
+            "GET", "/flavors", dict(kwargs, params={"name": "b"}),
+            auth="auth"))
+        self.assertNotEqual(key, coalesce.get_key(
+            "GET", "/flavors", dict(kwargs, headers={}), auth="auth"))
+
+    def test_not_coalesced(self):
+        for method, kwargs in (("POST", {}),
+                               ("DELETE", {}),
+                               ("GET", {"stream": True}),
+                               ("GET", {"json": {}}),
+                               ("GET", {"data": b"x"}),
+                               ("GET", {"params": {"a": set()}})):
+            self.assertIsNone(coalesce.get_key(method, "/flavors", kwargs))
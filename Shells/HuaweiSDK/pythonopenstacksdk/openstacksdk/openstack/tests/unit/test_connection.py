@@ -11,6 +11,8 @@
 # under the License.
 
 import os
+import threading
+import time
 
 import fixtures
 from keystoneauth1 import session as ksa_session
@@ -68,7 +70,11 @@ class TestConnection(base.TestCase):
         mock_profile.get_services = mock.Mock(return_value=[])
         conn = connection.Connection(profile=mock_profile, authenticator='2',
                                      verify=True, cert='cert', user_agent='1')
-        args = {'auth': '2', 'user_agent': '1', 'verify': True, 'cert': 'cert'}
+        args = {'auth': '2', 'user_agent': '1', 'verify': True, 'cert': 'cert',
+                'discovery_cache': None, 'auth_cache': None,
+                'pool_connections': None, 'pool_maxsize': None,
+                'pool_block': None, 'max_retries': None, 'metrics': None,
+                'retry_policy': None, 'coalescer': None}
         mock_session_init.assert_called_with(mock_profile, **args)
         self.assertEqual(mock_session_init, conn.session)
 
@@ -156,6 +162,69 @@ class TestConnection(base.TestCase):
         self.assertEqual('openstack.workflow.v2._proxy',
                          conn.workflow.__class__.__module__)
 
+    def test_proxies_loaded_lazily(self):
+        prof = profile.Profile()
+        conn = connection.Connection(authenticator=mock.Mock(), profile=prof)
+        self.assertNotIn('compute', conn.__dict__)
+        self.assertIn('compute', dir(conn))
+
+        with mock.patch.object(conn, '_load', wraps=conn._load) as mock_load:
+            compute = conn.compute
+            self.assertIs(compute, conn.compute)
+
+        self.assertEqual(1, mock_load.call_count)
+        self.assertIs(compute, conn.__dict__['compute'])
+        self.assertNotIn('network', conn.__dict__)
+
+    def test_proxies_loaded_once_concurrently(self):
+        conn = connection.Connection(authenticator=mock.Mock(),
+                                     profile=profile.Profile())
+        load = conn._load
+
+        def slow_load(service):
+            time.sleep(0.05)
+            load(service)
+
+        results = []
+
+        def access():
+            results.append(conn.compute)
+
+        with mock.patch.object(conn, '_load',
+                               side_effect=slow_load) as mock_load:
+            threads = [threading.Thread(target=access) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(1, mock_load.call_count)
+        self.assertEqual(4, len(results))
+        for result in results:
+            self.assertIs(conn.__dict__['compute'], result)
+
+    def test_resource_cache(self):
+        cache = mock.Mock()
+        conn = connection.Connection(authenticator=mock.Mock(),
+                                     profile=profile.Profile(),
+                                     resource_cache=cache)
+
+        self.assertIs(cache, conn.compute._resource_cache)
+
+    def test_unknown_attribute(self):
+        conn = connection.Connection(authenticator=mock.Mock(),
+                                     profile=profile.Profile())
+        self.assertRaises(AttributeError, getattr, conn, 'not_a_service')
+
+    def test_proxy_load_failure(self):
+        conn = connection.Connection(authenticator=mock.Mock(),
+                                     profile=profile.Profile())
+        with mock.patch.object(conn, '_load') as mock_load:
+            self.assertRaises(AttributeError, getattr, conn, 'compute')
+            self.assertRaises(AttributeError, getattr, conn, 'compute')
+
+        mock_load.assert_called_once_with(mock.ANY)
+
     def _prepare_test_config(self):
         # Create a temporary directory where our test config will live
         # and insert it into the search path via OS_CLIENT_CONFIG_FILE.
@@ -184,6 +253,21 @@ class TestConnection(base.TestCase):
         self.assertEqual(CONFIG_PROJECT,
                          sot.authenticator._project_name)
 
+    def test_from_config_pool_options(self):
+        self._prepare_test_config()
+
+        data = os_client_config.OpenStackConfig().get_one_cloud("sample")
+        data.config['pool_maxsize'] = '32'
+        data.config['pool_block'] = 'true'
+        data.config['max_retries'] = 3
+
+        sot = connection.from_config(cloud_config=data)
+
+        adapter = sot.session.session.adapters['https://']
+        self.assertEqual(32, adapter._pool_maxsize)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual(3, adapter.max_retries.total)
+
     def test_from_config_given_name(self):
         self._prepare_test_config()
 
@@ -0,0 +1,131 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import threading
+import time
+
+import fixtures
+import mock
+
+from openstack import discovery_cache
+from openstack import utils
+from openstack.tests.unit import base
+
+KEY = ("http://auth", "region", "compute", "public", "v2")
+VALUE = {"catalog": "http://compute/v2/project",
+         "endpoint": "http://compute/v2.1/project"}
+
+
+class TestDiscoveryCache(base.TestCase):
+
+    def test_caches_nothing(self):
+        sot = discovery_cache.DiscoveryCache()
+        sot.set(KEY, VALUE)
+        self.assertIsNone(sot.get(KEY))
+
+
+class TestFileDiscoveryCache(base.TestCase):
+
+    def setUp(self):
+        super(TestFileDiscoveryCache, self).setUp()
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 "cache", "endpoints.json")
+
+    def test_default_path(self):
+        self.useFixture(fixtures.EnvironmentVariable("XDG_CACHE_HOME",
+                                                     "/cache"))
+        sot = discovery_cache.FileDiscoveryCache()
+        if os.name != "nt":
+            self.assertEqual("/cache/openstack/endpoints.json", sot.path)
+
+    def test_get_missing(self):
+        sot = discovery_cache.FileDiscoveryCache(self.path)
+        self.assertIsNone(sot.get(KEY))
+
+    def test_set_get(self):
+        discovery_cache.FileDiscoveryCache(self.path).set(KEY, VALUE)
+
+        # A new instance stands for another process sharing the file.
+        sot = discovery_cache.FileDiscoveryCache(self.path)
+        self.assertEqual(VALUE, sot.get(KEY))
+        self.assertIsNone(sot.get(KEY[:-1] + ("v3",)))
+
+    def test_expired(self):
+        sot = discovery_cache.FileDiscoveryCache(self.path, ttl=10)
+        with mock.patch("time.time", return_value=1000):
+            sot.set(KEY, VALUE)
+        with mock.patch("time.time", return_value=1009):
+            self.assertEqual(VALUE, sot.get(KEY))
+        with mock.patch("time.time", return_value=1010):
+            self.assertIsNone(sot.get(KEY))
+
+    def test_invalidate(self):
+        sot = discovery_cache.FileDiscoveryCache(self.path)
+        other = KEY[:-1] + ("v3",)
+        sot.set(KEY, VALUE)
+        sot.set(other, VALUE)
+
+        sot.invalidate(KEY)
+
+        self.assertIsNone(sot.get(KEY))
+        self.assertEqual(VALUE, sot.get(other))
+
+    def test_corrupt_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as cache_file:
+            cache_file.write("not json")
+        sot = discovery_cache.FileDiscoveryCache(self.path)
+
+        self.assertIsNone(sot.get(KEY))
+        sot.set(KEY, VALUE)
+        self.assertEqual(VALUE, sot.get(KEY))
+
+    def test_concurrent_writers(self):
+        # Each instance stands for another process, with its own lock.
+        writers = [discovery_cache.FileDiscoveryCache(self.path)
+                   for _ in range(2)]
+        keys = [KEY[:-1] + ("v%d" % i,) for i in range(2)]
+        writers[0].set(KEY, VALUE)
+        read_json_file = utils.read_json_file
+
+        def slow_read(path):
+            # Widen the window between reading and writing the file.
+            entries = read_json_file(path)
+            time.sleep(0.05)
+            return entries
+
+        def write(sot, key):
+            sot.set(key, VALUE)
+            sot.invalidate(KEY)
+
+        with mock.patch.object(utils, "read_json_file",
+                               side_effect=slow_read):
+            threads = [threading.Thread(target=write, args=(sot, key))
+                       for sot, key in zip(writers, keys)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        sot = discovery_cache.FileDiscoveryCache(self.path)
+        self.assertEqual([VALUE, VALUE], [sot.get(key) for key in keys])
+        self.assertIsNone(sot.get(KEY))
+        self.assertTrue(os.path.exists(self.path + ".lock"))
+
+    def test_lock_failure(self):
+        sot = discovery_cache.FileDiscoveryCache(self.path)
+
+        with mock.patch.object(utils, "lock_file", side_effect=OSError):
+            sot.set(KEY, VALUE)
+
+        self.assertEqual(VALUE, sot.get(KEY))
@@ -0,0 +1,83 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import json
+
+from openstack import json_stream
+from openstack.tests.unit import base
+
+
+def _chunks(document, size, indent=None):
+    data = json.dumps(document, indent=indent).encode("utf-8")
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+class TestItemStream(base.TestCase):
+
+    def _assert_items(self, document, path, items, rest):
+        for size in (1, 2, 3, 7, 4096):
+            for indent in (None, 2):
+                sot = json_stream.ItemStream(
+                    _chunks(document, size, indent), path)
+                self.assertEqual(items, list(sot))
+                self.assertEqual(rest, sot.document)
+
+    def test_resources_key(self):
+        traces = [{"trace_id": str(index), "code": 200 + index,
+                   "message": u"\u00e9t\u00e9 \"]}" * index}
+                  for index in range(10)]
+
+        self._assert_items(
+            {"traces": traces, "meta_data": {"count": 10}, "marker": "9"},
+            "traces", traces,
+            {"traces": [], "meta_data": {"count": 10}, "marker": "9"})
+
+    def test_dotted_path(self):
+        self._assert_items(
+            {"quotas": {"total": 2, "resources": [{"type": "a"}, {}]}},
+            "quotas.resources", [{"type": "a"}, {}],
+            {"quotas": {"total": 2, "resources": []}})
+
+    def test_list_document(self):
+        items = [1, -2.5e-10, 10 ** 20, "x", None, True, [], {"a": [1]}]
+
+        self._assert_items(items, None, items, [])
+
+    def test_missing_list(self):
+        self._assert_items({"other": [1]}, "traces", [], {"other": [1]})
+        self._assert_items({"traces": {"a": 1}}, "traces", [],
+                           {"traces": {"a": 1}})
+
+    def test_items_decoded_while_reading(self):
+        read = []
+
+        def chunks():
+            for chunk in _chunks({"traces": [1, 2, 3]}, 4):
+                read.append(chunk)
+                yield chunk
+
+        items = iter(json_stream.ItemStream(chunks(), "traces"))
+
+        self.assertEqual(1, next(items))
+        self.assertEqual(b'{"traces": [1, 2', b"".join(read))
+
+    def test_invalid(self):
+        for data, message in (
+                (b'{"traces": [1, 2', "Unterminated JSON document"),
+                (b'{"traces": [1 2]}', "Expected ',' or ']'"),
+                (b'{"traces" [1]}', "Expected ':'"),
+                (b'{1: [1]}', "Expected a key"),
+                (b'[1]x', "Extra data after the JSON document"),
+                (b'', "Unterminated JSON document")):
+            sot = json_stream.ItemStream([data[:3], data[3:]], "traces")
+            error = self.assertRaises(ValueError, list, sot)
+            self.assertIn(message, str(error))
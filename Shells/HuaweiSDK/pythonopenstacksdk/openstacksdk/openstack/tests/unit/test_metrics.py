@@ -0,0 +1,222 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from openstack import metrics
+from openstack import service_filter
+from openstack.tests.unit import base
+
+
+class TestNormalizeURL(base.TestCase):
+
+    def test_ids(self):
+        self.assertEqual(
+            "/v2/{id}/servers/{id}/os-volume_attachments/{id}",
+            metrics.normalize_url(
+                "/v2/0123456789abcdef0123456789abcdef/servers/"
+                "0f3c9a5e-6c4b-4d1e-9c43-2f4c1f7b3a10/"
+                "os-volume_attachments/42"))
+
+    def test_absolute_url_and_query(self):
+        self.assertEqual("/v2.0/ports",
+                         metrics.normalize_url(
+                             "https://vpc.example.com/v2.0/ports?limit=10"))
+
+    def test_names_kept(self):
+        self.assertEqual("/flavors/detail",
+                         metrics.normalize_url("/flavors/detail"))
+
+
+class TestHistogram(base.TestCase):
+
+    def test_observe(self):
+        sot = metrics.Histogram(buckets=(1, 2))
+        for value in (0.5, 1, 1.5, 3):
+            sot.observe(value)
+
+        self.assertEqual(4, sot.count)
+        self.assertEqual(6, sot.sum)
+        self.assertEqual([(1, 2), (2, 3)], sot.cumulative())
+
+
+class TestRequestMetrics(base.TestCase):
+
+    def setUp(self):
+        super(TestRequestMetrics, self).setUp()
+        self.sot = metrics.RequestMetrics(buckets=(0.1, 1))
+        self.now = 0.0
+        time_patcher = mock.patch("time.time", side_effect=lambda: self.now)
+        time_patcher.start()
+        self.addCleanup(time_patcher.stop)
+        self.filter = service_filter.ServiceFilter("compute")
+
+    def _request(self, url="/servers", method="get", elapsed=0.5,
+                 status_code=200, body=b"{}", error=None):
+        info = self.sot.start(url, method, endpoint_filter=self.filter,
+                              headers={})
+        self.now += elapsed
+        response = None
+        if status_code is not None:
+            response = mock.Mock(status_code=status_code, headers={},
+                                 content=body)
+        self.sot.finish(info, response=response, error=error)
+        return info
+
+    def test_snapshot(self):
+        self._request(elapsed=0.0625)
+        self._request(elapsed=0.5, status_code=500)
+        self._request(url="/flavors/1", body=b"{}" * 10)
+
+        snapshot = self.sot.snapshot()
+
+        self.assertEqual([
+            {"service_type": "compute", "method": "GET",
+             "url": "/flavors/{id}", "count": 1,
+             "duration": {"sum": 0.5, "buckets": [(0.1, 0), (1, 1)]},
+             "response_bytes": 20, "statuses": {"200": 1}, "retries": 0,
+             "queue_wait": 0.0},
+            {"service_type": "compute", "method": "GET",
+             "url": "/servers", "count": 2,
+             "duration": {"sum": 0.5625, "buckets": [(0.1, 1), (1, 2)]},
+             "response_bytes": 4, "statuses": {"200": 1, "500": 1},
+             "retries": 0, "queue_wait": 0.0},
+        ], snapshot)
+
+    def test_error_without_response(self):
+        info = self._request(status_code=None, error=Exception("timeout"))
+
+        self.assertIsNone(info.status_code)
+        self.assertEqual({"error": 1}, self.sot.snapshot()[0]["statuses"])
+
+    def test_content_length(self):
+        info = self.sot.start("/objects", "GET")
+        response = mock.Mock(status_code=200,
+                             headers={"Content-Length": "1024"})
+        self.sot.finish(info, response=response, stream=True)
+
+        self.assertEqual(1024, info.response_size)
+        self.assertIsNone(self.sot.snapshot()[0]["service_type"])
+
+    def test_stream_without_length(self):
+        info = self.sot.start("/objects", "GET")
+        response = mock.Mock(status_code=200, headers={})
+        self.sot.finish(info, response=response, stream=True)
+
+        self.assertIsNone(info.response_size)
+        self.assertEqual(0, self.sot.snapshot()[0]["response_bytes"])
+
+    def test_hooks(self):
+        calls = []
+        self.sot.before_hooks.append(lambda info: calls.append(
+            ("before", info.elapsed)))
+        self.sot.after_hooks.append(lambda info: calls.append(
+            ("after", info.elapsed)))
+
+        self._request(elapsed=0.5)
+
+        self.assertEqual([("before", None), ("after", 0.5)], calls)
+
+    def test_hook_failure_ignored(self):
+        self.sot.before_hooks.append(mock.Mock(side_effect=ValueError))
+        after = mock.Mock()
+        self.sot.after_hooks.append(after)
+
+        self._request()
+
+        self.assertEqual(1, after.call_count)
+
+    def test_custom_normalize(self):
+        self.sot.normalize = lambda url: url.split("?")[0]
+
+        self._request(url="/servers/abc?x=1")
+
+        self.assertEqual("/servers/abc", self.sot.snapshot()[0]["url"])
+
+    def test_retries(self):
+        self._request(status_code=503)
+        info = self.sot.start("/servers", "GET", endpoint_filter=self.filter,
+                              attempt=1)
+        self.sot.finish(info, response=mock.Mock(status_code=200, headers={},
+                                                 content=b""))
+
+        series, = self.sot.snapshot()
+        self.assertEqual(1, info.attempt)
+        self.assertEqual((2, 1, {"200": 1, "503": 1}),
+                         (series["count"], series["retries"],
+                          series["statuses"]))
+
+    def test_queue_wait(self):
+        for queue_wait in (0.25, 0.5):
+            info = self.sot.start("/servers", "GET",
+                                  endpoint_filter=self.filter,
+                                  queue_wait=queue_wait)
+            self.sot.finish(info, response=mock.Mock(
+                status_code=200, headers={}, content=b""))
+
+        self.assertEqual(0.75, self.sot.snapshot()[0]["queue_wait"])
+
+    def test_reset(self):
+        self._request()
+
+        self.sot.reset()
+
+        self.assertEqual([], self.sot.snapshot())
+
+    def test_to_prometheus(self):
+        self._request(elapsed=0.5, body=b"abc")
+        self._request(url='/a"b', elapsed=2, status_code=404, body=b"")
+
+        text = self.sot.to_prometheus(prefix="sdk")
+
+        labels = 'service_type="compute",method="GET",url="/servers"'
+        self.assertEqual([
+            "# HELP sdk_request_duration_seconds Duration of the requests.",
+            "# TYPE sdk_request_duration_seconds histogram",
+            'sdk_request_duration_seconds_bucket{service_type="compute",'
+            'method="GET",url="/a\\"b",le="0.1"} 0',
+            'sdk_request_duration_seconds_bucket{service_type="compute",'
+            'method="GET",url="/a\\"b",le="1.0"} 0',
+            'sdk_request_duration_seconds_bucket{service_type="compute",'
+            'method="GET",url="/a\\"b",le="+Inf"} 1',
+            'sdk_request_duration_seconds_sum{service_type="compute",'
+            'method="GET",url="/a\\"b"} 2.0',
+            'sdk_request_duration_seconds_count{service_type="compute",'
+            'method="GET",url="/a\\"b"} 1',
+            'sdk_request_duration_seconds_bucket{%s,le="0.1"} 0' % labels,
+            'sdk_request_duration_seconds_bucket{%s,le="1.0"} 1' % labels,
+            'sdk_request_duration_seconds_bucket{%s,le="+Inf"} 1' % labels,
+            'sdk_request_duration_seconds_sum{%s} 0.5' % labels,
+            'sdk_request_duration_seconds_count{%s} 1' % labels,
+            "# HELP sdk_response_bytes_total Bytes of the response bodies.",
+            "# TYPE sdk_response_bytes_total counter",
+            'sdk_response_bytes_total{service_type="compute",'
+            'method="GET",url="/a\\"b"} 0',
+            'sdk_response_bytes_total{%s} 3' % labels,
+            "# HELP sdk_responses_total Responses by status code.",
+            "# TYPE sdk_responses_total counter",
+            'sdk_responses_total{service_type="compute",method="GET",'
+            'url="/a\\"b",status="404"} 1',
+            'sdk_responses_total{%s,status="200"} 1' % labels,
+            "# HELP sdk_retries_total Requests made again after failing.",
+            "# TYPE sdk_retries_total counter",
+            'sdk_retries_total{service_type="compute",method="GET",'
+            'url="/a\\"b"} 0',
+            'sdk_retries_total{%s} 0' % labels,
+            "# HELP sdk_queue_wait_seconds_total Time waited for rate "
+            "limits.",
+            "# TYPE sdk_queue_wait_seconds_total counter",
+            'sdk_queue_wait_seconds_total{service_type="compute",'
+            'method="GET",url="/a\\"b"} 0.0',
+            'sdk_queue_wait_seconds_total{%s} 0.0' % labels,
+        ], text.splitlines())
+        self.assertTrue(text.endswith("\n"))
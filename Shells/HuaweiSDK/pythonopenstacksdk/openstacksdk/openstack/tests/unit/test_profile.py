@@ -119,3 +119,26 @@ class TestProfile(base.TestCase):
             self.assertEqual('fee', prof.get_filter(service).service_name)
             self.assertEqual('fie', prof.get_filter(service).region)
             self.assertEqual('public', prof.get_filter(service).interface)
+
+    def test_set_rate_limit(self):
+        prof = profile.Profile()
+        prof.set_rate_limit('ecs', rate=5, max_concurrency=2, adaptive=True)
+
+        limit = prof.get_rate_limit('ecs')
+        self.assertEqual((5, 5, 2, True),
+                         (limit.rate, limit.burst, limit.max_concurrency,
+                          limit.adaptive))
+        self.assertIs(limit, prof.get_filter('ecs').rate_limit)
+        self.assertNotIn('rate_limit', prof.get_filter('ecs').get_filter())
+        self.assertIsNone(prof.get_rate_limit('compute'))
+
+        prof.set_rate_limit('ecs')
+        self.assertIsNone(prof.get_rate_limit('ecs'))
+
+    def test_set_rate_limit_all(self):
+        prof = profile.Profile()
+        prof.set_rate_limit(prof.ALL, rate=10)
+
+        self.assertEqual(10, prof.get_rate_limit('compute').rate)
+        self.assertIsNot(prof.get_rate_limit('compute'),
+                         prof.get_rate_limit('ecs'))
@@ -16,6 +16,7 @@ import testtools
 from openstack import exceptions
 from openstack import proxy2
 from openstack import resource2
+from openstack import resource_cache
 
 
 class DeleteableResource(resource2.Resource):
@@ -278,6 +279,182 @@ class TestProxyCreate(testtools.TestCase):
         self.res.create.assert_called_once_with(self.session, prepend_key=True)
 
 
+class BulkResource(resource2.Resource):
+    base_path = "/bulk"
+    allow_create = True
+    allow_delete = True
+
+    name = resource2.Body("name")
+
+
+class NativeBulkResource(BulkResource):
+    allow_bulk_create = True
+    allow_bulk_delete = True
+    bulk_size = 2
+
+
+class TestProxyBulk(testtools.TestCase):
+
+    def setUp(self):
+        super(TestProxyBulk, self).setUp()
+
+        self.session = mock.Mock()
+        self.sot = proxy2.BaseProxy(self.session)
+
+    def test_bulk_create(self):
+        def create(res, session, prepend_key=True):
+            if res.name == "bad":
+                raise exceptions.HttpException(http_status=400)
+            res.id = "id-" + res.name
+            return res
+
+        data = [{"name": "a"}, {"name": "bad"}, {"name": "c"}]
+        with mock.patch.object(BulkResource, "create", autospec=True,
+                               side_effect=create):
+            results = self.sot._bulk_create(BulkResource, data,
+                                            max_workers=2)
+
+        self.assertEqual(data, [result.value for result in results])
+        self.assertEqual([True, False, True],
+                         [result.succeeded for result in results])
+        self.assertEqual("id-a", results[0].resource.id)
+        self.assertIsNone(results[1].resource)
+        self.assertIsInstance(results[1].error, exceptions.HttpException)
+        self.assertEqual("id-c", results[2].resource.id)
+
+    def test_bulk_create_native(self):
+        error = exceptions.HttpException(http_status=500)
+
+        def bulk_create(session, chunk, prepend_key=True):
+            if chunk[0]["name"] == "c":
+                raise error
+            return [NativeBulkResource.existing(**attrs) for attrs in chunk]
+
+        data = [{"name": name} for name in "abcde"]
+        with mock.patch.object(NativeBulkResource, "bulk_create",
+                               side_effect=bulk_create) as mock_bulk:
+            results = self.sot._bulk_create(NativeBulkResource, data,
+                                            prepend_key=False)
+
+        self.assertEqual(3, mock_bulk.call_count)
+        mock_bulk.assert_any_call(self.session, data[:2], prepend_key=False)
+        self.assertEqual(["a", "b", None, None, "e"],
+                         [result.resource and result.resource.name
+                          for result in results])
+        self.assertEqual([None, None, error, error, None],
+                         [result.error for result in results])
+
+    def test_bulk_create_native_not_json(self):
+        # The second chunk is created although the first one cannot be
+        # read, and its results must not be lost.
+        session = mock.Mock()
+        bad = mock.Mock()
+        bad.json.side_effect = ValueError("not json")
+        good = mock.Mock()
+        good.json.return_value = [{"id": "c"}, {"id": "d"}]
+        session.post.side_effect = [bad, good]
+        sot = proxy2.BaseProxy(session)
+        NativeBulkResource.service = mock.Mock()
+        self.addCleanup(delattr, NativeBulkResource, "service")
+
+        results = sot._bulk_create(
+            NativeBulkResource, [{"name": name} for name in "abcd"],
+            max_workers=1, prepend_key=False)
+
+        self.assertEqual([False, False, True, True],
+                         [result.succeeded for result in results])
+        self.assertIsInstance(results[0].error, exceptions.InvalidResponse)
+        self.assertEqual(["c", "d"],
+                         [result.resource.id for result in results[2:]])
+
+    def test_bulk_delete_unexpected_error(self):
+        def delete(res, session, has_body=False, params=None):
+            if res.id == "a":
+                raise RuntimeError("boom")
+
+        with mock.patch.object(BulkResource, "delete", autospec=True,
+                               side_effect=delete):
+            results = self.sot._bulk_delete(BulkResource, ["a", "b"])
+
+        self.assertIsInstance(results[0].error, RuntimeError)
+        self.assertTrue(results[1].succeeded)
+
+    def test_bulk_delete(self):
+        def delete(res, session, has_body=False, params=None):
+            if res.id == "missing":
+                raise exceptions.NotFoundException(http_status=404)
+
+        with mock.patch.object(BulkResource, "delete", autospec=True,
+                               side_effect=delete) as mock_delete:
+            results = self.sot._bulk_delete(
+                BulkResource, ["a", BulkResource(id="missing")],
+                ignore_missing=False)
+
+        self.assertEqual(2, mock_delete.call_count)
+        self.assertEqual(["a", "missing"],
+                         [result.value.id for result in results])
+        self.assertTrue(results[0].succeeded)
+        self.assertEqual("a", results[0].resource.id)
+        self.assertIsInstance(results[1].error, exceptions.ResourceNotFound)
+
+    def test_bulk_delete_ignore_missing(self):
+        with mock.patch.object(
+                BulkResource, "delete", autospec=True,
+                side_effect=exceptions.NotFoundException(http_status=404)):
+            results = self.sot._bulk_delete(BulkResource, ["a", "b"])
+
+        self.assertEqual([True, True],
+                         [result.succeeded for result in results])
+
+    def test_bulk_delete_attrs(self):
+        class Child(BulkResource):
+            base_path = "/parents/%(parent_id)s/children"
+            parent_id = resource2.URI("parent_id")
+
+        with mock.patch.object(Child, "delete", autospec=True):
+            results = self.sot._bulk_delete(Child, ["a"], parent_id="p")
+
+        self.assertEqual("p", results[0].resource.parent_id)
+
+    def test_bulk_delete_native(self):
+        with mock.patch.object(NativeBulkResource, "bulk_delete",
+                               side_effect=lambda session, chunk: chunk
+                               ) as mock_bulk:
+            results = self.sot._bulk_delete(NativeBulkResource,
+                                            ["a", "b", "c"])
+
+        self.assertEqual(2, mock_bulk.call_count)
+        self.assertEqual(["a", "b", "c"],
+                         [result.resource.id for result in results])
+
+    def test_bulk_delete_wrong_type(self):
+        self.assertRaises(ValueError, self.sot._bulk_delete,
+                          BulkResource, ["a", resource2.Resource(id="b")])
+
+    def test_bulk_create_native_size(self):
+        with mock.patch.object(NativeBulkResource, "bulk_create",
+                               side_effect=lambda session, chunk, **kw: [
+                                   NativeBulkResource.existing(**attrs)
+                                   for attrs in chunk]) as mock_bulk:
+            results = self.sot._bulk_create(
+                NativeBulkResource, [{"name": name} for name in "abcde"],
+                bulk_size=5)
+
+        mock_bulk.assert_called_once_with(
+            self.session, [{"name": name} for name in "abcde"],
+            prepend_key=True)
+        self.assertEqual(5, len(results))
+
+    def test_bulk_not_supported(self):
+        class Unsupported(BulkResource):
+            allow_bulk_delete = True
+
+        results = self.sot._bulk_delete(Unsupported, ["a"])
+
+        self.assertIsInstance(results[0].error,
+                              exceptions.MethodNotSupported)
+
+
 class TestProxyGet(testtools.TestCase):
 
     def setUp(self):
@@ -326,6 +503,110 @@ class TestProxyGet(testtools.TestCase):
             self.sot._get, RetrieveableResource, self.res)
 
 
+class CachedResource(resource2.Resource):
+    base_path = "/cached/%(parent_id)s/items"
+    allow_create = True
+    allow_get = True
+    allow_update = True
+    allow_delete = True
+    cache_ttl = 60
+
+    parent_id = resource2.URI("parent_id")
+    name = resource2.Body("name")
+
+
+class TestProxyCache(testtools.TestCase):
+
+    def setUp(self):
+        super(TestProxyCache, self).setUp()
+
+        self.session = mock.Mock()
+        self.cache = resource_cache.ResourceCache()
+        self.sot = proxy2.BaseProxy(self.session, resource_cache=self.cache)
+
+        def get(res, session, requires_id=True):
+            return CachedResource.existing(id=res.id, name="fetched",
+                                           parent_id=res.parent_id)
+
+        patcher = mock.patch.object(CachedResource, "get", autospec=True,
+                                    side_effect=get)
+        self.get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_cached(self):
+        first = self.sot._get(CachedResource, "id", parent_id="p")
+        second = self.sot._get(CachedResource, "id", parent_id="p")
+
+        self.assertEqual(1, self.get.call_count)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    def test_get_keyed_by_uri(self):
+        self.sot._get(CachedResource, "id", parent_id="p")
+        self.sot._get(CachedResource, "id", parent_id="q")
+        self.sot._get(CachedResource, "other", parent_id="p")
+
+        self.assertEqual(3, self.get.call_count)
+
+    def test_get_resource_not_cached(self):
+        res = CachedResource.new(id="id", parent_id="p")
+        self.sot._get(CachedResource, res)
+        self.sot._get(CachedResource, res)
+
+        self.assertEqual(2, self.get.call_count)
+
+    def test_get_without_cache(self):
+        self.sot = proxy2.BaseProxy(self.session)
+        self.sot._get(CachedResource, "id", parent_id="p")
+        self.sot._get(CachedResource, "id", parent_id="p")
+
+        self.assertEqual(2, self.get.call_count)
+
+    @mock.patch.object(CachedResource, "find")
+    def test_find_cached(self, mock_find):
+        mock_find.return_value = CachedResource.existing(id="id")
+        self.sot._find(CachedResource, "name", parent_id="p")
+        self.sot._find(CachedResource, "name", parent_id="p")
+        self.sot._find(CachedResource, "name", parent_id="q")
+
+        self.assertEqual(2, mock_find.call_count)
+
+    @mock.patch.object(CachedResource, "find", return_value=None)
+    def test_find_missing_not_cached(self, mock_find):
+        self.sot._find(CachedResource, "name")
+        self.sot._find(CachedResource, "name")
+
+        self.assertEqual(2, mock_find.call_count)
+
+    def _assert_invalidated(self, change, *args, **kwargs):
+        self.sot._get(CachedResource, "id", parent_id="p")
+        with mock.patch.object(CachedResource, change):
+            getattr(self.sot, "_" + change)(CachedResource, *args, **kwargs)
+        self.sot._get(CachedResource, "id", parent_id="p")
+
+        self.assertEqual(2, self.get.call_count)
+
+    def test_create_invalidates(self):
+        self._assert_invalidated("create", parent_id="p", name="new")
+
+    def test_update_invalidates(self):
+        self._assert_invalidated("update", "id", parent_id="p")
+
+    def test_delete_invalidates(self):
+        self._assert_invalidated("delete", "id", parent_id="p")
+
+    def test_delete_missing_invalidates(self):
+        self.sot._get(CachedResource, "id", parent_id="p")
+        with mock.patch.object(CachedResource, "delete") as mock_delete:
+            mock_delete.side_effect = exceptions.NotFoundException(
+                message="test", http_status=404)
+            self.sot._delete(CachedResource, "id", parent_id="p")
+        self.sot._get(CachedResource, "id", parent_id="p")
+
+        self.assertEqual(2, self.get.call_count)
+
+
 class TestProxyList(testtools.TestCase):
 
     def setUp(self):
@@ -353,6 +634,21 @@ class TestProxyList(testtools.TestCase):
     def test_list_non_paginated(self):
         self._test_list(False)
 
+    def test_list_parallel(self):
+        rv = self.sot._list(ListableResource, paginated=True, parallel=4,
+                            **self.args)
+
+        self.assertEqual(self.fake_response, rv)
+        ListableResource.list.assert_called_once_with(
+            self.session, paginated=True, parallel=4, **self.args)
+
+    def test_list_stream(self):
+        rv = self.sot._list(ListableResource, stream=True, **self.args)
+
+        self.assertEqual(self.fake_response, rv)
+        ListableResource.list.assert_called_once_with(
+            self.session, paginated=False, stream=True, **self.args)
+
 
 class TestProxyHead(testtools.TestCase):
 
@@ -399,7 +695,7 @@ class TestProxyWaits(testtools.TestCase):
         mock_wait.return_value = mock_resource
         self.sot.wait_for_status(mock_resource, 'ACTIVE')
         mock_wait.assert_called_once_with(
-            self.session, mock_resource, 'ACTIVE', [], 2, 120)
+            self.session, mock_resource, 'ACTIVE', [], 2, 120, policy=None)
 
     @mock.patch("openstack.resource2.wait_for_status")
     def test_wait_for_params(self, mock_wait):
@@ -407,7 +703,16 @@ class TestProxyWaits(testtools.TestCase):
         mock_wait.return_value = mock_resource
         self.sot.wait_for_status(mock_resource, 'ACTIVE', ['ERROR'], 1, 2)
         mock_wait.assert_called_once_with(
-            self.session, mock_resource, 'ACTIVE', ['ERROR'], 1, 2)
+            self.session, mock_resource, 'ACTIVE', ['ERROR'], 1, 2,
+            policy=None)
+
+    @mock.patch("openstack.resource2.wait_for_status")
+    def test_wait_for_policy(self, mock_wait):
+        mock_resource = mock.Mock()
+        policy = resource2.PollingPolicy(interval=1)
+        self.sot.wait_for_status(mock_resource, 'ACTIVE', policy=policy)
+        mock_wait.assert_called_once_with(
+            self.session, mock_resource, 'ACTIVE', [], 2, 120, policy=policy)
 
     @mock.patch("openstack.resource2.wait_for_delete")
     def test_wait_for_delete(self, mock_wait):
@@ -415,7 +720,7 @@ class TestProxyWaits(testtools.TestCase):
         mock_wait.return_value = mock_resource
         self.sot.wait_for_delete(mock_resource)
         mock_wait.assert_called_once_with(
-            self.session, mock_resource, 2, 120)
+            self.session, mock_resource, 2, 120, policy=None)
 
     @mock.patch("openstack.resource2.wait_for_delete")
     def test_wait_for_delete_params(self, mock_wait):
@@ -423,4 +728,23 @@ class TestProxyWaits(testtools.TestCase):
         mock_wait.return_value = mock_resource
         self.sot.wait_for_delete(mock_resource, 1, 2)
         mock_wait.assert_called_once_with(
-            self.session, mock_resource, 1, 2)
+            self.session, mock_resource, 1, 2, policy=None)
+
+    @mock.patch("openstack.resource2.wait_for_delete")
+    def test_wait_for_delete_policy(self, mock_wait):
+        mock_resource = mock.Mock()
+        policy = resource2.PollingPolicy(interval=1)
+        self.sot.wait_for_delete(mock_resource, policy=policy)
+        mock_wait.assert_called_once_with(
+            self.session, mock_resource, 2, 120, policy=policy)
+
+    @mock.patch("openstack.resource2.wait_for_statuses")
+    def test_wait_for_statuses(self, mock_wait):
+        resources = [mock.Mock(), mock.Mock()]
+        mock_wait.return_value = iter(resources)
+        result = self.sot.wait_for_statuses(resources, 'ACTIVE', ['ERROR'])
+        self.assertEqual(resources, list(result))
+        mock_wait.assert_called_once_with(
+            self.session, resources, 'ACTIVE', failures=['ERROR'],
+            interval=2, wait=120, max_workers=resource2.DEFAULT_WAIT_WORKERS,
+            policy=None)
@@ -120,6 +120,35 @@ class TestProxyBase(base.TestCase):
                       expected_args=expected_args,
                       expected_kwargs=expected_kwargs)
 
+    def verify_bulk_create(self, test_method, resource_type,
+                           expected_kwargs=None,
+                           mock_method="openstack.proxy2.BaseProxy."
+                                       "_bulk_create"):
+        data = [{"x": 1}, {"x": 2}]
+        the_kwargs = {"max_workers": 3}
+        the_kwargs.update(expected_kwargs or {})
+        self._verify2(mock_method, test_method,
+                      expected_result=["result"],
+                      method_args=[data],
+                      method_kwargs={"max_workers": 3},
+                      expected_args=[resource_type, data],
+                      expected_kwargs=the_kwargs)
+
+    def verify_bulk_delete(self, test_method, resource_type, ignore,
+                           expected_kwargs=None,
+                           mock_method="openstack.proxy2.BaseProxy."
+                                       "_bulk_delete"):
+        values = ["resource_or_id", "other_resource_or_id"]
+        the_kwargs = {"ignore_missing": ignore, "max_workers": 3}
+        the_kwargs.update(expected_kwargs or {})
+        self._verify2(mock_method, test_method,
+                      expected_result=["result"],
+                      method_args=[values],
+                      method_kwargs={"ignore_missing": ignore,
+                                     "max_workers": 3},
+                      expected_args=[resource_type, values],
+                      expected_kwargs=the_kwargs)
+
     def verify_get(self, test_method, resource_type, value=None, args=None,
                    mock_method="openstack.proxy2.BaseProxy._get",
                    ignore_value=False, **kwargs):
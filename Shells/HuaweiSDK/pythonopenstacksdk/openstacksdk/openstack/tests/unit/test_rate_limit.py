@@ -0,0 +1,126 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import threading
+
+import mock
+
+from openstack import rate_limit
+from openstack.tests.unit import base
+
+
+class TestRateLimit(base.TestCase):
+
+    def setUp(self):
+        super(TestRateLimit, self).setUp()
+        self.now = 0.0
+        self.sleeps = []
+        time_patcher = mock.patch("time.time", side_effect=lambda: self.now)
+        time_patcher.start()
+        self.addCleanup(time_patcher.stop)
+        sleep_patcher = mock.patch("time.sleep", side_effect=self._sleep)
+        sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def _sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def test_unlimited(self):
+        sot = rate_limit.RateLimit()
+
+        for _ in range(100):
+            self.assertEqual(0, sot.acquire())
+            sot.release(200)
+
+        self.assertEqual([], self.sleeps)
+        self.assertEqual((0, 0, 0), (sot.waits, sot.wait_time,
+                                     sot.in_flight))
+
+    def test_rate(self):
+        sot = rate_limit.RateLimit(rate=4, burst=2)
+
+        waits = [sot.acquire() for _ in range(4)]
+
+        self.assertEqual([0, 0, 0.25, 0.25], waits)
+        self.assertEqual((2, 0.5), (sot.waits, sot.wait_time))
+        self.assertEqual(4, sot.in_flight)
+
+    def test_refill(self):
+        sot = rate_limit.RateLimit(rate=2, burst=2)
+        sot.acquire()
+        sot.acquire()
+
+        self.now += 10
+        waits = [sot.acquire() for _ in range(3)]
+
+        self.assertEqual([0, 0, 0.5], waits)
+
+    def test_waiters_take_turns(self):
+        sot = rate_limit.RateLimit(rate=1, burst=1)
+        sot.acquire()
+
+        # Requests reserve their token before sleeping, so the next ones
+        # wait longer rather than racing for the same token.
+        self.assertEqual(1.0, sot._take())
+        self.assertEqual(2.0, sot._take())
+
+    def test_max_concurrency(self):
+        sot = rate_limit.RateLimit(max_concurrency=1)
+        sot.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            sot.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+
+        sot.release(200)
+        thread.join(5)
+        self.assertTrue(acquired.is_set())
+        self.assertEqual((1, 1), (sot.waits, sot.in_flight))
+
+    def test_adaptive(self):
+        sot = rate_limit.RateLimit(rate=10, adaptive=True)
+
+        sot.acquire()
+        sot.release(429)
+        self.assertEqual(5, sot.rate)
+        for _ in range(5):
+            sot.acquire()
+            sot.release(429)
+        self.assertEqual(1, sot.rate)
+
+        for _ in range(4):
+            sot.acquire()
+            sot.release(200)
+        self.assertEqual(3, sot.rate)
+        sot.acquire()
+        sot.release(None)
+        sot.acquire()
+        sot.release(500)
+        self.assertEqual(3, sot.rate)
+        for _ in range(100):
+            sot.acquire()
+            sot.release(204)
+        self.assertEqual(10, sot.rate)
+
+    def test_not_adaptive(self):
+        sot = rate_limit.RateLimit(rate=10)
+
+        sot.acquire()
+        sot.release(429)
+
+        self.assertEqual(10, sot.rate)
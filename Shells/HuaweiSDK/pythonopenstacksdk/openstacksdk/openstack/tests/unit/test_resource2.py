@@ -10,10 +10,18 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import copy
+import gc
 import itertools
+import json
+import sys
+import threading
+import time
+import weakref
 
 import mock
 import six
+from testtools import content
 
 from openstack import exceptions
 from openstack import format
@@ -327,6 +335,153 @@ class TestComponentManager(base.TestCase):
         self.assertEqual(dict(), sot.dirty)
 
 
+class TestCompactResource(base.TestCase):
+    def setUp(self):
+        super(TestCompactResource, self).setUp()
+
+        class Test(resource2.Resource):
+            base_path = "/test"
+            attr = resource2.Body("attr")
+            header = resource2.Header("header")
+            path = resource2.URI("path")
+
+        self.test_class = Test
+        self.sot = Test.existing(_compact=True, id="the_id", name="a",
+                                 attr="b", header="c", path="d")
+
+    def _footprint(self, res):
+        """Bytes used by a resource itself, excluding the attribute values
+
+        Key tables shared between compact resources are not counted.
+        """
+        size = sys.getsizeof(res) + sys.getsizeof(res.__dict__)
+        for key in ("_body", "_header", "_uri"):
+            component = getattr(res, key)
+            size += sys.getsizeof(component)
+            if isinstance(component, resource2._CompactComponentManager):
+                size += sys.getsizeof(component._values)
+            else:
+                size += sys.getsizeof(component.__dict__)
+                size += sys.getsizeof(component.attributes)
+                size += sys.getsizeof(component._dirty)
+        return size
+
+    def test_read(self):
+        self.assertIsInstance(self.sot._body,
+                              resource2._CompactComponentManager)
+        self.assertEqual("the_id", self.sot.id)
+        self.assertEqual("a", self.sot.name)
+        self.assertEqual("b", self.sot.attr)
+        self.assertEqual("c", self.sot.header)
+        self.assertEqual("d", self.sot.path)
+        self.assertIsNone(self.sot.location)
+        self.assertEqual(dict(), self.sot._body.dirty)
+        self.assertEqual(
+            {"id": "the_id", "name": "a", "attr": "b", "header": "c",
+             "location": None},
+            self.sot.to_dict())
+        # Nothing above should have needed regular storage.
+        self.assertIsInstance(self.sot._body,
+                              resource2._CompactComponentManager)
+
+    def test_equal_to_regular(self):
+        regular = self.test_class.existing(id="the_id", name="a", attr="b",
+                                           header="c", path="d")
+
+        self.assertEqual(regular, self.sot)
+
+    def test_shared_key_table(self):
+        other = self.test_class.existing(_compact=True, id="x", name="y",
+                                         attr="z", header="c", path="d")
+
+        self.assertIs(self.sot._body._keys, other._body._keys)
+        self.assertEqual("x", other.id)
+
+    def test_promote_on_set(self):
+        self.sot.attr = "new"
+
+        self.assertIsInstance(self.sot._body, resource2._ComponentManager)
+        self.assertIsInstance(self.sot._header, resource2._ComponentManager)
+        self.assertIsInstance(self.sot._uri, resource2._ComponentManager)
+        self.assertEqual("new", self.sot.attr)
+        self.assertEqual("a", self.sot.name)
+        self.assertEqual({"attr": "new"}, self.sot._body.dirty)
+        self.assertEqual(dict(), self.sot._header.dirty)
+
+    def test_promote_on_update(self):
+        self.sot._update(name="new")
+
+        self.assertIsInstance(self.sot._body, resource2._ComponentManager)
+        self.assertEqual({"name": "new"}, self.sot._body.dirty)
+
+    def test_promote_on_attributes(self):
+        self.sot._header.attributes.update({"header": "new"})
+
+        self.assertIsInstance(self.sot._header, resource2._ComponentManager)
+        self.assertEqual("new", self.sot.header)
+
+    def test_repr_and_equal_keep_compact(self):
+        other = self.test_class.existing(_compact=True, id="the_id", name="a",
+                                         attr="b", header="c", path="d")
+
+        self.assertIn("attr=b", repr(self.sot))
+        self.assertEqual(other, self.sot)
+        self.assertIsInstance(self.sot._body,
+                              resource2._CompactComponentManager)
+        self.assertIsInstance(other._body,
+                              resource2._CompactComponentManager)
+
+    def test_freed_without_cyclic_gc(self):
+        gc.disable()
+        self.addCleanup(gc.enable)
+        ref = weakref.ref(self.sot)
+
+        self.sot = None
+
+        self.assertIsNone(ref())
+
+    def test_deepcopy(self):
+        copied = copy.deepcopy(self.sot)
+
+        copied.attr = "new"
+
+        self.assertEqual("new", copied.attr)
+        self.assertEqual("b", self.sot.attr)
+        self.assertIsInstance(self.sot._body,
+                              resource2._CompactComponentManager)
+
+    def test_list_compact(self):
+        response = mock.Mock()
+        response.json.return_value = [{"id": "1", "attr": "x"},
+                                      {"id": "2", "attr": "y"}]
+        sess = mock.Mock()
+        sess.get.return_value = response
+        self.test_class.service = mock.Mock()
+        self.test_class.allow_list = True
+
+        results = list(self.test_class.list(sess, compact=True))
+
+        self.assertEqual(["1", "2"], [r.id for r in results])
+        self.assertEqual(["x", "y"], [r.attr for r in results])
+        for result in results:
+            self.assertIsInstance(result._body,
+                                  resource2._CompactComponentManager)
+
+    def test_memory_per_object(self):
+        attrs = dict(("attr%d" % i, resource2.Body("attr%d" % i))
+                     for i in range(30))
+        Test = type("Test", (resource2.Resource,), attrs)
+        data = dict(("attr%d" % i, i) for i in range(30))
+        data["id"] = "id"
+
+        regular = self._footprint(Test.existing(**data))
+        compact = self._footprint(Test.existing(_compact=True, **data))
+
+        self.addDetail("bytes-per-object", content.text_content(
+            "regular=%d compact=%d" % (regular, compact)))
+        self.assertLess(compact, regular / 2)
+
+
 class Test_Request(base.TestCase):
     def test_create(self):
         uri = 1
@@ -419,15 +574,15 @@ class TestResource(base.TestCase):
         class Test(resource2.Resource):
             def __init__(self):
                 self._body = mock.Mock()
-                self._body.attributes.items = mock.Mock(
+                self._body.items = mock.Mock(
                     return_value=a.items())
 
                 self._header = mock.Mock()
-                self._header.attributes.items = mock.Mock(
+                self._header.items = mock.Mock(
                     return_value=b.items())
 
                 self._uri = mock.Mock()
-                self._uri.attributes.items = mock.Mock(
+                self._uri.items = mock.Mock(
                     return_value=c.items())
 
         the_repr = repr(Test())
@@ -568,6 +723,41 @@ class TestResource(base.TestCase):
         self.assertIn("y", Test._uri_mapping())
         self.assertIn("z", Test._uri_mapping())
 
+    def test__component_registry_cached(self):
+        class Test(resource2.Resource):
+            x = resource2.Body("x")
+
+        registry = Test._component_registry()
+
+        self.assertIs(registry, Test._component_registry())
+        self.assertIs(registry.table(resource2.Body),
+                      registry.table(resource2.Body))
+
+    def test__component_registry_per_class(self):
+        class Parent(resource2.Resource):
+            x = resource2.Body("x")
+
+        class Child(Parent):
+            y = resource2.Body("y")
+
+        # Build the parent's registry first so the child can't inherit it.
+        parent_mapping = Parent._body_mapping()
+        child_mapping = Child._body_mapping()
+
+        self.assertIsNot(Parent._component_registry(),
+                         Child._component_registry())
+        self.assertNotIn("y", parent_mapping)
+        self.assertIn("x", child_mapping)
+        self.assertIn("y", child_mapping)
+
+    def test__get_mapping_returns_copy(self):
+        class Test(resource2.Resource):
+            x = resource2.Body("x")
+
+        Test._body_mapping()["x"] = "changed"
+
+        self.assertEqual("x", Test._body_mapping()["x"])
+
     def test__getattribute__id_in_body(self):
         id = "lol"
         sot = resource2.Resource(id=id)
@@ -593,6 +783,52 @@ class TestResource(base.TestCase):
         sot = Test()
         self.assertIsNone(sot.id)
 
+    def test_id_overridden_name(self):
+        class Test(resource2.Resource):
+            id = resource2.Body("MyID")
+
+        sot = Test.existing(MyID="lol")
+
+        self.assertEqual("lol", sot.id)
+        self.assertEqual(("id", "MyID"), Test._component_registry().id_keys)
+
+    def test_id_keys_with_alternate(self):
+        class Test(resource2.Resource):
+            alt = resource2.Body("the_alt", alternate_id=True)
+
+        self.assertEqual(("id", "the_alt"),
+                         Test._component_registry().id_keys)
+
+    def test_id_prefers_id_over_alternate(self):
+        class Test(resource2.Resource):
+            alt = resource2.Body("the_alt", alternate_id=True)
+
+        sot = Test(id="the_id", the_alt="other")
+
+        self.assertEqual("the_id", sot.id)
+
+    def test_id_overridden_with_alternate(self):
+        class Test(resource2.Resource):
+            id = resource2.Body("id")
+            alt = resource2.Body("the_alt", alternate_id=True)
+
+        sot = Test.existing(alt="att-1")
+
+        self.assertEqual("att-1", sot.id)
+        self.assertEqual("att-1", resource2.Resource._get_id(sot))
+
+    def test_id_overridden_in_base_with_alternate(self):
+        class Base(resource2.Resource):
+            id = resource2.Body("id")
+
+        class Test(Base):
+            alt = resource2.Body("the_alt", alternate_id=True)
+
+        sot = Test.existing(the_alt="att-1")
+
+        self.assertEqual("att-1", sot.id)
+        self.assertIsInstance(Base.__dict__["id"], resource2._Id)
+
     def test__alternate_id_None(self):
         self.assertEqual("", resource2.Resource._alternate_id())
 
@@ -1008,6 +1244,84 @@ class TestResourceActions(base.TestCase):
 
         self._test_create(Test, requires_id=False, prepend_key=True)
 
+    def _bulk_class(self):
+        class Test(resource2.Resource):
+            service = self.sot.service
+            base_path = "/tests/%(parent)s"
+            resources_key = "tests"
+            allow_bulk_create = True
+
+            parent = resource2.URI("parent")
+            name = resource2.Body("name")
+            status = resource2.Body("status")
+
+        return Test
+
+    def test_bulk_create(self):
+        Test = self._bulk_class()
+        self.response.json.return_value = {"tests": [
+            {"id": "1", "name": "a", "status": "ok"},
+            {"id": "2", "name": "b", "status": "ok"}]}
+
+        result = Test.bulk_create(self.session, [
+            {"name": "a", "parent": "p"}, {"name": "b", "parent": "p"}])
+
+        self.session.post.assert_called_once_with(
+            "/tests/p", endpoint_filter=self.sot.service,
+            endpoint_override=None, headers={},
+            json={"tests": [{"name": "a"}, {"name": "b"}]})
+        self.assertEqual(["1", "2"], [res.id for res in result])
+        self.assertEqual(["ok", "ok"], [res.status for res in result])
+        self.assertEqual(["p", "p"], [res.parent for res in result])
+        self.assertEqual({}, result[0]._body.dirty)
+
+    def test_bulk_create_no_prepend_key(self):
+        Test = self._bulk_class()
+        self.response.json.return_value = [{"id": "1"}]
+
+        result = Test.bulk_create(
+            self.session, [{"name": "a", "parent": "p"}], prepend_key=False)
+
+        self.assertEqual([{"name": "a"}],
+                         self.session.post.call_args[1]["json"])
+        self.assertEqual("1", result[0].id)
+
+    def test_bulk_create_different_uris(self):
+        Test = self._bulk_class()
+
+        self.assertRaises(exceptions.InvalidRequest, Test.bulk_create,
+                          self.session, [{"parent": "p1"}, {"parent": "p2"}])
+        self.session.post.assert_not_called()
+
+    def test_bulk_create_invalid_response(self):
+        Test = self._bulk_class()
+        self.response.json.return_value = {"tests": [{"id": "1"}]}
+
+        self.assertRaises(exceptions.InvalidResponse, Test.bulk_create,
+                          self.session, [{"name": "a", "parent": "p"},
+                                         {"name": "b", "parent": "p"}])
+
+    def test_bulk_create_malformed_response(self):
+        Test = self._bulk_class()
+        data = [{"name": "a", "parent": "p"}]
+
+        for body in (ValueError("not json"), {"other": []}, {"tests": 1}):
+            if isinstance(body, Exception):
+                self.response.json.side_effect = body
+            else:
+                self.response.json.side_effect = None
+                self.response.json.return_value = body
+            self.assertRaises(exceptions.InvalidResponse, Test.bulk_create,
+                              self.session, data)
+
+    def test_bulk_create_not_allowed(self):
+        self.assertRaises(exceptions.MethodNotSupported,
+                          self.test_class.bulk_create, self.session, [{}])
+
+    def test_bulk_delete_not_allowed(self):
+        self.assertRaises(exceptions.MethodNotSupported,
+                          self.test_class.bulk_delete, self.session, [])
+
     def test_get(self):
         result = self.sot.get(self.session)
 
@@ -1034,6 +1348,108 @@ class TestResourceActions(base.TestCase):
         self.sot._translate_response.assert_called_once_with(self.response)
         self.assertEqual(result, self.sot)
 
+    def _existing_sot(self):
+        # Attributes of new instances are dirty until a response is
+        # translated, which these tests mock.
+        self.sot = self.test_class.existing(id="id")
+        self.sot._prepare_request = mock.Mock(return_value=self.request)
+        self.sot._translate_response = mock.Mock()
+
+    def _get_twice(self, headers, status_code=304):
+        self._existing_sot()
+        self.response.headers = headers
+        self.response.status_code = 200
+        self.sot.get(self.session)
+        self.response.status_code = status_code
+        self.sot._translate_response.reset_mock()
+
+        self.sot.get(self.session)
+
+        return self.session.get.call_args[1].get("headers")
+
+    def test_get_if_none_match(self):
+        headers = self._get_twice({"ETag": '"abc"',
+                                   "Last-Modified": "Mon, 1 Jan 2018"})
+
+        self.assertEqual({"If-None-Match": '"abc"'}, headers)
+        self.sot._translate_response.assert_not_called()
+
+    def test_get_if_modified_since(self):
+        self.test_class.conditional_last_modified = True
+
+        headers = self._get_twice({"Last-Modified": "Mon, 1 Jan 2018"})
+
+        self.assertEqual({"If-Modified-Since": "Mon, 1 Jan 2018"}, headers)
+        self.sot._translate_response.assert_not_called()
+
+    def test_get_last_modified_not_conditional(self):
+        # A change made in the same second as the previous response has
+        # the same Last-Modified, so polling must not send it back.
+        headers = self._get_twice({"Last-Modified": "Mon, 1 Jan 2018"},
+                                  status_code=200)
+
+        self.assertIsNone(headers)
+        self.sot._translate_response.assert_called_once_with(self.response)
+
+    def test_get_weak_etag(self):
+        headers = self._get_twice({"ETag": 'W/"abc"',
+                                   "Last-Modified": "Mon, 1 Jan 2018"})
+
+        self.assertEqual({"If-None-Match": 'W/"abc"'}, headers)
+        self.sot._translate_response.assert_not_called()
+
+    def test_get_modified(self):
+        headers = self._get_twice({"ETag": '"abc"'}, status_code=200)
+
+        self.assertEqual({"If-None-Match": '"abc"'}, headers)
+        self.sot._translate_response.assert_called_once_with(self.response)
+
+    def test_get_no_validators(self):
+        headers = self._get_twice({}, status_code=200)
+
+        self.assertIsNone(headers)
+        self.sot._translate_response.assert_called_once_with(self.response)
+
+    def test_get_conditional_disabled(self):
+        self.test_class.conditional_get = False
+
+        headers = self._get_twice({"ETag": '"abc"'}, status_code=200)
+
+        self.assertIsNone(headers)
+
+    def test_get_conditional_other_uri(self):
+        self._existing_sot()
+        self.response.headers = {"ETag": '"abc"'}
+        self.sot.get(self.session)
+        self.request.uri = "other"
+
+        self.sot.get(self.session)
+
+        self.assertNotIn("headers", self.session.get.call_args[1])
+
+    def test_get_conditional_dirty(self):
+        self._existing_sot()
+        self.response.headers = {"ETag": '"abc"'}
+        self.sot.get(self.session)
+        self.sot.name = "changed"
+
+        self.sot.get(self.session)
+
+        self.assertNotIn("headers", self.session.get.call_args[1])
+
+    def test_get_conditional_after_update(self):
+        sot = self.test_class.existing(id="id")
+        self.response.headers = {"ETag": '"abc"'}
+        self.response.json.return_value = {}
+        sot.get(self.session)
+        self.assertIsNotNone(sot._validators)
+
+        sot.name = "changed"
+        sot.update(self.session)
+        sot.get(self.session)
+
+        self.assertNotIn("headers", self.session.get.call_args[1])
+
     def test_head(self):
         result = self.sot.head(self.session)
 
@@ -1201,6 +1617,35 @@ class TestResourceActions(base.TestCase):
         self.assertEqual(id_value, results[0].id)
         self.assertIsInstance(results[0], self.test_class)
 
+    def test_list_large_listing(self):
+        # Benchmark-style check of deserializing a 50k item listing, where
+        # every item goes through the component tables of its class.
+        # The runner's per-test timings show how long this takes.
+        count = 50000
+
+        class Test(self.test_class):
+            resources_key = "items"
+            status = resource2.Body("status")
+            flavor = resource2.Body("flavor", type=dict)
+            location = resource2.Header("location")
+
+        items = [{"id": "id-%d" % i, "name": "name-%d" % i,
+                  "status": "ACTIVE", "flavor": {"id": "1"}}
+                 for i in range(count)]
+        mock_response = mock.Mock()
+        mock_response.json.return_value = {"items": items}
+        self.session.get.return_value = mock_response
+
+        started = time.time()
+        results = list(Test.list(self.session))
+        elapsed = time.time() - started
+
+        self.addDetail("items-per-second", content.text_content(
+            "%d" % (count / max(elapsed, 1e-6))))
+        self.assertEqual(count, len(results))
+        self.assertEqual("id-%d" % (count - 1), results[-1].id)
+        self.assertEqual("ACTIVE", results[-1].status)
+
     def test_list_multi_page_response_not_paginated(self):
         ids = [1, 2]
         mock_response = mock.Mock()
@@ -1334,6 +1779,295 @@ class TestResourceActions(base.TestCase):
         # Ensure we only made two calls to get this done
         self.assertEqual(2, len(self.session.get.call_args_list))
 
+    def test_list_prefetch(self):
+        ids = [1, 2, 3]
+        resp1 = mock.Mock()
+        resp1.json.return_value = [{"id": ids[0]}]
+        resp2 = mock.Mock()
+        resp2.json.return_value = [{"id": ids[1]}]
+        resp3 = mock.Mock()
+        resp3.json.return_value = [{"id": ids[2]}]
+        resp4 = mock.Mock()
+        resp4.json.return_value = []
+
+        self.session.get.side_effect = [resp1, resp2, resp3, resp4]
+
+        results = self.sot.list(self.session, paginated=True, prefetch=2)
+
+        self.assertEqual(ids, [result.id for result in results])
+        self.assertEqual(4, len(self.session.get.call_args_list))
+        self.session.get.assert_called_with(
+            self.base_path,
+            endpoint_filter=self.sot.service,
+            endpoint_override=None,
+            headers={"Accept": "application/json"},
+            params={"limit": 1, "marker": 3})
+
+    def test_list_prefetch_not_paginated(self):
+        resp = mock.Mock()
+        resp.json.return_value = [{"id": 1}, {"id": 2}]
+        self.session.get.return_value = resp
+
+        results = list(self.sot.list(self.session, prefetch=1))
+
+        self.assertEqual([1, 2], [result.id for result in results])
+        self.session.get.assert_called_once_with(
+            self.base_path,
+            endpoint_filter=self.sot.service,
+            endpoint_override=None,
+            headers={"Accept": "application/json"},
+            params={})
+
+    def test_list_parallel(self):
+        class Test(self.test_class):
+            resources_key = "resources"
+
+            @classmethod
+            def get_remaining_pages(cls, response_json, yielded,
+                                    query_params):
+                return [dict(query_params, offset=offset)
+                        for offset in range(2, response_json["total"], 2)]
+
+        pages = {None: [{"id": 1}, {"id": 2}],
+                 2: [{"id": 3}, {"id": 4}],
+                 4: [{"id": 5}]}
+
+        def get(uri, params=None, **kwargs):
+            resp = mock.Mock()
+            resp.json.return_value = {
+                "total": 5, "resources": pages[params.get("offset")]}
+            return resp
+
+        self.session.get.side_effect = get
+
+        results = list(Test.list(self.session, paginated=True, parallel=2))
+
+        self.assertEqual([1, 2, 3, 4, 5], [result.id for result in results])
+        self.assertEqual(3, len(self.session.get.call_args_list))
+
+    def test_list_parallel_marker_paging(self):
+        ids = [1, 2]
+        resp1 = mock.Mock()
+        resp1.json.return_value = [{"id": ids[0]}]
+        resp2 = mock.Mock()
+        resp2.json.return_value = [{"id": ids[1]}]
+        resp3 = mock.Mock()
+        resp3.json.return_value = []
+
+        self.session.get.side_effect = [resp1, resp2, resp3]
+
+        results = self.sot.list(self.session, paginated=True, parallel=4)
+
+        self.assertEqual(ids, [result.id for result in results])
+        self.session.get.assert_called_with(
+            self.base_path,
+            endpoint_filter=self.sot.service,
+            endpoint_override=None,
+            headers={"Accept": "application/json"},
+            params={"limit": 1, "marker": 2})
+
+    def _streamed_response(self, body, received):
+        resp = mock.Mock()
+        resp.encoding = None
+
+        def iter_content(chunk_size):
+            data = json.dumps(body).encode("utf-8")
+            for start in range(0, len(data), 4):
+                received.append(start)
+                yield data[start:start + 4]
+
+        resp.iter_content = iter_content
+        return resp
+
+    def test_list_stream(self):
+        class Test(self.test_class):
+            resources_key = "resources"
+
+        received = []
+        body = {"count": 3, "resources": [{"id": 1}, {"id": 2}, {"id": 3}]}
+        resp = self._streamed_response(body, received)
+        self.session.get.return_value = resp
+
+        results = Test.list(self.session, stream=True)
+
+        self.assertEqual(1, next(results).id)
+        # The first resource is yielded before the body is all received.
+        self.assertLess(len(received) * 4, len(json.dumps(body)))
+        self.assertEqual([2, 3], [result.id for result in results])
+        resp.json.assert_not_called()
+        resp.close.assert_called_once_with()
+        self.session.get.assert_called_once_with(
+            self.base_path,
+            endpoint_filter=self.sot.service,
+            endpoint_override=None,
+            headers={"Accept": "application/json"},
+            params={}, stream=True)
+
+    def test_list_stream_paginated(self):
+        class Test(self.test_class):
+            resources_key = "data.resources"
+            next_marker_path = "data.next"
+
+        received = []
+        self.session.get.side_effect = [
+            self._streamed_response(
+                {"data": {"resources": [{"id": 1}, {"id": 2}], "next": "b"}},
+                received),
+            self._streamed_response(
+                {"data": {"resources": [{"id": 3}]}}, received)]
+
+        results = list(Test.list(self.session, paginated=True, stream=True,
+                                 prefetch=2))
+
+        self.assertEqual([1, 2, 3], [result.id for result in results])
+        self.session.get.assert_called_with(
+            self.base_path,
+            endpoint_filter=self.sot.service,
+            endpoint_override=None,
+            headers={"Accept": "application/json"},
+            params={"limit": 2, "marker": "b"}, stream=True)
+
+    def test_list_stream_closed(self):
+        class Test(self.test_class):
+            resources_key = "resources"
+
+        resp = self._streamed_response(
+            {"resources": [{"id": 1}, {"id": 2}]}, [])
+        self.session.get.return_value = resp
+
+        results = Test.list(self.session, paginated=True, stream=True)
+        next(results)
+        results.close()
+
+        resp.close.assert_called_once_with()
+        self.assertEqual(1, len(self.session.get.call_args_list))
+
+
+class TestFetchPages(base.TestCase):
+    def test_order(self):
+        delays = {0: 0.05, 1: 0, 2: 0.02, 3: 0}
+
+        def fetch(index):
+            time.sleep(delays[index])
+            return [index]
+
+        results = list(resource2.fetch_pages(fetch, range(4), 3))
+
+        self.assertEqual([[0], [1], [2], [3]], results)
+
+    def test_concurrent(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def fetch(index):
+            with lock:
+                active.append(index)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(index)
+            return [index]
+
+        results = list(resource2.fetch_pages(fetch, range(8), 4))
+
+        self.assertEqual([[i] for i in range(8)], results)
+        self.assertLessEqual(max(peak), 4)
+        self.assertGreater(max(peak), 1)
+
+    def test_error(self):
+        def fetch(index):
+            if index == 1:
+                raise exceptions.HttpException("boom")
+            return [index]
+
+        results = resource2.fetch_pages(fetch, range(3), 2)
+
+        self.assertEqual([0], next(results))
+        self.assertRaises(exceptions.HttpException, next, results)
+
+    def test_close_stops_workers(self):
+        started = threading.active_count()
+        fetched = []
+
+        def fetch(index):
+            fetched.append(index)
+            return [index]
+
+        results = resource2.fetch_pages(fetch, range(1000), 2)
+        self.assertEqual([0], next(results))
+        results.close()
+
+        for _ in range(500):
+            if threading.active_count() <= started:
+                break
+            time.sleep(0.01)
+        else:
+            self.fail("Workers did not stop")
+        self.assertLessEqual(len(fetched), 8)
+
+    def test_no_requests(self):
+        self.assertEqual([], list(resource2.fetch_pages(None, [], 4)))
+
+
+class TestPrefetchPages(base.TestCase):
+    def _wait_for_threads(self, count):
+        for _ in range(500):
+            if threading.active_count() <= count:
+                return
+            time.sleep(0.01)
+        self.fail("Background fetcher did not stop")
+
+    def test_pages_in_order(self):
+        pages = [[1, 2], [3], [4, 5]]
+
+        result = list(resource2.prefetch_pages(iter(pages), 1))
+
+        self.assertEqual(pages, result)
+
+    def test_bounded(self):
+        produced = []
+        started = threading.active_count()
+
+        def pages():
+            for i in itertools.count():
+                produced.append(i)
+                yield [i]
+
+        results = resource2.prefetch_pages(pages(), 2)
+        self.assertEqual([0], next(results))
+        time.sleep(0.1)
+
+        # The buffer holds two pages, and the fetcher holds one more
+        # while it waits for room.
+        self.assertLessEqual(len(produced), 4)
+
+        results.close()
+        self._wait_for_threads(started)
+
+    def test_close_stops_fetcher(self):
+        started = threading.active_count()
+
+        def pages():
+            while True:
+                yield [1]
+
+        results = resource2.prefetch_pages(pages(), 1)
+        next(results)
+        results.close()
+
+        self._wait_for_threads(started)
+
+    def test_error_raised_in_order(self):
+        def pages():
+            yield [1]
+            raise exceptions.HttpException("boom")
+
+        results = resource2.prefetch_pages(pages(), 2)
+
+        self.assertEqual([1], next(results))
+        self.assertRaises(exceptions.HttpException, next, results)
+
 
 class TestResourceFind(base.TestCase):
     def setUp(self):
@@ -1442,6 +2176,201 @@ class TestResourceFind(base.TestCase):
             exceptions.DuplicateResource,
             resource2.Resource._get_one_match, the_id, [match, match])
 
+    def test_find_large_listing(self):
+        # Benchmark-style check of find() falling back to a listing of
+        # 50k items, where the id of every item is read while matching.
+        # The runner's per-test timings show how long this takes.
+        count = 50000
+        the_name = "name-%d" % (count - 1)
+
+        class Test(resource2.Resource):
+            base_path = "/test"
+            resources_key = "items"
+            service = mock.Mock()
+            allow_get = True
+            allow_list = True
+            other_id = resource2.Body("other_id", alternate_id=True)
+
+        items = [{"other_id": "id-%d" % i, "name": "name-%d" % i}
+                 for i in range(count)]
+        response = mock.Mock()
+        response.json.return_value = {"items": items}
+        session = mock.Mock()
+        session.get.side_effect = [exceptions.NotFoundException, response]
+
+        result = Test.find(session, the_name)
+
+        self.assertEqual("id-%d" % (count - 1), result.id)
+        self.assertEqual(the_name, result.name)
+
+    def _find_class(self, name_key="name", **mapping):
+        class Test(resource2.Resource):
+            base_path = "/test"
+            resources_key = "items"
+            service = mock.Mock()
+            allow_get = True
+            allow_list = True
+            query_name_key = name_key
+            _query_mapping = resource2.QueryParameters(**mapping)
+
+        return Test
+
+    def _find_session(self, *pages):
+        responses = []
+        for page in pages:
+            response = mock.Mock()
+            response.json.return_value = {"items": page}
+            responses.append(response)
+        session = mock.Mock()
+        session.get.side_effect = [exceptions.NotFoundException] + responses
+        return session
+
+    def _list_params(self, session):
+        return [c[1]["params"] for c in session.get.call_args_list[1:]]
+
+    def test_find_name_filter(self):
+        Test = self._find_class(name="name")
+        session = self._find_session(
+            [{"id": "1", "name": "web-1"}, {"id": "2", "name": "web"}], [])
+
+        result = Test.find(session, "web")
+
+        self.assertEqual("2", result.id)
+        # One listing, without a request for a second page.
+        self.assertEqual([{"name": "web"}], self._list_params(session))
+
+    def test_find_name_filter_duplicate(self):
+        Test = self._find_class(name="name")
+        session = self._find_session(
+            [{"id": "1", "name": "web"}, {"id": "2", "name": "web"}])
+
+        self.assertRaises(exceptions.DuplicateResource, Test.find,
+                          session, "web")
+
+    def test_find_marker_ignored(self):
+        # Servers ignoring the marker return the same page again.
+        Test = self._find_class(name="name")
+        response = mock.Mock()
+        response.json.return_value = {"items": [{"id": "1",
+                                                 "name": "ubuntu"}]}
+        session = mock.Mock()
+
+        def get(uri, **kwargs):
+            if uri != "/test":
+                raise exceptions.NotFoundException
+            return response
+
+        session.get.side_effect = get
+
+        result = Test.find(session, "ubuntu")
+
+        self.assertEqual("1", result.id)
+        self.assertEqual([{"name": "ubuntu"}], self._list_params(session))
+
+    def test_find_name_key(self):
+        Test = self._find_class(name_key="display_name",
+                                display_name="displayName")
+        session = self._find_session([{"id": "1", "name": "web"}], [])
+
+        self.assertEqual("1", Test.find(session, "web").id)
+        self.assertEqual({"displayName": "web"},
+                         self._list_params(session)[0])
+
+    def test_find_name_given(self):
+        Test = self._find_class(name="name")
+        session = self._find_session([{"id": "1", "name": "web"}])
+
+        self.assertEqual("1", Test.find(session, "web", name="other").id)
+        self.assertEqual([{"name": "other"}], self._list_params(session))
+
+    def test_find_name_filter_not_accepted(self):
+        Test = self._find_class()
+        session = self._find_session([{"id": "1", "name": "web"}])
+
+        self.assertEqual("1", Test.find(session, "web").id)
+        self.assertEqual([{}], self._list_params(session))
+
+
+def _use_fake_clock(test):
+    """Make time.sleep advance the clock of the waiters instead of sleeping
+
+    :return: The mock of time.sleep.
+    """
+    now = [0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    sleep_patch = mock.patch("time.sleep", side_effect=sleep)
+    clock_patch = mock.patch.object(resource2, "_monotonic",
+                                    side_effect=lambda: now[0])
+    clock_patch.start()
+    test.addCleanup(clock_patch.stop)
+    mock_sleep = sleep_patch.start()
+    test.addCleanup(sleep_patch.stop)
+    return mock_sleep
+
+
+class TestPollingPolicy(base.TestCase):
+
+    def setUp(self):
+        super(TestPollingPolicy, self).setUp()
+        self.sleep = _use_fake_clock(self)
+
+    def _sleeps(self):
+        return [c[0][0] for c in self.sleep.call_args_list]
+
+    def test_backoff(self):
+        poll = resource2.PollingPolicy(1, 5, backoff=2, jitter=0).start(100)
+
+        for _ in range(5):
+            poll.sleep()
+
+        self.assertEqual([1, 2, 4, 5, 5], self._sleeps())
+
+    def test_reset(self):
+        poll = resource2.PollingPolicy(1, 5, backoff=2, jitter=0).start(100)
+
+        poll.sleep()
+        poll.sleep()
+        poll.reset()
+        poll.sleep()
+
+        self.assertEqual([1, 2, 1], self._sleeps())
+
+    @mock.patch("random.uniform", return_value=0.1)
+    def test_jitter(self, mock_uniform):
+        poll = resource2.PollingPolicy(10, jitter=0.2).start(100)
+
+        poll.sleep()
+
+        self.assertEqual([9], self._sleeps())
+        mock_uniform.assert_called_once_with(0, 0.2)
+
+    def test_retry_after(self):
+        poll = resource2.PollingPolicy(1, jitter=0).start(100)
+
+        poll.sleep(retry_after=7)
+        poll.sleep()
+
+        # The server's delay does not count towards the backoff.
+        self.assertEqual([7, 1], self._sleeps())
+
+    def test_deadline(self):
+        poll = resource2.PollingPolicy(2, jitter=0).start(5)
+
+        self.assertFalse(poll.expired)
+        poll.sleep()
+        poll.sleep(retry_after=60)
+
+        self.assertTrue(poll.expired)
+        self.assertEqual([2, 3], self._sleeps())
+
+    def test_max_interval_below_interval(self):
+        policy = resource2.PollingPolicy(60)
+
+        self.assertEqual(60, policy.max_interval)
+
 
 class TestWaitForStatus(base.TestCase):
     def test_immediate_status(self):
@@ -1485,15 +2414,16 @@ class TestWaitForStatus(base.TestCase):
                           resource2.wait_for_status,
                           "session", resource, status, [failure], 1, 5)
 
-    @mock.patch("time.sleep", return_value=None)
-    def test_timeout(self, mock_sleep):
+    def test_timeout(self):
+        _use_fake_clock(self)
         status = "loling"
         resource = mock.Mock()
 
         # The first "other" gets past the first check, and then three
         # pairs of "other" statuses run through the sleep counter loop,
         # after which time should be up. This is because we have a
-        # one second interval and three second waiting period.
+        # one second interval, growing to 1.5 seconds, and three second
+        # waiting period.
         statuses = ["other"] * 7
         type(resource).status = mock.PropertyMock(side_effect=statuses)
 
@@ -1510,6 +2440,288 @@ class TestWaitForStatus(base.TestCase):
                           resource2.wait_for_status,
                           "session", resource, "status", None, 0, -1)
 
+    def test_slow_requests_count(self):
+        status = "loling"
+        resource = mock.Mock()
+        resource.status = "other"
+        now = [0]
+
+        def get(session):
+            now[0] += 2
+
+        resource.get.side_effect = get
+
+        with mock.patch("time.sleep") as mock_sleep, mock.patch.object(
+                resource2, "_monotonic", side_effect=lambda: now[0]):
+            self.assertRaises(exceptions.ResourceTimeout,
+                              resource2.wait_for_status,
+                              "session", resource, status, None, 1, 5)
+
+        self.assertEqual(3, resource.get.call_count)
+        self.assertEqual(2, mock_sleep.call_count)
+
+    def test_retry_after(self):
+        mock_sleep = _use_fake_clock(self)
+        resource = mock.Mock()
+        resource.status = "other"
+        response = mock.Mock()
+        response.headers = {"Retry-After": "12"}
+        throttled = exceptions.HttpException(response=response,
+                                             http_status=429)
+
+        def get(session):
+            if resource.get.call_count == 1:
+                raise throttled
+            resource.status = "loling"
+
+        resource.get.side_effect = get
+
+        result = resource2.wait_for_status(
+            "session", resource, "loling", None, 1, 60,
+            policy=resource2.PollingPolicy(1, jitter=0))
+
+        self.assertEqual(resource, result)
+        self.assertEqual([12], [c[0][0] for c in mock_sleep.call_args_list])
+
+    def test_error(self):
+        _use_fake_clock(self)
+        resource = mock.Mock()
+        resource.status = "other"
+        resource.get.side_effect = exceptions.HttpException(http_status=500)
+
+        self.assertRaises(exceptions.HttpException,
+                          resource2.wait_for_status,
+                          "session", resource, "loling", None, 1, 60)
+
+
+class TestWaitForStatuses(base.TestCase):
+
+    def setUp(self):
+        super(TestWaitForStatuses, self).setUp()
+
+        class Listed(resource2.Resource):
+            base_path = "/listed"
+            allow_list = True
+            allow_status_list = True
+            status = resource2.Body("status")
+
+        class Fetched(resource2.Resource):
+            base_path = "/fetched"
+            allow_get = True
+            status = resource2.Body("status")
+
+        self.Listed = Listed
+        self.Fetched = Fetched
+        self.session = mock.Mock()
+        self.sleep = _use_fake_clock(self)
+        self.policy = resource2.PollingPolicy(1, 3, jitter=0)
+
+    def _listings(self, *ticks):
+        # Each tick maps ids to the status the listing reports for them.
+        return mock.patch.object(
+            self.Listed, "list_statuses",
+            side_effect=[[self.Listed.existing(id=id, status=status)
+                          for id, status in tick.items()]
+                         for tick in ticks])
+
+    def _fetches(self, statuses):
+        # statuses maps ids to the statuses returned by successive gets.
+        statuses = dict((id, list(values))
+                        for id, values in statuses.items())
+
+        def get(resource, session):
+            resource._body.attributes["status"] = statuses[resource.id].pop(0)
+            return resource
+
+        return mock.patch.object(self.Fetched, "get", autospec=True,
+                                 side_effect=get)
+
+    def test_immediate_status(self):
+        resources = [self.Fetched.existing(id="a", status="ACTIVE"),
+                     self.Listed.existing(id="b", status="ACTIVE")]
+
+        with self._fetches({}) as mock_get, self._listings() as mock_list:
+            result = list(resource2.wait_for_statuses(
+                self.session, resources, "ACTIVE"))
+
+        self.assertEqual(resources, result)
+        mock_get.assert_not_called()
+        mock_list.assert_not_called()
+        self.sleep.assert_not_called()
+
+    def test_one_listing_per_poll(self):
+        resources = [self.Listed.existing(id=id, status="BUILD")
+                     for id in ("a", "b", "c")]
+
+        with self._listings(
+                {"a": "BUILD", "b": "ACTIVE", "c": "BUILD", "x": "BUILD"},
+                {"a": "ERROR", "c": "BUILD"},
+                {"a": "ERROR", "c": "ACTIVE"}) as mock_list:
+            result = list(resource2.wait_for_statuses(
+                self.session, resources, "ACTIVE", failures=["ERROR"]))
+
+        self.assertEqual(["b", "a", "c"], [res.id for res in result])
+        self.assertEqual(["ACTIVE", "ERROR", "ACTIVE"],
+                         [res.status for res in result])
+        self.assertEqual(3, mock_list.call_count)
+        mock_list.assert_called_with(self.session)
+
+    def test_listing_per_uri(self):
+        class Nested(self.Listed):
+            base_path = "/parents/%(parent_id)s/listed"
+            parent_id = resource2.URI("parent_id")
+
+        resources = [Nested.existing(id="a", parent_id="p1", status="BUILD"),
+                     Nested.existing(id="b", parent_id="p2", status="BUILD"),
+                     Nested.existing(id="c", parent_id="p1", status="BUILD")]
+        listings = {
+            "p1": [Nested.existing(id="a", status="ACTIVE"),
+                   Nested.existing(id="c", status="ACTIVE")],
+            "p2": [Nested.existing(id="b", status="ACTIVE")],
+        }
+
+        with mock.patch.object(
+                Nested, "list_statuses",
+                side_effect=lambda session, parent_id: listings[parent_id]
+        ) as mock_list:
+            result = list(resource2.wait_for_statuses(
+                self.session, resources, "ACTIVE"))
+
+        self.assertEqual(["a", "b", "c"], [res.id for res in result])
+        self.assertEqual([mock.call(self.session, parent_id="p1"),
+                          mock.call(self.session, parent_id="p2")],
+                         mock_list.call_args_list)
+
+    def test_listing_filtered_by_id(self):
+        self.Listed._query_mapping = resource2.QueryParameters("id",
+                                                               "status")
+        resources = [self.Listed.existing(id=id, status="BUILD")
+                     for id in ("a", "b")]
+
+        with self._listings({"a": "ACTIVE", "b": "ACTIVE"}) as mock_list:
+            result = list(resource2.wait_for_statuses(
+                self.session, resources, "ACTIVE", failures=["ERROR"]))
+
+        self.assertEqual(["a", "b"], [res.id for res in result])
+        mock_list.assert_called_once_with(self.session, id=["a", "b"])
+
+    def test_listing_filtered_by_status(self):
+        self.Listed._query_mapping = resource2.QueryParameters("status")
+        resources = [self.Listed.existing(id=id, status="BUILD")
+                     for id in ("a", "b")]
+
+        with self._listings({"a": "ACTIVE"}, {},
+                            {"a": "ACTIVE", "b": "ACTIVE"}, {}) as mock_list, \
+                mock.patch.object(self.Listed, "get") as mock_get:
+            result = list(resource2.wait_for_statuses(
+                self.session, resources, "ACTIVE", failures=["ERROR"]))
+
+        self.assertEqual(["a", "b"], [res.id for res in result])
+        self.assertEqual([mock.call(self.session, status="ACTIVE"),
+                          mock.call(self.session, status="ERROR")] * 2,
+                         mock_list.call_args_list)
+        # Resources missing from a filtered listing are still pending.
+        mock_get.assert_not_called()
+
+    def test_get_when_listing_large(self):
+        resources = [self.Listed.existing(id=id, status="BUILD")
+                     for id in ("a", "b")]
+        listing = dict(("x%d" % i, "ACTIVE") for i in range(30))
+        listing.update({"a": "BUILD", "b": "BUILD"})
+
+        with self._listings(listing) as mock_list, mock.patch.object(
+                self.Listed, "get", autospec=True) as mock_get:
+            mock_get.side_effect = lambda res, session: res._update(
+                status="ACTIVE")
+            result = list(resource2.wait_for_statuses(
+                self.session, resources, "ACTIVE"))
+
+        self.assertEqual(["a", "b"], [res.id for res in result])
+        self.assertEqual(1, mock_list.call_count)
+        self.assertEqual(2, mock_get.call_count)
+
+    def test_get_when_not_listed(self):
+        resources = [self.Fetched.existing(id="a", status="BUILD"),
+                     self.Fetched.existing(id="b", status="BUILD")]
+
+        with self._fetches({"a": ["BUILD", "ACTIVE"],
+                            "b": ["ACTIVE"]}) as mock_get:
+            result = list(resource2.wait_for_statuses(
+                self.session, resources, "ACTIVE", max_workers=2))
+
+        self.assertEqual(["b", "a"], [res.id for res in result])
+        self.assertEqual(3, mock_get.call_count)
+
+    def test_get_when_missing_from_listing(self):
+        resource = self.Listed.existing(id="a", status="BUILD")
+
+        with self._listings({"x": "BUILD"}), mock.patch.object(
+                self.Listed, "get", autospec=True) as mock_get:
+            mock_get.side_effect = lambda res, session: res._update(
+                status="ACTIVE")
+            result = list(resource2.wait_for_statuses(
+                self.session, [resource], "ACTIVE"))
+
+        self.assertEqual([resource], result)
+        mock_get.assert_called_once_with(resource, self.session)
+
+    def test_get_error(self):
+        resource = self.Fetched.existing(id="a", status="BUILD")
+
+        with mock.patch.object(self.Fetched, "get", autospec=True,
+                               side_effect=exceptions.NotFoundException):
+            self.assertRaises(exceptions.NotFoundException, list,
+                              resource2.wait_for_statuses(
+                                  self.session, [resource], "ACTIVE"))
+
+    def test_backoff(self):
+        resources = [self.Fetched.existing(id="a", status="BUILD"),
+                     self.Fetched.existing(id="b", status="BUILD")]
+
+        with self._fetches({"a": ["BUILD"] * 5 + ["ACTIVE"],
+                            "b": ["BUILD"] * 6 + ["ACTIVE"]}):
+            list(resource2.wait_for_statuses(
+                self.session, resources, "ACTIVE", policy=self.policy))
+
+        self.assertEqual([1, 1.5, 2.25, 3, 3, 1],
+                         [c[0][0] for c in self.sleep.call_args_list])
+
+    def test_timeout(self):
+        resources = [self.Fetched.existing(id="a", status="BUILD"),
+                     self.Fetched.existing(id="b", status="BUILD")]
+
+        settled = []
+        with self._fetches({"a": ["BUILD", "ACTIVE"],
+                            "b": ["BUILD"] * 4}):
+            waiter = resource2.wait_for_statuses(
+                self.session, resources, "ACTIVE", wait=3,
+                policy=self.policy)
+            error = self.assertRaises(exceptions.ResourceTimeout,
+                                      settled.extend, waiter)
+
+        self.assertEqual(["a"], [res.id for res in settled])
+        self.assertIn("b", str(error))
+        self.assertEqual([1, 1, 1],
+                         [c[0][0] for c in self.sleep.call_args_list])
+
+    def test_throttled(self):
+        resources = [self.Listed.existing(id="a", status="BUILD"),
+                     self.Fetched.existing(id="b", status="BUILD")]
+        response = mock.Mock()
+        response.headers = {"Retry-After": "20"}
+        throttled = exceptions.HttpException(response=response,
+                                             http_status=503)
+        listed = [self.Listed.existing(id="a", status="ACTIVE")]
+
+        with mock.patch.object(self.Listed, "list_statuses",
+                               side_effect=[throttled, listed]), \
+                self._fetches({"b": ["BUILD", "ACTIVE"]}):
+            result = list(resource2.wait_for_statuses(
+                self.session, resources, "ACTIVE", policy=self.policy))
+
+        self.assertEqual(["a", "b"], [res.id for res in result])
+        self.assertEqual([20], [c[0][0] for c in self.sleep.call_args_list])
+
 
 class TestWaitForDelete(base.TestCase):
     @mock.patch("time.sleep", return_value=None)
@@ -1521,8 +2733,8 @@ class TestWaitForDelete(base.TestCase):
 
         self.assertEqual(result, resource)
 
-    @mock.patch("time.sleep", return_value=None)
-    def test_timeout(self, mock_sleep):
+    def test_timeout(self):
+        _use_fake_clock(self)
         resource = mock.Mock()
         resource.get.side_effect = [None, None, None]
 
@@ -0,0 +1,175 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from openstack import resource2
+from openstack import resource_cache
+from openstack.tests.unit import base
+
+
+class Cached(resource2.Resource):
+    cache_ttl = 60
+    attr = resource2.Body("attr")
+
+
+class CachedDetail(Cached):
+    pass
+
+
+class Uncached(resource2.Resource):
+    attr = resource2.Body("attr")
+
+
+class TestResourceCache(base.TestCase):
+
+    def setUp(self):
+        super(TestResourceCache, self).setUp()
+        self.sot = resource_cache.ResourceCache()
+        self.now = 1000.0
+        time_patcher = mock.patch("time.time", side_effect=lambda: self.now)
+        time_patcher.start()
+        self.addCleanup(time_patcher.stop)
+
+    def _fetch(self, resource_type, key, attr="value"):
+        fetch = mock.Mock(return_value=resource_type.existing(id=key,
+                                                              attr=attr))
+        return self.sot.fetch(resource_type, key, fetch), fetch
+
+    def test_miss_then_hit(self):
+        first, fetch = self._fetch(Cached, "a")
+        fetch.assert_called_once_with()
+        self.assertEqual((0, 1), (self.sot.hits, self.sot.misses))
+
+        second, fetch = self._fetch(Cached, "a", attr="changed")
+
+        fetch.assert_not_called()
+        self.assertEqual("value", second.attr)
+        self.assertEqual((1, 1), (self.sot.hits, self.sot.misses))
+
+    def test_hit_returns_copy(self):
+        first, _ = self._fetch(Cached, "a")
+        first.attr = "modified"
+
+        second, _ = self._fetch(Cached, "a")
+        second.attr = "modified again"
+
+        third, _ = self._fetch(Cached, "a")
+        self.assertEqual("value", third.attr)
+
+    def test_expired(self):
+        self._fetch(Cached, "a")
+        self.now += 61
+
+        res, fetch = self._fetch(Cached, "a", attr="new")
+
+        fetch.assert_called_once_with()
+        self.assertEqual("new", res.attr)
+        self.assertEqual((0, 2), (self.sot.hits, self.sot.misses))
+
+    def test_uncached_type(self):
+        self._fetch(Uncached, "a")
+        _, fetch = self._fetch(Uncached, "a")
+
+        fetch.assert_called_once_with()
+        self.assertEqual((0, 0), (self.sot.hits, self.sot.misses))
+        self.assertEqual({}, self.sot.stats())
+
+    def test_none_not_cached(self):
+        fetch = mock.Mock(return_value=None)
+        self.sot.fetch(Cached, "a", fetch)
+        self.sot.fetch(Cached, "a", fetch)
+
+        self.assertEqual(2, fetch.call_count)
+
+    def test_unhashable_key(self):
+        fetch = mock.Mock(return_value=Cached())
+        self.sot.fetch(Cached, ["a"], fetch)
+        self.sot.fetch(Cached, ["a"], fetch)
+
+        self.assertEqual(2, fetch.call_count)
+
+    def test_policy(self):
+        self.sot.policies[Uncached] = resource_cache.CachePolicy(ttl=10)
+        self._fetch(Uncached, "a")
+        _, fetch = self._fetch(Uncached, "a")
+        fetch.assert_not_called()
+
+        self.now += 11
+        _, fetch = self._fetch(Uncached, "a")
+        fetch.assert_called_once_with()
+
+    def test_policy_disables(self):
+        self.sot.policies[Cached] = resource_cache.CachePolicy(ttl=None)
+        self._fetch(CachedDetail, "a")
+        _, fetch = self._fetch(CachedDetail, "a")
+
+        fetch.assert_called_once_with()
+
+    def test_lru_eviction(self):
+        self.sot.policies[Cached] = resource_cache.CachePolicy(ttl=60,
+                                                               max_size=2)
+        self._fetch(Cached, "a")
+        self._fetch(Cached, "b")
+        self._fetch(Cached, "a")
+        self._fetch(Cached, "c")
+
+        _, fetch_a = self._fetch(Cached, "a")
+        _, fetch_b = self._fetch(Cached, "b")
+
+        fetch_a.assert_not_called()
+        fetch_b.assert_called_once_with()
+        stats = self.sot.stats()[Cached]
+        self.assertEqual(2, stats.evictions)
+        self.assertEqual(2, stats.size)
+
+    def test_invalidate_related_types(self):
+        self._fetch(Cached, "a")
+        self._fetch(CachedDetail, "a")
+        self.sot.policies[Uncached] = resource_cache.CachePolicy(ttl=10)
+        self._fetch(Uncached, "a")
+
+        self.sot.invalidate(CachedDetail)
+
+        self.assertEqual(1, self._fetch(Cached, "a")[1].call_count)
+        self.assertEqual(1, self._fetch(CachedDetail, "a")[1].call_count)
+        self.assertEqual(0, self._fetch(Uncached, "a")[1].call_count)
+
+    def test_clear(self):
+        self._fetch(Cached, "a")
+
+        self.sot.clear()
+
+        self.assertEqual(1, self._fetch(Cached, "a")[1].call_count)
+        self.assertEqual(0, self.sot.stats()[Cached].hits)
+
+    def test_invalidate_during_fetch(self):
+        def fetch():
+            self.sot.invalidate(Cached)
+            return Cached(attr="stale")
+
+        self.sot.fetch(Cached, "a", fetch)
+
+        self.assertEqual(1, self._fetch(Cached, "a")[1].call_count)
+
+    def test_stats(self):
+        self._fetch(Cached, "a")
+        self._fetch(Cached, "a")
+        self._fetch(CachedDetail, "a")
+
+        stats = self.sot.stats()
+
+        self.assertEqual((1, 1, 1), (stats[Cached].hits,
+                                     stats[Cached].misses,
+                                     stats[Cached].size))
+        self.assertEqual((0, 1), (stats[CachedDetail].hits,
+                                  stats[CachedDetail].misses))
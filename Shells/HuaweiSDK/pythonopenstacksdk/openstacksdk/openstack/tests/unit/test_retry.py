@@ -0,0 +1,88 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import io
+
+from keystoneauth1 import exceptions as _exceptions
+import mock
+
+from openstack import retry
+from openstack.tests.unit import base
+
+
+def _http_error(status, retry_after=None):
+    response = mock.Mock()
+    response.headers = {}
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return _exceptions.HttpError(response=response, http_status=status)
+
+
+class TestRetryPolicy(base.TestCase):
+
+    def setUp(self):
+        super(TestRetryPolicy, self).setUp()
+        self.sot = retry.RetryPolicy(retries=3, backoff=1, max_backoff=3,
+                                     jitter=0)
+
+    def test_backoff(self):
+        error = _http_error(503)
+        self.assertEqual([1, 2, 3],
+                         [self.sot.get_delay("GET", attempt, error)
+                          for attempt in range(3)])
+        self.assertIsNone(self.sot.get_delay("GET", 3, error))
+
+    @mock.patch("random.uniform", return_value=0.25)
+    def test_jitter(self, mock_uniform):
+        self.sot.jitter = 0.5
+
+        self.assertEqual(1.5, self.sot.get_delay("GET", 1, _http_error(429)))
+        mock_uniform.assert_called_once_with(0, 0.5)
+
+    def test_retry_after(self):
+        self.assertEqual(7, self.sot.get_delay("GET", 0,
+                                               _http_error(429, "7")))
+
+    def test_retry_after_too_long(self):
+        self.sot.max_retry_after = 60
+
+        self.assertIsNone(self.sot.get_delay("GET", 0,
+                                             _http_error(503, "3600")))
+
+    def test_status_not_retried(self):
+        for status in (400, 404, 409, 500):
+            self.assertIsNone(self.sot.get_delay("GET", 0,
+                                                 _http_error(status)))
+
+    def test_method_not_retried(self):
+        self.assertIsNone(self.sot.get_delay("POST", 0, _http_error(503)))
+        self.assertIsNone(self.sot.get_delay("PATCH", 0, _http_error(429)))
+        self.assertEqual(1, self.sot.get_delay("put", 0, _http_error(429)))
+
+    def test_connection_errors(self):
+        for error in (_exceptions.ConnectFailure(),
+                      _exceptions.ConnectTimeout(),
+                      _exceptions.UnknownConnectionError("reset", None)):
+            self.assertEqual(1, self.sot.get_delay("DELETE", 0, error))
+        self.assertIsNone(self.sot.get_delay("GET", 0,
+                                             _exceptions.SSLError()))
+        self.assertIsNone(self.sot.get_delay(
+            "GET", 0, _exceptions.ClientException()))
+
+    def test_body(self):
+        error = _http_error(503)
+        self.assertEqual(1, self.sot.get_delay("PUT", 0, error, data=b"x"))
+        self.assertEqual(1, self.sot.get_delay("PUT", 0, error, data=u"x"))
+        self.assertIsNone(self.sot.get_delay("PUT", 0, error,
+                                             data=io.BytesIO(b"x")))
+        self.assertIsNone(self.sot.get_delay("PUT", 0, error,
+                                             data=iter([b"x"])))
@@ -11,12 +11,19 @@
 # under the License.
 
 import mock
+import requests
 import testtools
 
 from keystoneauth1 import exceptions as _exceptions
+from keystoneauth1 import session as _session
 
+from openstack import coalesce
+from openstack import discovery_cache
 from openstack import exceptions
+from openstack import metrics
 from openstack import profile
+from openstack import retry
+from openstack import service_filter
 from openstack import session
 from openstack import utils
 
@@ -71,6 +78,34 @@ class TestSession(testtools.TestCase):
 
         self.assertEqual({}, sot.additional_headers)
 
+    def test_init_pool_options(self):
+        sot = session.Session(None, pool_connections=4, pool_maxsize=32,
+                              pool_block=True, max_retries=2)
+
+        for scheme in ("https://", "http://"):
+            adapter = sot.session.adapters[scheme]
+            self.assertIsInstance(adapter, _session.TCPKeepAliveAdapter)
+            self.assertEqual(4, adapter._pool_connections)
+            self.assertEqual(32, adapter._pool_maxsize)
+            self.assertTrue(adapter._pool_block)
+            self.assertEqual(2, adapter.max_retries.total)
+
+    def test_init_pool_options_default(self):
+        sot = session.Session(None)
+
+        adapter = sot.session.adapters["https://"]
+        self.assertIsInstance(adapter, _session.TCPKeepAliveAdapter)
+        self.assertEqual(requests.adapters.DEFAULT_POOLSIZE,
+                         adapter._pool_maxsize)
+
+    def test_init_pool_options_given_session(self):
+        http = requests.Session()
+
+        sot = session.Session(None, session=http, pool_maxsize=32)
+
+        self.assertIs(http, sot.session)
+        self.assertEqual(32, http.adapters["https://"]._pool_maxsize)
+
     def _assert_map_exceptions(self, expected_exc, ksa_exc, func):
         os_exc = self.assertRaises(
             expected_exc, session.map_exceptions(func))
@@ -430,3 +465,332 @@ class TestSession(testtools.TestCase):
         sot.endpoint_cache[(service_type, interface)] = endpoint
         rv = sot.get_endpoint(service_type=service_type, interface=interface)
         self.assertEqual(rv, endpoint)
+
+    def _not_found(self):
+        response = mock.Mock()
+        response.json = mock.Mock(return_value={})
+        response.headers = {"content-type": "application/json"}
+        response.status_code = 404
+        return _exceptions.NotFound(response=response)
+
+    def _discovery_session(self, cached=None):
+        prof = mock.Mock()
+        prof.get_services.return_value = []
+        prof.get_filter.return_value = service_filter.ServiceFilter(
+            "compute", region="region", version="v2")
+        cache = mock.Mock(spec=discovery_cache.DiscoveryCache)
+        cache.get.return_value = cached
+        sot = session.Session(prof, discovery_cache=cache)
+        sot.auth = mock.Mock(auth_url="http://auth")
+        return sot, cache
+
+    @mock.patch("keystoneauth1.session.Session.get_endpoint",
+                return_value="http://compute/v2/project")
+    def test_get_endpoint_discovery_cache_hit(self, mock_get_endpoint):
+        sot, cache = self._discovery_session(
+            {"catalog": "http://compute/v2/project",
+             "endpoint": "http://compute/v2.1/project"})
+        sot._get_endpoint_versions = mock.Mock()
+
+        rv = sot.get_endpoint(service_type="compute", interface="public")
+
+        self.assertEqual("http://compute/v2.1/project", rv)
+        cache.get.assert_called_once_with(
+            ("http://auth", "region", "compute", "public", "v2"))
+        sot._get_endpoint_versions.assert_not_called()
+        self.assertEqual(rv, sot.endpoint_cache[("compute", "public")])
+
+    @mock.patch("keystoneauth1.session.Session.get_endpoint",
+                return_value="http://compute/v2/project")
+    def test_get_endpoint_discovery_cache_miss(self, mock_get_endpoint):
+        sot, cache = self._discovery_session(
+            {"catalog": "http://compute/v2/other",
+             "endpoint": "http://compute/v2.1/other"})
+        endpoint = session.Session._Endpoint(
+            "http://compute",
+            [{"id": "v2.0", "links": [{"href": "http://compute/v2",
+                                       "rel": "self"}]}],
+            needs_project_id=True, project_id="project")
+        sot._get_endpoint_versions = mock.Mock(return_value=endpoint)
+
+        rv = sot.get_endpoint(service_type="compute", interface="public")
+
+        self.assertEqual("http://compute/v2/project", rv)
+        cache.set.assert_called_once_with(
+            ("http://auth", "region", "compute", "public", "v2"),
+            {"catalog": "http://compute/v2/project",
+             "endpoint": "http://compute/v2/project"})
+
+    @mock.patch("keystoneauth1.session.Session.get_endpoint",
+                return_value="http://compute/v2/project")
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_not_found_invalidates_cached_endpoint(
+            self, mock_request, mock_get_endpoint):
+        sot, cache = self._discovery_session(
+            {"catalog": "http://compute/v2/project",
+             "endpoint": "http://compute/v2.1/project"})
+        sot.get_endpoint(service_type="compute", interface="public")
+        sot.get_project_id = mock.Mock(return_value="project")
+        endpoint_filter = service_filter.ServiceFilter("compute")
+        mock_request.side_effect = self._not_found()
+
+        self.assertRaises(exceptions.NotFoundException, sot.request,
+                          "/servers", "GET", endpoint_filter=endpoint_filter)
+
+        mock_request.assert_called_with("http://compute/v2.1/", "GET",
+                                        raise_exc=False)
+        cache.invalidate.assert_called_once_with(
+            ("http://auth", "region", "compute", "public", "v2"))
+        self.assertNotIn(("compute", "public"), sot.endpoint_cache)
+
+    @mock.patch("keystoneauth1.session.Session.get_endpoint",
+                return_value="http://compute/v2/project")
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_not_found_keeps_valid_cached_endpoint(
+            self, mock_request, mock_get_endpoint):
+        sot, cache = self._discovery_session(
+            {"catalog": "http://compute/v2/project",
+             "endpoint": "http://compute/v2.1/project"})
+        sot.get_endpoint(service_type="compute", interface="public")
+        sot.get_project_id = mock.Mock(return_value="project")
+        endpoint_filter = service_filter.ServiceFilter("compute")
+        mock_request.side_effect = [self._not_found(),
+                                    mock.Mock(status_code=200),
+                                    self._not_found()]
+
+        # A resource which does not exist, as find() asks for first.
+        for _ in range(2):
+            self.assertRaises(exceptions.NotFoundException, sot.request,
+                              "/servers/name", "GET",
+                              endpoint_filter=endpoint_filter)
+
+        # The version root was only requested after the first 404.
+        self.assertEqual(3, mock_request.call_count)
+        cache.invalidate.assert_not_called()
+        self.assertEqual("http://compute/v2.1/project",
+                         sot.endpoint_cache[("compute", "public")])
+
+    @mock.patch("keystoneauth1.session.Session.get_endpoint",
+                return_value="http://compute/v2/project")
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_not_found_after_verified(self, mock_request,
+                                              mock_get_endpoint):
+        sot, cache = self._discovery_session(
+            {"catalog": "http://compute/v2/project",
+             "endpoint": "http://compute/v2.1/project"})
+        sot.get_endpoint(service_type="compute", interface="public")
+        endpoint_filter = service_filter.ServiceFilter("compute")
+        sot.request("/servers", "GET", endpoint_filter=endpoint_filter)
+        mock_request.side_effect = self._not_found()
+
+        self.assertRaises(exceptions.NotFoundException, sot.request,
+                          "/servers/1", "GET",
+                          endpoint_filter=endpoint_filter)
+
+        cache.invalidate.assert_not_called()
+        self.assertIn(("compute", "public"), sot.endpoint_cache)
+
+    def _metrics_session(self):
+        prof = mock.Mock()
+        prof.get_services.return_value = []
+        request_metrics = metrics.RequestMetrics()
+        return session.Session(prof, metrics=request_metrics), request_metrics
+
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_metrics(self, mock_request):
+        sot, request_metrics = self._metrics_session()
+        response = mock.Mock(status_code=200,
+                             headers={"Content-Length": "12"})
+        mock_request.return_value = response
+        before = mock.Mock()
+        request_metrics.before_hooks.append(
+            lambda info: info.headers.update({"X-Trace": "1"}))
+        request_metrics.after_hooks.append(before)
+        endpoint_filter = service_filter.ServiceFilter("compute")
+
+        rv = sot.request("/servers/0f3c9a5e-6c4b-4d1e-9c43-2f4c1f7b3a10",
+                         "GET", endpoint_filter=endpoint_filter)
+
+        self.assertIs(response, rv)
+        self.assertEqual("1", mock_request.call_args[1]["headers"]["X-Trace"])
+        info = before.call_args[0][0]
+        self.assertEqual((200, 12), (info.status_code, info.response_size))
+        series, = request_metrics.snapshot()
+        self.assertEqual(("compute", "GET", "/servers/{id}", 1, {"200": 1}),
+                         (series["service_type"], series["method"],
+                          series["url"], series["count"],
+                          series["statuses"]))
+
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_metrics_error(self, mock_request):
+        sot, request_metrics = self._metrics_session()
+        error = self._not_found()
+        error.response.content = b"{}"
+        mock_request.side_effect = error
+
+        self.assertRaises(exceptions.NotFoundException, sot.request,
+                          url="/servers/1", method="get")
+
+        series, = request_metrics.snapshot()
+        self.assertEqual((None, "GET", "/servers/{id}", {"404": 1}, 2),
+                         (series["service_type"], series["method"],
+                          series["url"], series["statuses"],
+                          series["response_bytes"]))
+
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_metrics_connection_error(self, mock_request):
+        sot, request_metrics = self._metrics_session()
+        mock_request.side_effect = _exceptions.ConnectFailure()
+
+        self.assertRaises(exceptions.SDKException, sot.request,
+                          "/servers", "GET")
+
+        series, = request_metrics.snapshot()
+        self.assertEqual({"error": 1}, series["statuses"])
+
+    def _retry_session(self):
+        prof = mock.Mock()
+        prof.get_services.return_value = []
+        request_metrics = metrics.RequestMetrics()
+        policy = retry.RetryPolicy(retries=2, jitter=0)
+        sot = session.Session(prof, metrics=request_metrics,
+                              retry_policy=policy)
+        return sot, request_metrics
+
+    def _throttled(self, retry_after="1"):
+        response = mock.Mock(status_code=429, content=b"",
+                             headers={"Retry-After": retry_after})
+        return _exceptions.HttpError(response=response, http_status=429)
+
+    @mock.patch("time.sleep")
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_retry(self, mock_request, mock_sleep):
+        sot, request_metrics = self._retry_session()
+        response = mock.Mock(status_code=200, headers={}, content=b"")
+        mock_request.side_effect = [self._throttled("2"),
+                                    _exceptions.ConnectFailure(), response]
+
+        rv = sot.request("/servers", "GET")
+
+        self.assertIs(response, rv)
+        self.assertEqual([mock.call(2.0), mock.call(1.0)],
+                         mock_sleep.call_args_list)
+        series, = request_metrics.snapshot()
+        self.assertEqual((3, 2, {"200": 1, "429": 1, "error": 1}),
+                         (series["count"], series["retries"],
+                          series["statuses"]))
+
+    @mock.patch("time.sleep")
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_retries_exhausted(self, mock_request, mock_sleep):
+        sot, _ = self._retry_session()
+        mock_request.side_effect = [self._throttled() for _ in range(3)]
+
+        self.assertRaises(exceptions.HttpException, sot.request,
+                          "/servers", "GET")
+        self.assertEqual(3, mock_request.call_count)
+        self.assertEqual(2, mock_sleep.call_count)
+
+    @mock.patch("time.sleep")
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_post_not_retried(self, mock_request, mock_sleep):
+        sot, _ = self._retry_session()
+        mock_request.side_effect = self._throttled()
+
+        self.assertRaises(exceptions.HttpException, sot.request,
+                          "/servers", "POST", json={})
+        self.assertEqual(1, mock_request.call_count)
+        mock_sleep.assert_not_called()
+
+    @mock.patch("time.sleep")
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_without_retry_policy(self, mock_request, mock_sleep):
+        prof = mock.Mock()
+        prof.get_services.return_value = []
+        sot = session.Session(prof)
+        mock_request.side_effect = self._throttled()
+
+        self.assertRaises(exceptions.HttpException, sot.request,
+                          "/servers", "GET")
+        self.assertEqual(1, mock_request.call_count)
+        mock_sleep.assert_not_called()
+
+    def _limited_session(self, limit):
+        prof = profile.Profile()
+        prof.set_rate_limit("compute", rate=1)
+        prof._get_filter("compute").rate_limit = limit
+        request_metrics = metrics.RequestMetrics()
+        sot = session.Session(prof, metrics=request_metrics)
+        return sot, request_metrics
+
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_rate_limit(self, mock_request):
+        limit = mock.Mock()
+        limit.acquire.return_value = 0.25
+        sot, request_metrics = self._limited_session(limit)
+        mock_request.return_value = mock.Mock(status_code=202, headers={},
+                                              content=b"")
+
+        sot.request("/servers", "GET",
+                    endpoint_filter={"service_type": "compute"})
+        sot.request("/networks", "GET",
+                    endpoint_filter={"service_type": "network"})
+
+        limit.acquire.assert_called_once_with()
+        limit.release.assert_called_once_with(202)
+        snapshot = request_metrics.snapshot()
+        self.assertEqual([0.25, 0.0],
+                         [series["queue_wait"] for series in snapshot])
+
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_rate_limit_error(self, mock_request):
+        limit = mock.Mock()
+        limit.acquire.return_value = 0.0
+        sot, _ = self._limited_session(limit)
+        response = mock.Mock(status_code=429, headers={}, content=b"")
+        mock_request.side_effect = [
+            _exceptions.HttpError(response=response, http_status=429),
+            _exceptions.ConnectFailure()]
+
+        for _ in range(2):
+            self.assertRaises(exceptions.SDKException, sot.request,
+                              "/servers", "GET",
+                              endpoint_filter={"service_type": "compute"})
+
+        self.assertEqual([mock.call(429), mock.call(None)],
+                         limit.release.call_args_list)
+
+    def test_rate_limits_from_profile(self):
+        prof = profile.Profile()
+        prof.set_rate_limit("ecs", max_concurrency=4)
+
+        sot = session.Session(prof)
+
+        self.assertEqual({"ecs": prof.get_rate_limit("ecs")},
+                         sot.rate_limits)
+
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_coalesced(self, mock_request):
+        sot = session.Session(None,
+                              coalescer=coalesce.RequestCoalescer(window=5))
+        responses = [mock.Mock(), mock.Mock()]
+        mock_request.side_effect = responses
+
+        first = sot.request("/flavors", "GET", params={"name": "a"})
+        second = sot.request("/flavors", "GET", params={"name": "a"})
+        third = sot.request("/flavors", "POST", json={})
+
+        self.assertIs(responses[0], first)
+        self.assertIs(responses[0], second)
+        self.assertIs(responses[1], third)
+        self.assertEqual(2, mock_request.call_count)
+        self.assertEqual(1, sot.coalescer.coalesced)
+
+    @mock.patch("keystoneauth1.session.Session.request")
+    def test_request_not_coalesced_without_coalescer(self, mock_request):
+        sot = session.Session(None)
+
+        sot.request("/flavors", "GET")
+        sot.request("/flavors", "GET")
+
+        self.assertEqual(2, mock_request.call_count)
@@ -88,3 +88,30 @@ class Test_urljoin(testtools.TestCase):
 
         result = utils.urljoin(root, *leaves)
         self.assertEqual(result, "http://www.example.com/foo/")
+
+
+class Test_get_retry_after(testtools.TestCase):
+
+    def _response(self, value):
+        response = mock.Mock()
+        response.headers = {} if value is None else {"Retry-After": value}
+        return response
+
+    def test_seconds(self):
+        self.assertEqual(120, utils.get_retry_after(self._response("120")))
+
+    def test_negative_seconds(self):
+        self.assertEqual(0, utils.get_retry_after(self._response("-3")))
+
+    @mock.patch("time.time", return_value=784111747)
+    def test_date(self, mock_time):
+        value = "Sun, 06 Nov 1994 08:49:37 GMT"
+
+        self.assertEqual(30, utils.get_retry_after(self._response(value)))
+
+    def test_missing(self):
+        self.assertIsNone(utils.get_retry_after(self._response(None)))
+        self.assertIsNone(utils.get_retry_after(None))
+
+    def test_invalid(self):
+        self.assertIsNone(utils.get_retry_after(self._response("soon")))
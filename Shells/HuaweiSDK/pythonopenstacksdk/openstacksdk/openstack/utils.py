@@ -10,10 +10,24 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 import base64
+import contextlib
+import email.utils
 import functools
+import json
 import logging
+import os
+import tempfile
 import time
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
 import deprecation
 import six
 
@@ -113,3 +127,90 @@ def b64encode(source):
         source = source.encode('utf-8')
     content = base64.b64encode(source).decode('utf-8')
     return content
+
+
+def get_retry_after(response):
+    """Return the number of seconds a response asks to wait before retrying
+
+    :param response: A response with a ``Retry-After`` header giving either
+                     a number of seconds or an HTTP date.
+    :return: The number of seconds, or ``None`` when there is no valid
+             header.
+    """
+    value = None if response is None else response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    date = email.utils.parsedate_tz(value)
+    if date is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(date) - time.time())
+
+
+def get_cache_dir():
+    """Return the directory this package caches files in for the user"""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = (os.environ.get("XDG_CACHE_HOME") or
+                os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "openstack")
+
+
+def read_json_file(path):
+    """Return the content of a JSON file, or ``None`` if it is unreadable"""
+    try:
+        with open(path) as json_file:
+            return json.load(json_file)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def write_json_file(path, data):
+    """Atomically replace the content of a JSON file
+
+    The data is written to a temporary file which is then renamed, so that
+    readers never see a partially written file. The file is only readable
+    by its owner. Missing directories are created.
+    """
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp")
+    with os.fdopen(fd, "w") as temp_file:
+        json.dump(data, temp_file)
+    try:
+        os.rename(temp_path, path)
+    except OSError:
+        # Windows does not replace existing files on rename.
+        os.remove(path)
+        os.rename(temp_path, path)
+
+
+@contextlib.contextmanager
+def lock_file(path):
+    """Hold an exclusive lock on a file, shared between processes
+
+    The lock file is created if needed, along with its directory. Where
+    neither ``fcntl`` nor ``msvcrt`` is available, nothing is locked.
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(path, "a") as locked:
+        if fcntl is not None:
+            fcntl.flock(locked.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            locked.seek(0)
+            msvcrt.locking(locked.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(locked.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                locked.seek(0)
+                msvcrt.locking(locked.fileno(), msvcrt.LK_UNLCK, 1)
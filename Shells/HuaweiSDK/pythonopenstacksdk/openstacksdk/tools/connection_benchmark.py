@@ -0,0 +1,76 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Measure the cost of creating a :class:`~openstack.connection.Connection`.
+
+Each measurement runs in a new interpreter so that no module is imported
+beforehand, which is the situation of a short-lived command. Three cases
+are timed:
+
+* ``lazy``: creating a connection, which loads no proxy.
+* ``one service``: creating a connection and using ``conn.compute``.
+* ``eager``: creating a connection and loading every proxy of the profile,
+  which is what creating a connection used to do.
+
+Run it from the root of the source tree::
+
+    python tools/connection_benchmark.py --runs 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+SCRIPT = """
+import time
+start = time.time()
+from openstack import connection
+from openstack import profile
+conn = connection.Connection(authenticator=object(),
+                             profile=profile.Profile())
+%s
+print(time.time() - start)
+"""
+
+CASES = [
+    ("lazy", ""),
+    ("one service", "conn.compute"),
+    ("eager", "for name in list(conn._services):\n    getattr(conn, name)"),
+]
+
+
+def measure(code, runs):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    times = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, "-c", SCRIPT % code], env=env)
+        times.append(float(output.decode().split()[-1]))
+    return sorted(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Number of interpreters started per case")
+    args = parser.parse_args()
+
+    for name, code in CASES:
+        times = measure(code, args.runs)
+        print("%-12s min %6.1f ms  median %6.1f ms" %
+              (name, times[0] * 1000, times[len(times) // 2] * 1000))
+
+
+if __name__ == "__main__":
+    main()
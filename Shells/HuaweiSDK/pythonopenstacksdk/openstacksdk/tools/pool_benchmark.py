@@ -0,0 +1,110 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Count the connections opened by a :class:`~openstack.session.Session`.
+
+A local HTTP server stands in for a service endpoint, and counts the TCP
+connections it accepts. Against a real HTTPS endpoint each of them costs a
+TLS handshake. Requests are fanned out over threads, first with the default
+connection pool and then with one sized for the number of threads.
+
+Run it from the root of the source tree::
+
+    python tools/pool_benchmark.py --threads 32 --requests 2000
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openstack import session  # noqa
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        BaseHTTPServer.HTTPServer.__init__(self, ("127.0.0.1", 0), Handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+
+
+def run(server, threads, requests, **pool_options):
+    sess = session.Session(None, **pool_options)
+    url = "http://127.0.0.1:%d/" % server.server_address[1]
+    per_thread = requests // threads
+
+    def work():
+        for _ in range(per_thread):
+            sess.get(url, authenticated=False, log=False)
+
+    server.connections = 0
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    start = time.time()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return server.connections, time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    server = Server()
+    serving = threading.Thread(target=server.serve_forever)
+    serving.daemon = True
+    serving.start()
+
+    cases = [("default pool", {}),
+             ("pool_maxsize=%d" % args.threads,
+              {"pool_maxsize": args.threads})]
+    for name, options in cases:
+        connections, elapsed = run(server, args.threads, args.requests,
+                                   **options)
+        print("%-18s %5d connections  %6.2f s" % (name, connections, elapsed))
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Measure the cost of deserializing a large listing into Resources.
+
+A fake session returns one page holding every item, so only the work of
+:meth:`~openstack.resource2.Resource.list` is timed. Two cases are run:
+
+* ``mro walk``: the components of the class are looked up again on each
+  call, by walking its MRO, which is what every Resource used to do.
+* ``class tables``: the per-class tables built once by
+  ``_ComponentRegistry``, which is what Resources do now.
+
+Run it from the root of the source tree::
+
+    python tools/resource_list_benchmark.py --items 50000 --runs 3
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openstack import resource2  # noqa
+from openstack import service_filter  # noqa
+
+
+class Server(resource2.Resource):
+    base_path = "/servers"
+    resources_key = "items"
+    service = service_filter.ServiceFilter(service_type="benchmark")
+    allow_list = True
+
+    name = resource2.Body("name")
+    status = resource2.Body("status")
+    flavor = resource2.Body("flavor", type=dict)
+    location = resource2.Header("location")
+
+
+class Response(object):
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class Session(object):
+    def __init__(self, count):
+        self.count = count
+
+    def get(self, uri, **kwargs):
+        # A new body per request, as listing consumes the items.
+        items = [{"id": "id-%d" % i, "name": "name-%d" % i,
+                  "status": "ACTIVE", "flavor": {"id": "1"}}
+                 for i in range(self.count)]
+        return Response({"items": items})
+
+
+def mro_walk(cls):
+    """Build the component tables again on every call"""
+    return resource2._ComponentRegistry(cls)
+
+
+def measure(count, runs, uncached):
+    sess = Session(count)
+    original = resource2.Resource.__dict__["_component_registry"]
+    if uncached:
+        resource2.Resource._component_registry = classmethod(mro_walk)
+    try:
+        times = []
+        for _ in range(runs):
+            start = time.time()
+            results = list(Server.list(sess))
+            times.append(time.time() - start)
+            assert len(results) == count
+    finally:
+        resource2.Resource._component_registry = original
+    return sorted(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--items", type=int, default=50000,
+                        help="Number of items in the listing")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="Number of listings per case")
+    args = parser.parse_args()
+
+    for name, uncached in [("mro walk", True), ("class tables", False)]:
+        times = measure(args.items, args.runs, uncached)
+        print("%-13s min %6.2f s  median %6.2f s  %8d items/s" %
+              (name, times[0], times[len(times) // 2],
+               args.items / max(times[0], 1e-6)))
+
+
+if __name__ == "__main__":
+    main()